@@ -9,6 +9,7 @@ Copyright (C) 2025-2026 Neo Zetterberg
 from typing import Type, Any
 from ._internal import (
     Translator,
+    Template,
     Structure,
     Language,
     Transcriber
@@ -41,6 +42,8 @@ class Module:
         match name:
             case "Translator":
                 return Translator
+            case "Template":
+                return Template
             case "Structure":
                 return Structure
             case "Language":
@@ -52,7 +55,9 @@ class Module:
             case "This":
                 return self
             case "new":
-                return lambda basepath, extention, lang: Transcriber(basepath, extention, lang)
+                return lambda basepath, extention, lang, mapped=False: Transcriber(basepath, extention, lang, mapped)
+            case "__name__" | "__doc__" | "__file__" | "__path__" | "__spec__" | "__loader__" | "__package__":
+                return getattr(_package, name) # So the import system still finds our submodules (and `python -m Transcriber` works)
     def __setattr__(self, name: str, value: Any) -> None:
         raise PermissionError("You are not allowed to change any attribute of this package.")
     def __getitem__(self, key: Any) -> None:
@@ -60,4 +65,5 @@ class Module:
     def __setitem__(self, key: Any, value: Any) -> None:
         raise PermissionError("You are not allowed to use this method.")
 
+_package = sys.modules[__name__]
 sys.modules[__name__] = Module()
\ No newline at end of file
@@ -1,15 +1,17 @@
 from typing import Type, Callable
 from ._internal import (
     Translator,
+    Template,
     Structure,
     Language,
     Transcriber
 )
 
-def new(basepath: str, extention: str, lang: Language) -> Transcriber: ...
+def new(basepath: str, extention: str, lang: Language, mapped: bool = False) -> Transcriber: ...
 
 class Module:
     Translator: Type[Translator]
+    Template: Type[Template]
     Structure: Type[Structure]
     Language: Type[Language]
     Transcriber: Type[Transcriber]
@@ -22,6 +24,7 @@ This: Module
 
 __all__ = (
     "Translator",
+    "Template",
     "Structure",
     "Language",
     "Transcriber",
@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional, Sequence
+from ._internal.lines import write_bundle
+import argparse
+import os
+
+#####################################################
+# Command line tools of the package.                #
+# ------------------------------------------------- #
+# python -m Transcriber bundle OUT FILE [FILE ...]  #
+#   Writes every language file into one bundle,     #
+#   in a section named after the file (en.lng is    #
+#   'en'), or after KEY when given as KEY=FILE.     #
+#####################################################
+
+def bundle(output: str, files: Sequence[str], encoding: str = "utf-8") -> Dict[str, int]:
+    """Bundle language files into `output`. Returns the line count of every section."""
+    sections: Dict[str, List[str]] = {}
+    for file in files:
+        key, _, path = file.rpartition("=")
+        key = key or os.path.splitext(os.path.basename(path))[0]
+        if key in sections:
+            raise ValueError(f"Two files for the section '{key}'")
+        with open(path, "r", encoding=encoding) as f:
+            sections[key] = f.readlines()
+    write_bundle(output, sections, encoding)
+    return {key: len(lines) for key, lines in sections.items()}
+
+parser = argparse.ArgumentParser(prog="python -m Transcriber", description="Transcriber tools")
+commands = parser.add_subparsers(dest="command", required=True)
+bundle_parser = commands.add_parser("bundle", help="write language files into one bundle file")
+bundle_parser.add_argument("output", help="the bundle to write, f.e. languages/all.lng")
+bundle_parser.add_argument("files", nargs="+", metavar="[KEY=]FILE", help="a language file, in a section named KEY (the file name by default)")
+bundle_parser.add_argument("--encoding", default="utf-8")
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    arguments = parser.parse_args(argv)
+    match arguments.command:
+        case "bundle":
+            try:
+                sections = bundle(arguments.output, arguments.files, arguments.encoding)
+            except (OSError, ValueError) as e:
+                parser.exit(1, f"{parser.prog}: error: {e}\n")
+            print(f"Wrote {arguments.output}: " + ", ".join(f"{key} ({count} lines)" for key, count in sections.items()))
+
+if __name__ == "__main__":
+    main()
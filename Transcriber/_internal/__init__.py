@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 from .core import (
     Translator,
+    Template,
     Structure,
     Language,
     Transcriber
@@ -8,6 +9,7 @@ from .core import (
 if TYPE_CHECKING:
     __all__ = (
         "Translator",
+        "Template",
         "Structure",
         "Language",
         "Transcriber"
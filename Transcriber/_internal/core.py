@@ -1,24 +1,131 @@
-from typing import Set, Tuple, List, Dict, Union, Optional
+from typing import Set, Tuple, List, Dict, Union, Optional, Mapping, Pattern, Sequence, Iterable, Any
+from collections import OrderedDict
+from types import MappingProxyType
 from io import TextIOWrapper
+from .lines import MappedLines, CompiledLines, load_compiled, read_bundle_header, changed_lines, line_digests
+from array import array
+from bisect import bisect_left
+import threading
+import hashlib
 import logging
 import os
 import re
 
 IndexRange = Union[int, Tuple[int, Optional[int]]]
 
+def _trie_pattern(keys: List[str]) -> str:
+    """
+    Merge the keys into a prefix tree shaped regex. A plain alternation tries every 
+    key at every position of the text; this only walks the characters that can still match.
+    """
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = {} # Marks the end of a key
+
+    def build(node: Dict[str, dict]) -> str:
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if end else group # Greedy, so the longest key is tried first
+
+    return build(trie)
+
 class Translator:
-    """Automatically translate and replace simple sentences"""
+    """
+    Automatically translate and replace simple sentences.
+
+    Every association is a whole word (or phrase) that gets replaced. They are compiled into 
+    one pattern, so a text is translated in a single pass no matter how many associations 
+    there are. The pattern is only rebuilt when the associations change.
+    """
 
     __associations: Dict[str, str]
-    __slots__ = ("_Translator__associations",)
+    __pattern: Optional[Pattern[str]]
+    __slots__ = ("_Translator__associations", "_Translator__pattern",)
 
     def __init__(self, associations: Optional[Dict[str, str]] = None):
-        self.__associations = associations if associations is not None else {}
+        self.__associations = dict(associations) if associations is not None else {}
+        self.__pattern = None
+    
+    @property
+    def associations(self) -> Mapping[str, str]:
+        return MappingProxyType(self.__associations)
+    
+    @associations.setter
+    def associations(self, value: Dict[str, str]) -> None:
+        self.__associations = dict(value)
+        self.__pattern = None
+    
+    def associate(self, key: str, value: str) -> None:
+        if self.__associations.get(key) != value:
+            self.__associations[key] = value
+            self.__pattern = None
+    
+    def dissociate(self, key: str) -> None:
+        if self.__associations.pop(key, None) is not None:
+            self.__pattern = None
+    
+    def compile(self) -> Pattern[str]:
+        if self.__pattern is None:
+            self.__pattern = re.compile(r"\b" + _trie_pattern(list(self.__associations)) + r"\b")
+        return self.__pattern
+    
+    def fingerprint(self) -> bytes:
+        """A hash of the associations; compiled catalogs made with other associations are stale."""
+        digest = hashlib.sha256()
+        for k, v in sorted(self.__associations.items()):
+            digest.update(k.encode("utf-8") + b"\0" + v.encode("utf-8") + b"\0")
+        return digest.digest()
     
     def translate(self, text: str) -> str:
-        for k, v in self.__associations.items():
-            text = re.sub(rf'\b{k}\b', v, text)
-        return text
+        if not self.__associations:
+            return text
+        associations = self.__associations
+        return self.compile().sub(lambda match: associations[match.group(0)], text)
+
+class Template:
+    """
+    A text with named placeholders (f.e. `player_name`), split up once so that it can be 
+    rendered in a single pass, no matter how many placeholders there are.
+    """
+
+    __literals: List[str]
+    __names: List[str]
+    __slots__ = ("_Template__literals", "_Template__names",)
+
+    def __init__(self, text: str, fields: Iterable[str]) -> None:
+        fields = sorted(set(fields), key=len, reverse=True) # A longer name wins over a name it starts with
+        if fields:
+            parts = re.split("(" + "|".join(map(re.escape, fields)) + ")", text)
+        else:
+            parts = [text]
+        self.__literals = parts[0::2]
+        self.__names = parts[1::2]
+    
+    @property
+    def fields(self) -> Set[str]:
+        return set(self.__names)
+    
+    def render(self, values: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> str:
+        """Fill in every placeholder. Placeholders without a value are left as they are."""
+        if values is None:
+            values = kwargs
+        elif kwargs:
+            values = {**values, **kwargs}
+        literals = self.__literals
+        out = [literals[0]]
+        for name, literal in zip(self.__names, literals[1:]):
+            value = values.get(name, name)
+            out.append(value if isinstance(value, str) else str(value))
+            out.append(literal)
+        return "".join(out)
 
 class Structure:
     """
@@ -27,19 +134,21 @@ class Structure:
     it is relative to the others.
 
     This is only practical once you have multiple languages 
-    in one file.
+    in one file (see `Transcriber.structure` for bundles).
     """
 
     __transcriber: "Transcriber"
     __lang: "Language"
     __start: int
+    __size: Optional[int]
 
-    __slots__ = ("_Structure__transcriber", "_Structure__lang", "_Structure__start",)
+    __slots__ = ("_Structure__transcriber", "_Structure__lang", "_Structure__start", "_Structure__size",)
 
-    def __init__(self, transcriber: "Transcriber", lang: "Language", start: int) -> None:
+    def __init__(self, transcriber: "Transcriber", lang: "Language", start: int, size: Optional[int] = None) -> None:
         self.__transcriber = transcriber
         self.__lang = lang
         self.__start = start
+        self.__size = size
     
     @property
     def transcriber(self) -> "Transcriber":
@@ -48,28 +157,38 @@ class Structure:
     @property
     def lang(self) -> "Language":
         return self.__lang
+    
+    @property
+    def size(self) -> Optional[int]:
+        """How many lines belong to this language, if known."""
+        return self.__size
 
     def translate_index(self, i: int) -> int:
+        """Where line `i` of this language is in the whole file."""
+        if self.__size is not None and not 0 <= i < self.__size:
+            raise IndexError(f"Line index {i} out of range (0..{self.__size - 1}) for '{self.__lang.prefix}'")
         return self.__start + i
     
-    def get_index(self, index_range: IndexRange, end: Optional[int] = None) -> str:
-        # Ensure transcriber language is correct
-        if self.transcriber.lang != self.__lang:
-            self.transcriber.set_lang(self.__lang)
-
-        # Normalize index_range into a tuple
+    def translate_range(self, index_range: IndexRange, end: Optional[int] = None) -> IndexRange:
+        """Where a line or a range of lines of this language is in the whole file."""
+        # Normalize index_range into a tuple, unless it is a single line
         if isinstance(index_range, int):
             if end is None:
-                raise ValueError("end must be provided when index_range is an int")
+                return self.translate_index(index_range)
             index_range = (index_range, end)
-        elif end is not None:
-            index_range = (index_range[0], end)
-
-        # Translate indices
-        translated = tuple(map(self.translate_index, index_range))
+        elif end is not None or index_range[1] is None:
+            index_range = (index_range[0], end if end is not None else index_range[0] + 1)
 
-        # Get transcribed index string
-        return self.__transcriber.get_index(translated)
+        # Only the (exclusive) end of a range may be one past the last line
+        start, stop = index_range
+        if self.__size is not None and not 0 <= start <= stop <= self.__size:
+            raise IndexError(f"Line range {start}..{stop} out of range (0..{self.__size}) for '{self.__lang.prefix}'")
+        return (self.__start + start, self.__start + stop)
+    
+    def get_index(self, index_range: IndexRange, end: Optional[int] = None) -> str:
+        if self.__transcriber.bundle is not None: # The transcriber already reads every line through the structure of its language
+            return self.__transcriber.get_index(index_range, end, lang=self.__lang)
+        return self.__transcriber.get_index(self.translate_range(index_range, end), lang=self.__lang)
 
 class Language:
     """
@@ -161,13 +280,15 @@ class Transcription:
     __index_range: IndexRange
     __text: Dict[str, str]
     __loaded_for: Set[str]
-    __slots__ = ("_Transcription__transcriber", "_Transcription__index_range", "_Transcription__text", "_Transcription__loaded_for", "__weakrefs__",)
+    __templates: Dict[Tuple[str, Tuple[str, ...]], Template]
+    __slots__ = ("_Transcription__transcriber", "_Transcription__index_range", "_Transcription__text", "_Transcription__loaded_for", "_Transcription__templates", "__weakrefs__",)
 
     def __init__(self, index: IndexRange, transcriber: "Transcriber"):
         self.__transcriber = transcriber
         self.__index_range = index
         self.__text = {}
         self.__loaded_for = set()
+        self.__templates = {}
     
     @staticmethod
     def _lang_key(lang: Language) -> str:
@@ -175,7 +296,7 @@ class Transcription:
         # `prefix` is typically short; `filename` is another option.
         return lang.prefix
     
-    def load(self, lang: Language, lines: List[str]) -> None:
+    def load(self, lang: Language, lines: Sequence[str]) -> None:
         """
         Load text for the given language from a list of lines.
         Stores a single string in self.__text[lang].
@@ -195,11 +316,29 @@ class Transcription:
                 end = start + 1
             selected = lines[start:end]
             text = "".join(selected)
-        self.__text[lang_key] = self.__transcriber.lang.translate(text.rstrip("\n"))
+        text = text.rstrip("\n")
+        self.__drop_templates(lang_key)
+        # Compiled catalogs hold lines that are translated already
+        self.__text[lang_key] = text if getattr(lines, "translated", False) else lang.translate(text)
         self.__loaded_for.add(lang_key)
     
     def evict_lang(self, lang_key: str) -> None:
-        self.__loaded_for.remove(lang_key)
+        self.__loaded_for.discard(lang_key)
+        self.__text.pop(lang_key, None)
+        self.__drop_templates(lang_key)
+    
+    def __drop_templates(self, lang_key: str) -> None:
+        if self.__templates:
+            for key in [key for key in self.__templates if key[0] == lang_key]:
+                del self.__templates[key]
+    
+    def template_for(self, lang_key: str, fields: Tuple[str, ...]) -> Template:
+        """The text of a language as a template, parsed on first use and cached."""
+        key = (lang_key, fields)
+        template = self.__templates.get(key)
+        if template is None:
+            template = self.__templates[key] = Template(self.text_for(lang_key), fields)
+        return template
     
     @property
     def loaded_for(self) -> Set[str]:
@@ -212,7 +351,9 @@ class Transcription:
     @property
     def text(self) -> str:
         """Return text for the transcriber's current language."""
-        lang_key = self._lang_key(self.__transcriber.lang)
+        return self.text_for(self._lang_key(self.__transcriber.lang))
+    
+    def text_for(self, lang_key: str) -> str:
         try:
             return self.__text[lang_key]
         except KeyError as exc:
@@ -227,68 +368,200 @@ class Transcription:
         return self.__index_range == other.__index_range
 
 class Cache:
+    """
+    Holds the lines of every resident language side by side, keyed by language, and 
+    the transcriptions made from them. At most `max_languages` are kept; the least 
+    recently used one is evicted (never the active one).
+    """
+
     transcriber: "Transcriber"
     transcriptions: Dict[IndexRange, Transcription]
-    lines: List[str]
+    catalogs: "OrderedDict[str, Sequence[str]]"
+    max_languages: int
 
-    __read: bool
-    __slots__ = ("transcriber", "transcriptions", "lines", "_Cache__read", "__weakrefs__",)
+    __slots__ = ("transcriber", "transcriptions", "catalogs", "max_languages", "__weakrefs__",)
 
-    def __init__(self, transcriber: "Transcriber") -> None:
+    def __init__(self, transcriber: "Transcriber", max_languages: int = 4) -> None:
+        if max_languages < 1:
+            raise ValueError("max_languages must be at least 1")
         self.transcriber = transcriber
         self.transcriptions = {}
-        self.lines = []
-        self.__read = False
+        self.catalogs = OrderedDict()
+        self.max_languages = max_languages
+    
+    @property
+    def lines(self) -> Sequence[str]:
+        """The lines of the active language."""
+        return self.catalogs.get(Transcription._lang_key(self.transcriber.lang), [])
     
     def reset_all(self) -> None:
         """Clear everything (used when resetting)."""
         self.transcriptions.clear()
-        self.lines.clear()
-        self.__read = False
+        self.release()
     
     def reset(self) -> None:
-        """Clear lines and read flag but keep cached Transcription objects (used when changing language)."""
-        self.lines.clear()
-        self.__read = False
-    
-    def get_index(self, index_range: IndexRange) -> str:
-        if not self.__read:
-            raise RuntimeError("Transcription file not read; call Cache.read(file) first.")
-        if not index_range in self.transcriptions:
+        """Clear lines of every language but keep cached Transcription objects."""
+        self.release()
+    
+    def release(self, lang_key: Optional[str] = None) -> None:
+        """Drop the lines of one language (or all of them), and unmap them if they were memory mapped."""
+        for key in [lang_key] if lang_key is not None else list(self.catalogs):
+            lines = self.catalogs.pop(key, None)
+            shared = any(other is lines for other in self.catalogs.values()) # Bundles share one file between languages
+            if isinstance(lines, (MappedLines, CompiledLines)) and not shared:
+                lines.close()
+    
+    def has(self, lang: Language) -> bool:
+        return Transcription._lang_key(lang) in self.catalogs
+    
+    def touch(self, lang: Language) -> None:
+        """Mark a language as the most recently used one."""
+        self.catalogs.move_to_end(Transcription._lang_key(lang))
+    
+    def evict(self, lang_key: str) -> None:
+        """Forget a language completely: its lines and its text in every transcription."""
+        self.release(lang_key)
+        for inst in self.transcriptions.values():
+            if lang_key in inst.loaded_for:
+                inst.evict_lang(lang_key)
+    
+    def invalidate(self, lang_key: str, changed: Optional[Sequence[int]] = None) -> List[IndexRange]:
+        """
+        Forget the text of one language in every transcription that covers one of the 
+        `changed` line indices (sorted), or in all of them if `changed` is None. 
+        Every other transcription keeps its text. Returns the ranges that were dropped.
+        """
+        dropped: List[IndexRange] = []
+        if changed is not None and not changed:
+            return dropped
+        for index_range, inst in self.transcriptions.items():
+            if lang_key not in inst.loaded_for:
+                continue
+            if changed is not None:
+                if isinstance(index_range, int):
+                    start, end = index_range, index_range + 1
+                else:
+                    start, end = index_range
+                    end = start + 1 if end is None else end
+                if start >= 0 and end >= 0: # Negative indices move with the length, so those always go
+                    at = bisect_left(changed, start)
+                    if at == len(changed) or changed[at] >= end:
+                        continue
+            inst.evict_lang(lang_key)
+            dropped.append(index_range)
+        return dropped
+    
+    def store(self, lang: Language, lines: Sequence[str]) -> None:
+        self.store_key(Transcription._lang_key(lang), lines)
+    
+    def store_key(self, lang_key: str, lines: Sequence[str]) -> None:
+        self.release(lang_key)
+        self.catalogs[lang_key] = lines
+        active = Transcription._lang_key(self.transcriber.lang)
+        while len(self.catalogs) > self.max_languages:
+            victim = next((key for key in self.catalogs if key not in (active, lang_key)), None)
+            if victim is None:
+                break
+            self.evict(victim)
+    
+    def get_transcription(self, index_range: IndexRange, lang: Optional[Language] = None) -> Tuple[Transcription, str]:
+        """The (loaded) transcription of a range, and the key of the language it was loaded for."""
+        lang = lang or self.transcriber.lang
+        lang_key = Transcription._lang_key(lang)
+        lines = self.catalogs.get(lang_key)
+        if lines is None:
+            raise RuntimeError(f"Transcription file for '{lang_key}' not read; call Cache.read(file) first.")
+        inst = self.transcriptions.get(index_range)
+        if inst is None:
             inst = Transcription(index_range, self.transcriber)
-            inst.load(self.transcriber.lang, self.lines)
             self.transcriptions[index_range] = inst
-            return inst.text
-        inst = self.transcriptions[index_range]
-        lang_key = Transcription._lang_key(self.transcriber.lang)
         if not lang_key in inst.loaded_for:
-            inst.load(self.transcriber.lang, self.lines)
-        return inst.text
+            inst.load(lang, lines)
+        return inst, lang_key
+    
+    def get_index(self, index_range: IndexRange, lang: Optional[Language] = None) -> str:
+        inst, lang_key = self.get_transcription(index_range, lang)
+        return inst.text_for(lang_key)
+    
+    def get_template(self, index_range: IndexRange, fields: Tuple[str, ...], lang: Optional[Language] = None) -> Template:
+        inst, lang_key = self.get_transcription(index_range, lang)
+        return inst.template_for(lang_key, fields)
+    
+    def read(self, file: TextIOWrapper, lang: Optional[Language] = None) -> None:
+        self.store(lang or self.transcriber.lang, file.readlines())
     
-    def read(self, file: TextIOWrapper) -> None:
-        self.lines = file.readlines()
-        self.__read = True
+    def map(self, path: str, encoding: str = "utf-8", lang: Optional[Language] = None) -> None:
+        """Memory map the file instead of reading it; lines are only decoded once they are asked for."""
+        self.store(lang or self.transcriber.lang, MappedLines(path, encoding))
+    
+    def compiled(self, path: str, encoding: str = "utf-8", lang: Optional[Language] = None, mapped: bool = False) -> None:
+        """Load the compiled catalog of the file (built or rebuilt next to it when needed)."""
+        lang = lang or self.transcriber.lang
+        self.store(lang, load_compiled(path, lang.translate, lang.translator.fingerprint(), encoding, mapped))
 
 class Transcriber:
     basepath: str
     extension: str
+    mapped: bool
+    compiled: bool
+    bundle: Optional[str]
 
     __lang: Language
     __cache: Cache
+    __sections: Dict[str, Tuple[int, int]]
+    __sources: Dict[str, Tuple[str, str, Tuple[int, int, int], Optional[Language]]]
+    __snapshots: Dict[str, array] # Line hashes of mapped files, by path, as they were when they were last read
+    __lock: threading.RLock
+    __watcher: Optional[Tuple[threading.Thread, threading.Event]]
+
+    __slots__ = ("basepath", "extension", "mapped", "compiled", "bundle", "_Transcriber__lang", "_Transcriber__cache", "_Transcriber__sections", "_Transcriber__sources", "_Transcriber__snapshots", "_Transcriber__lock", "_Transcriber__watcher", "__weakrefs__",)
+
+    def __init__(self, basepath: str, extension: str, lang: Language, mapped: bool = False, max_languages: int = 4, compiled: bool = False, bundle: Optional[str] = None) -> None:
+        """
+        With `mapped`, language files are memory mapped and indexed lazily instead of read 
+        into memory, so even huge files open in constant time.
+
+        With `compiled`, every language is loaded from a compiled catalog next to its file, 
+        with every line translated already. It is rebuilt whenever the file changes.
 
-    __slots__ = ("basepath", "extension", "_Transcriber__lang", "_Transcriber__cache", "__weakrefs__",)
+        With `bundle` (a file name in `basepath`, without extension), every language is read 
+        from that one bundle file instead, in a single open (see `python -m Transcriber bundle`). 
+        Line indices stay relative to the language, as they go through its `structure`.
 
-    def __init__(self, basepath: str, extension: str, lang: Language) -> None:
+        Up to `max_languages` languages stay loaded at once, so switching between them 
+        needs no I/O at all.
+
+        Files that change on disk are picked up by `poll` (or `watch`, which polls in the 
+        background), and only the transcriptions of lines that changed are read again. A mapped 
+        file written over in place is compared with the snapshot `watch` (or the first `poll`) 
+        takes; without one, all of its transcriptions are read again.
+        """
         self.basepath = basepath
         self.extension = extension
+        self.mapped = mapped
+        self.compiled = compiled
+        self.bundle = bundle
         self.__lang = lang
-        self.__cache = Cache(self)
+        self.__cache = Cache(self, max_languages)
+        self.__sections = {}
+        self.__sources = {}
+        self.__snapshots = {}
+        self.__lock = threading.RLock()
+        self.__watcher = None
         self.load()
         logging.info("Transcriber is ready.")
     
     @property
     def path(self) -> str:
-        return os.path.join(self.basepath, self.lang.filename+self.extension)
+        return self.path_for(self.lang)
+    
+    def path_for(self, lang: Language) -> str:
+        return os.path.join(self.basepath, lang.filename+self.extension)
+    
+    @property
+    def languages(self) -> List[str]:
+        """Keys of the resident languages, least recently used first."""
+        return list(self.__cache.catalogs)
     
     @property
     def lang(self) -> Language:
@@ -300,25 +573,238 @@ class Transcriber:
     
     def reset(self) -> None:
         """Reset everything (clear loaded transcriptions and cached lines)."""
-        self.__cache.reset_all()
+        with self.__lock:
+            self.__cache.reset_all()
     
     def set_lang(self, lang: Language) -> None:
-        self.__cache.reset()
-        self.__lang = lang
-        self.load()
+        with self.__lock:
+            self.__lang = lang
+            if self.__cache.has(lang): # Already resident, so there is nothing to read
+                self.__cache.touch(lang)
+            else:
+                self.load()
+    
+    def preload(self, *langs: Language, encoding: str = "utf-8") -> None:
+        """Load languages ahead of time without switching to them."""
+        for lang in langs:
+            if not self.__cache.has(lang):
+                self.load(encoding, lang)
     
-    def load(self, encoding: str = "utf-8") -> None:
+    def evict(self, lang: Language) -> None:
+        """Drop a resident language (the active one can't be dropped)."""
+        if lang == self.__lang:
+            raise ValueError("The active language can't be evicted.")
+        with self.__lock:
+            self.__cache.evict(Transcription._lang_key(lang))
+    
+    @property
+    def bundle_path(self) -> Optional[str]:
+        return os.path.join(self.basepath, self.bundle+self.extension) if self.bundle is not None else None
+    
+    @property
+    def sections(self) -> Dict[str, Tuple[int, int]]:
+        """Start line and line count of every language in the bundle, by language key."""
+        return dict(self.__sections)
+    
+    def load_bundle(self, encoding: str = "utf-8", lang_keys: Optional[Iterable[str]] = None) -> None:
+        """Read the bundle once, and make its languages (or only `lang_keys`) resident."""
+        path = self.bundle_path
+        if path is None:
+            raise RuntimeError("This transcriber has no bundle.")
+        signature = self.__signature(path)
+        lines = self.__read_bundle(path, encoding)
+        self.__sections = read_bundle_header(lines)
+
+        active = Transcription._lang_key(self.__lang)
+        if active not in self.__sections:
+            raise KeyError(f"Bundle {path} has no section for '{active}'")
+        keys = list(self.__sections) if lang_keys is None else list(lang_keys)
+        keys.sort(key=lambda key: key == active) # The active language last, so it is the most recently used
+        for key in keys:
+            if key not in self.__sections:
+                raise KeyError(f"Bundle {path} has no section for '{key}'")
+            self.__cache.store_key(key, lines)
+            self.__sources[key] = (path, encoding, signature, None)
+    
+    def __read_bundle(self, path: str, encoding: str) -> Sequence[str]:
+        try:
+            if self.mapped:
+                return MappedLines(path, encoding)
+            with open(path, "r", encoding=encoding) as f:
+                return f.readlines()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Bundle not found at {path}") from e
+    
+    def structure(self, lang: Optional[Language] = None) -> Structure:
+        """Read one language (the active one by default) out of the bundle."""
+        lang = lang or self.__lang
+        start, size = self.__sections[Transcription._lang_key(lang)]
+        return Structure(self, lang, start, size)
+    
+    def load(self, encoding: str = "utf-8", lang: Optional[Language] = None) -> None:
+        lang = lang or self.lang
+        with self.__lock:
+            if self.bundle is not None:
+                self.load_bundle(encoding, None if not self.__sections else [Transcription._lang_key(lang)])
+                return
+            path = self.path_for(lang)
+            signature = self.__signature(path)
+            self.__cache.store(lang, self.__read(path, encoding, lang))
+            self.__sources[Transcription._lang_key(lang)] = (path, encoding, signature, lang)
+    
+    def __read(self, path: str, encoding: str, lang: Language) -> Sequence[str]:
         try:
-            with open(self.path, "r", encoding=encoding) as f:
-                self.__cache.read(f)
+            if self.compiled:
+                return load_compiled(path, lang.translate, lang.translator.fingerprint(), encoding, self.mapped)
+            if self.mapped:
+                return MappedLines(path, encoding)
+            with open(path, "r", encoding=encoding) as f:
+                return f.readlines()
         except FileNotFoundError as e:
-            raise FileNotFoundError(f"Transcription file not found at {self.path}") from e
+            raise FileNotFoundError(f"Transcription file not found at {path}") from e
+    
+    @staticmethod
+    def __signature(path: str) -> Tuple[int, int, int]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return (0, 0, 0) # Let the read itself complain
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    #### Hot reloading ####
+    # We'll compare the file on disk with the lines in memory, line by line, and only
+    # drop the transcriptions that cover a changed line. Everything else stays cached.
+    # A memory map shows whatever is written over its file in place (and reading past a
+    # truncated end kills the process), so mapped files are compared with a snapshot of
+    # their line hashes instead, taken once they are watched (or first polled).
 
-    def get_index(self, index_range: IndexRange, end: Optional[int] = None) -> str:
+    def __snapshot(self) -> None:
+        for key, (path, encoding, signature, _) in self.__sources.items():
+            if path not in self.__snapshots and isinstance(self.__cache.catalogs.get(key), MappedLines) and self.__signature(path) == signature:
+                try:
+                    self.__snapshots[path] = line_digests(path, encoding)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"Could not take a snapshot of {path}: {e}")
+
+    def stale(self) -> List[str]:
+        """Keys of the resident languages whose file changed on disk since it was read."""
+        with self.__lock:
+            return [key for key, (path, _, signature, _) in self.__sources.items()
+                    if key in self.__cache.catalogs and self.__signature(path) != signature]
+    
+    def reload(self, lang_key: str) -> List[IndexRange]:
+        """
+        Read a resident language again, and forget only the transcriptions whose lines 
+        changed. With a bundle, every resident language of the bundle is read again. 
+        Returns the dropped index ranges.
+        """
+        with self.__lock:
+            path, encoding, signature, lang = self.__sources[lang_key]
+            new_signature = self.__signature(path)
+            if lang is None: # A bundle; its languages share the file
+                new = self.__read_bundle(path, encoding)
+                self.__sections = read_bundle_header(new)
+                keys = [key for key, source in self.__sources.items() if source[0] == path and key in self.__cache.catalogs]
+            else:
+                new = self.__read(path, encoding, lang)
+                keys = [lang_key]
+
+            old = self.__cache.catalogs.get(lang_key)
+            if old is None:
+                changed = None
+            elif isinstance(old, MappedLines) and new_signature[2] == signature[2]:
+                # Written in place, so never read the old map: it may already show (part of) the new file
+                digests = line_digests(path, encoding)
+                snapshot = self.__snapshots.get(path)
+                changed = changed_lines(snapshot, digests) if snapshot is not None else None
+                self.__snapshots[path] = digests
+            else: # A replaced file leaves the old map showing the old one
+                changed = changed_lines(old, new)
+                self.__snapshots.pop(path, None)
+
+            dropped: List[IndexRange] = []
+            for key in keys:
+                if key in self.__sections or lang is not None:
+                    dropped.extend(self.__cache.invalidate(key, changed))
+                    self.__cache.store_key(key, new)
+                    self.__sources[key] = (path, encoding, new_signature, lang)
+                else: # The section is gone from the bundle
+                    self.__cache.evict(key)
+                    self.__sources.pop(key, None)
+            if self.__cache.has(self.__lang): # Storing made the reloaded language the most recent one
+                self.__cache.touch(self.__lang)
+            logging.info(f"Reloaded {path}: {len(changed) if changed is not None else 'all'} changed lines, {len(dropped)} transcriptions dropped.")
+            return dropped
+    
+    def poll(self) -> List[IndexRange]:
+        """Reload every resident language whose file changed. Returns the dropped index ranges."""
+        dropped: List[IndexRange] = []
+        with self.__lock:
+            self.__snapshot()
+            done: Set[str] = set()
+            for key in self.stale():
+                path = self.__sources[key][0]
+                if path in done or key not in self.__sources:
+                    continue
+                done.add(path)
+                try:
+                    dropped.extend(self.reload(key))
+                except (OSError, ValueError, KeyError) as e: # Probably caught halfway through a save, so try again next time
+                    logging.warning(f"Could not reload {path}: {e}")
+        return dropped
+    
+    def watch(self, interval: float = 0.5) -> None:
+        """Poll the resident languages every `interval` seconds on a background thread."""
+        self.unwatch()
+        with self.__lock: # Right away, so mapped files written over in place are told apart from the start
+            self.__snapshot()
+        stop = threading.Event()
+        def run() -> None:
+            while not stop.wait(interval):
+                self.poll()
+        thread = threading.Thread(target=run, name="transcriber-watch", daemon=True)
+        self.__watcher = (thread, stop)
+        thread.start()
+    
+    def unwatch(self) -> None:
+        """Stop watching, if we were."""
+        if self.__watcher is not None:
+            thread, stop = self.__watcher
+            self.__watcher = None
+            stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+    
+    @property
+    def watching(self) -> bool:
+        return self.__watcher is not None
+
+    def __prepare(self, index_range: IndexRange, end: Optional[int], lang: Optional[Language]) -> IndexRange:
         # Case 1: two integer arguments — combine into a tuple
         if end is not None:
             if isinstance(index_range, int):
                 index_range = (index_range, end)
             else:
                 index_range = (index_range[0], end)
-        return self.__cache.get_index(index_range)
\ No newline at end of file
+        if self.bundle is not None: # Every language is a section of the one file
+            index_range = self.structure(lang).translate_range(index_range)
+        if lang is not None:
+            if not self.__cache.has(lang):
+                self.preload(lang)
+            elif lang != self.__lang:
+                self.__cache.touch(lang)
+        return index_range
+
+    def get_index(self, index_range: IndexRange, end: Optional[int] = None, lang: Optional[Language] = None) -> str:
+        """Get a line or a range of lines; in `lang` if given, otherwise in the active language."""
+        with self.__lock:
+            return self.__cache.get_index(self.__prepare(index_range, end, lang), lang)
+    
+    def get_template(self, index_range: IndexRange, end: Optional[int] = None, fields: Iterable[str] = (), lang: Optional[Language] = None) -> Template:
+        """Get a line or a range of lines as a template with the given placeholders, parsed once per language."""
+        with self.__lock:
+            return self.__cache.get_template(self.__prepare(index_range, end, lang), tuple(sorted(fields)), lang)
+    
+    def render(self, index_range: IndexRange, end: Optional[int] = None, lang: Optional[Language] = None, **values: Any) -> str:
+        """Get a line or a range of lines with every placeholder (named by the keywords) filled in."""
+        return self.get_template(index_range, end, values, lang).render(values)
\ No newline at end of file
@@ -1,17 +1,38 @@
-from typing import Set, Tuple, List, Dict, Union, Optional
+from typing import Set, Tuple, List, Dict, Union, Optional, Mapping, Pattern, Sequence, Iterable, Any
+from collections import OrderedDict
 from io import TextIOWrapper
+from .lines import MappedLines, CompiledLines
 
 IndexRange = Union[int, Tuple[int, Optional[int]]]
 
 class Translator:
-    def __init__(self, associations: Dict[str, str]): ...
+    def __init__(self, associations: Optional[Dict[str, str]] = None): ...
+    @property
+    def associations(self) -> Mapping[str, str]: ...
+    @associations.setter
+    def associations(self, value: Dict[str, str]) -> None: ...
+    def associate(self, key: str, value: str) -> None: ...
+    def dissociate(self, key: str) -> None: ...
+    def compile(self) -> Pattern[str]: ...
+    def fingerprint(self) -> bytes: ...
     def translate(self, text: str) -> str: ...
 
+class Template:
+    def __init__(self, text: str, fields: Iterable[str]) -> None: ...
+    @property
+    def fields(self) -> Set[str]: ...
+    def render(self, values: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> str: ...
+
 class Structure:
-    def __init__(self, transcriber: "Transcriber", lang: "Language", start: int) -> None: ...
+    def __init__(self, transcriber: "Transcriber", lang: "Language", start: int, size: Optional[int] = None) -> None: ...
     @property
     def transcriber(self) -> "Transcriber": ...
+    @property
+    def lang(self) -> "Language": ...
+    @property
+    def size(self) -> Optional[int]: ...
     def translate_index(self, i: int) -> int: ...
+    def translate_range(self, index_range: IndexRange, end: Optional[int] = None) -> IndexRange: ...
     def get_index(self, index_range: IndexRange, end: Optional[int] = None) -> str: ...
 
 class Language:
@@ -45,38 +66,77 @@ class Transcription:
     def __init__(self, index: IndexRange, transcriber: "Transcriber"): ...
     @staticmethod
     def _lang_key(lang: Language) -> str: ...
-    def load(self, lang: Language, lines: List[str]) -> None: ...
+    def load(self, lang: Language, lines: Sequence[str]) -> None: ...
     def evict_lang(self, lang_key: str) -> None: ...
+    def template_for(self, lang_key: str, fields: Tuple[str, ...]) -> Template: ...
     @property
     def loaded_for(self) -> Set[str]: ...
     @property
     def index_range(self) -> IndexRange: ...
     @property
     def text(self) -> str: ...
+    def text_for(self, lang_key: str) -> str: ...
     def __hash__(self) -> int: ...
     def __eq__(self, other) -> bool: ...
 
 class Cache:
     transcriber: "Transcriber"
     transcriptions: Dict[IndexRange, Transcription]
-    lines: List[str]
-    def __init__(self, transcriber: "Transcriber") -> None: ...
+    catalogs: "OrderedDict[str, Sequence[str]]"
+    max_languages: int
+    def __init__(self, transcriber: "Transcriber", max_languages: int = 4) -> None: ...
+    @property
+    def lines(self) -> Sequence[str]: ...
     def reset_all(self) -> None: ...
     def reset(self) -> None: ...
-    def get_index(self, index_range: IndexRange) -> str: ...
-    def read(self, file: TextIOWrapper) -> None: ...
+    def release(self, lang_key: Optional[str] = None) -> None: ...
+    def has(self, lang: Language) -> bool: ...
+    def touch(self, lang: Language) -> None: ...
+    def evict(self, lang_key: str) -> None: ...
+    def invalidate(self, lang_key: str, changed: Optional[Sequence[int]] = None) -> List[IndexRange]: ...
+    def store(self, lang: Language, lines: Sequence[str]) -> None: ...
+    def store_key(self, lang_key: str, lines: Sequence[str]) -> None: ...
+    def get_transcription(self, index_range: IndexRange, lang: Optional[Language] = None) -> Tuple[Transcription, str]: ...
+    def get_index(self, index_range: IndexRange, lang: Optional[Language] = None) -> str: ...
+    def get_template(self, index_range: IndexRange, fields: Tuple[str, ...], lang: Optional[Language] = None) -> Template: ...
+    def read(self, file: TextIOWrapper, lang: Optional[Language] = None) -> None: ...
+    def map(self, path: str, encoding: str = "utf-8", lang: Optional[Language] = None) -> None: ...
+    def compiled(self, path: str, encoding: str = "utf-8", lang: Optional[Language] = None, mapped: bool = False) -> None: ...
 
 class Transcriber:
     basepath: str
     extension: str
-    def __init__(self, basepath: str, extension: str, lang: Language) -> None: ...
+    mapped: bool
+    compiled: bool
+    bundle: Optional[str]
+    def __init__(self, basepath: str, extension: str, lang: Language, mapped: bool = False, max_languages: int = 4, compiled: bool = False, bundle: Optional[str] = None) -> None: ...
     @property
     def path(self) -> str: ...
+    def path_for(self, lang: Language) -> str: ...
+    @property
+    def languages(self) -> List[str]: ...
     @property
     def lang(self) -> Language: ...
     @lang.setter
     def lang(self, value: Language) -> None: ...
     def reset(self) -> None: ...
     def set_lang(self, lang: Language) -> None: ...
-    def load(self, encoding: str = "utf-8") -> None: ...
-    def get_index(self, index_range: IndexRange, end: Optional[int] = None) -> str: ...
\ No newline at end of file
+    def preload(self, *langs: Language, encoding: str = "utf-8") -> None: ...
+    def evict(self, lang: Language) -> None: ...
+    @property
+    def bundle_path(self) -> Optional[str]: ...
+    @property
+    def sections(self) -> Dict[str, Tuple[int, int]]: ...
+    def load_bundle(self, encoding: str = "utf-8", lang_keys: Optional[Iterable[str]] = None) -> None: ...
+    def structure(self, lang: Optional[Language] = None) -> Structure: ...
+    def load(self, encoding: str = "utf-8", lang: Optional[Language] = None) -> None: ...
+    def stale(self) -> List[str]: ...
+    def reload(self, lang_key: str) -> List[IndexRange]: ...
+    def poll(self) -> List[IndexRange]: ...
+    def watch(self, interval: float = 0.5) -> None: ...
+    def unwatch(self) -> None: ...
+    @property
+    def watching(self) -> bool: ...
+    def get_index(self, index_range: IndexRange, end: Optional[int] = None, lang: Optional[Language] = None) -> str: ...
+    def get_template(self, index_range: IndexRange, end: Optional[int] = None, fields: Iterable[str] = (), lang: Optional[Language] = None) -> Template: ...
+    def render(self, index_range: IndexRange, end: Optional[int] = None, lang: Optional[Language] = None, **values: Any) -> str: ...
\ No newline at end of file
@@ -0,0 +1,314 @@
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union, overload
+from array import array
+import contextlib
+import hashlib
+import logging
+import codecs
+import struct
+import mmap
+import sys
+import io
+import os
+
+class MappedLines(Sequence[str]):
+    """
+    The lines of a transcription file, read straight out of a memory map.
+
+    Opening is constant time: nothing is read until a line is asked for, and the
+    line offset index is only extended as far as the furthest line asked for so far.
+    The text itself stays in the page cache instead of in a list of strings.
+    """
+
+    path: str
+    encoding: str
+
+    __file: Optional[object]
+    __map: Optional[mmap.mmap]
+    __size: int
+    __offsets: array
+    __complete: bool
+    __slots__ = ("path", "encoding", "_MappedLines__file", "_MappedLines__map", "_MappedLines__size", "_MappedLines__offsets", "_MappedLines__complete", "__weakref__",)
+
+    def __init__(self, path: str, encoding: str = "utf-8") -> None:
+        self.path = path
+        self.encoding = encoding
+        self.__file = open(path, "rb")
+        self.__size = os.fstat(self.__file.fileno()).st_size
+        # An empty file can't be mapped, but then there is nothing to map either
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) if self.__size else None
+
+        start = 0
+        if self.__map is not None and codecs.lookup(encoding).name == "utf-8" and self.__map[:3] == codecs.BOM_UTF8:
+            start = len(codecs.BOM_UTF8)
+        self.__offsets = array("Q", [start]) # offsets[i] is where line i starts, offsets[i + 1] where it ends
+        self.__complete = start >= self.__size
+
+    def close(self) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    @property
+    def closed(self) -> bool:
+        return self.__file is None
+
+    def __index_to(self, line: int) -> None:
+        """Extend the offset index until it knows where `line` ends (or the file ends)."""
+        offsets = self.__offsets
+        while not self.__complete and len(offsets) <= line + 1:
+            end = self.__map.find(b"\n", offsets[-1])
+            if end == -1: # The last line has no line break
+                offsets.append(self.__size)
+                self.__complete = True
+            else:
+                offsets.append(end + 1)
+                self.__complete = end + 1 >= self.__size
+
+    def __decode(self, start: int, end: int) -> str:
+        return self.__map[start:end].decode(self.encoding).replace("\r\n", "\n")
+
+    def __len__(self) -> int:
+        if not self.__complete:
+            self.__index_to(self.__size) # There can't be more lines than bytes
+        return len(self.__offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if self.__map is None and self.__file is None:
+            raise ValueError("I/O operation on closed lines.")
+        if isinstance(index, slice):
+            start, stop, step = index.start, index.stop, index.step
+            if step not in (None, 1) or (start is not None and start < 0) or (stop is not None and stop < 0) or stop is None:
+                start, stop, step = index.indices(len(self)) # Anything unusual needs the full index
+                return [self[i] for i in range(start, stop, step)]
+            start = start or 0
+            self.__index_to(stop - 1)
+            stop = min(stop, len(self.__offsets) - 1)
+            if start >= stop:
+                return []
+            # One decode for the whole range, then split it back into lines
+            parts = self.__decode(self.__offsets[start], self.__offsets[stop]).split("\n")
+            lines = [part + "\n" for part in parts[:-1]]
+            if parts[-1]:
+                lines.append(parts[-1])
+            return lines
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            self.__index_to(index)
+        if not 0 <= index < len(self.__offsets) - 1:
+            raise IndexError("line index out of range")
+        return self.__decode(self.__offsets[index], self.__offsets[index + 1])
+
+    def __enter__(self) -> "MappedLines":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def changed_lines(old: Sequence[str], new: Sequence[str]) -> List[int]:
+    """
+    The indices of every line that differs between two versions of a file, in order. 
+    When the length changed, every line past the end of the shorter one counts as changed.
+    """
+    common = min(len(old), len(new))
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new) and old == new:
+        return [] # The common case when a file is only touched
+    changed = [i for i, (a, b) in enumerate(zip(old[:common], new[:common])) if a != b]
+    changed.extend(range(common, max(len(old), len(new))))
+    return changed
+
+def line_digests(path: str, encoding: str = "utf-8") -> array:
+    """
+    A hash of every line of a file, read without a memory map. Kept as a snapshot of a 
+    mapped file, since a map shows whatever is written over the file in place.
+    """
+    if codecs.lookup(encoding).name == "utf-8":
+        encoding = "utf-8-sig" # A map skips the BOM too
+    with open(path, "r", encoding=encoding) as f:
+        return array("q", map(hash, f))
+
+# ---- Compiled catalogs ----
+#
+# A compiled catalog sits next to its source (`en.lng` -> `en.lngc`) and holds every line
+# already translated, so nothing has to be parsed or translated at startup:
+#
+#   header   magic, version, source mtime (ns), source size, source sha256, translator sha256, line count
+#   offsets  line count + 1 little endian u64, relative to the start of the text
+#   text     every line as UTF-8, one after another
+
+COMPILED_SUFFIX = "c"
+COMPILED_MAGIC = b"LNGC"
+COMPILED_VERSION = 1
+_HEADER = struct.Struct("<4sHxxQQ32s32sQ")
+_MTIME_AT = struct.calcsize("<4sHxx")
+
+class CompiledLines(Sequence[str]):
+    """The lines of a compiled catalog. They are already translated."""
+
+    translated = True
+
+    source_hash: bytes
+    __buffer: Union[bytes, mmap.mmap]
+    __file: Optional[object]
+    __offsets: array
+    __text_start: int
+    __slots__ = ("source_hash", "_CompiledLines__buffer", "_CompiledLines__file", "_CompiledLines__offsets", "_CompiledLines__text_start", "__weakref__",)
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], file: Optional[object] = None) -> None:
+        magic, version, _, _, self.source_hash, _, count = _HEADER.unpack_from(buffer, 0)
+        if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+            raise ValueError("Not a compiled catalog of this version.")
+        end = _HEADER.size + (count + 1) * 8
+        self.__offsets = array("Q")
+        self.__offsets.frombytes(buffer[_HEADER.size:end])
+        if sys.byteorder != "little":
+            self.__offsets.byteswap()
+        self.__buffer = buffer
+        self.__file = file
+        self.__text_start = end
+
+    def close(self) -> None:
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+        self.__buffer = b""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        start = self.__text_start
+        return self.__buffer[start + self.__offsets[index]:start + self.__offsets[index + 1]].decode("utf-8")
+
+def compiled_path(source: str) -> str:
+    return source + COMPILED_SUFFIX
+
+def compile_catalog(source: str, translate: Callable[[str], str], fingerprint: bytes, encoding: str = "utf-8") -> bytes:
+    """Compile a catalog, write it next to the source and return its bytes."""
+    with open(source, "rb") as f:
+        data = f.read()
+        stat = os.fstat(f.fileno())
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding=encoding).readlines() # Exactly like reading the text file
+    encoded = [translate(line).encode("utf-8") for line in lines]
+    offsets = array("Q", [0])
+    for line in encoded:
+        offsets.append(offsets[-1] + len(line))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    header = _HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, stat.st_mtime_ns, stat.st_size, hashlib.sha256(data).digest(), fingerprint, len(encoded))
+    compiled = header + offsets.tobytes() + b"".join(encoded)
+
+    target = compiled_path(source)
+    temporary = f"{target}.{os.getpid()}.tmp"
+    try: # Written to the side and moved in place, so no reader ever sees half a catalog
+        with open(temporary, "wb") as f:
+            f.write(compiled)
+        os.replace(temporary, target)
+    except OSError as e:
+        logging.warning(f"Could not write compiled catalog {target}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+    return compiled
+
+def load_compiled(source: str, translate: Callable[[str], str], fingerprint: bytes, encoding: str = "utf-8", mapped: bool = False) -> CompiledLines:
+    """
+    Load the compiled catalog of `source`, rebuilding it first if it is missing or stale. 
+    A matching mtime and size is trusted as is; otherwise the source is hashed, and only 
+    recompiled if its content (or the translator) really changed.
+    """
+    stat = os.stat(source)
+    target = compiled_path(source)
+    try:
+        with open(target, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) == _HEADER.size:
+                magic, version, mtime, size, source_hash, translator_hash, _ = _HEADER.unpack(header)
+                if magic == COMPILED_MAGIC and version == COMPILED_VERSION and translator_hash == fingerprint:
+                    fresh = mtime == stat.st_mtime_ns and size == stat.st_size
+                    if not fresh and size == stat.st_size:
+                        with open(source, "rb") as s:
+                            fresh = hashlib.sha256(s.read()).digest() == source_hash
+                        if fresh: # Touched but not changed, remember the new mtime
+                            with contextlib.suppress(OSError), open(target, "r+b") as w:
+                                w.seek(_MTIME_AT)
+                                w.write(struct.pack("<Q", stat.st_mtime_ns))
+                    if fresh:
+                        if mapped:
+                            file = open(target, "rb")
+                            return CompiledLines(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), file)
+                        f.seek(0)
+                        return CompiledLines(f.read())
+    except FileNotFoundError:
+        pass
+    return CompiledLines(compile_catalog(source, translate, fingerprint, encoding))
+
+# ---- Bundles ----
+#
+# A bundle keeps every language in one text file. It starts with a header that says
+# where each language's section begins (as a line index into the whole file) and how
+# many lines it has, so any language can be read straight away:
+#
+#   #bundle 1
+#   #section en 4 52
+#   #section sv 56 52
+#   #end
+#   ...the 52 english lines, then the 52 swedish lines
+
+BUNDLE_MAGIC = "#bundle"
+BUNDLE_VERSION = 1
+
+def write_bundle(path: str, sections: Mapping[str, Sequence[str]], encoding: str = "utf-8") -> None:
+    """Write every language's lines into one bundle file, keyed by language prefix."""
+    body: List[str] = []
+    header = [f"{BUNDLE_MAGIC} {BUNDLE_VERSION}\n"]
+    start = len(sections) + 2 # The header lines come first
+    for key, lines in sections.items():
+        if not key or any(char.isspace() for char in key):
+            raise ValueError(f"Invalid section name {key!r}")
+        header.append(f"#section {key} {start} {len(lines)}\n")
+        body.extend(line.rstrip("\n") + "\n" for line in lines)
+        start += len(lines)
+    header.append("#end\n")
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding=encoding, newline="\n") as f:
+        f.writelines(header)
+        f.writelines(body)
+    os.replace(temporary, path)
+
+def read_bundle_header(lines: Sequence[str]) -> Dict[str, Tuple[int, int]]:
+    """Where every section starts and how many lines it has, by language prefix."""
+    if not len(lines) or lines[0].split() != [BUNDLE_MAGIC, str(BUNDLE_VERSION)]:
+        raise ValueError("Not a bundle of this version.")
+    sections: Dict[str, Tuple[int, int]] = {}
+    i = 1
+    while True:
+        try:
+            line = lines[i].split()
+        except IndexError:
+            raise ValueError("Bundle header is not terminated by '#end'.") from None
+        if line == ["#end"]:
+            return sections
+        if len(line) != 4 or line[0] != "#section":
+            raise ValueError(f"Malformed bundle header line {i}: {lines[i]!r}")
+        sections[line[1]] = (int(line[2]), int(line[3]))
+        i += 1
@@ -0,0 +1,46 @@
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union, overload
+from array import array
+import mmap
+
+class MappedLines(Sequence[str]):
+    path: str
+    encoding: str
+    def __init__(self, path: str, encoding: str = "utf-8") -> None: ...
+    def close(self) -> None: ...
+    @property
+    def closed(self) -> bool: ...
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+    def __enter__(self) -> "MappedLines": ...
+    def __exit__(self, *exc) -> None: ...
+
+def changed_lines(old: Sequence[str], new: Sequence[str]) -> List[int]: ...
+def line_digests(path: str, encoding: str = "utf-8") -> array: ...
+
+COMPILED_SUFFIX: str
+COMPILED_MAGIC: bytes
+COMPILED_VERSION: int
+
+class CompiledLines(Sequence[str]):
+    translated: bool
+    source_hash: bytes
+    def __init__(self, buffer: Union[bytes, mmap.mmap], file: Optional[object] = None) -> None: ...
+    def close(self) -> None: ...
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+def compiled_path(source: str) -> str: ...
+def compile_catalog(source: str, translate: Callable[[str], str], fingerprint: bytes, encoding: str = "utf-8") -> bytes: ...
+def load_compiled(source: str, translate: Callable[[str], str], fingerprint: bytes, encoding: str = "utf-8", mapped: bool = False) -> CompiledLines: ...
+
+BUNDLE_MAGIC: str
+BUNDLE_VERSION: int
+
+def write_bundle(path: str, sections: Mapping[str, Sequence[str]], encoding: str = "utf-8") -> None: ...
+def read_bundle_header(lines: Sequence[str]) -> Dict[str, Tuple[int, int]]: ...
@@ -1,5 +1,7 @@
-from typing import Dict, Any
-from dataclasses import dataclass
+from typing import Dict, Any, Callable, Counter, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, overload
+from dataclasses import dataclass, field
+from collections import Counter as _Counter
+from enum import Enum, auto
 
 @dataclass
 class Achievement:
@@ -23,4 +25,246 @@ ACHIEVEMENTS = {
     "Buy": Achievement("Buyer", "Buy one item."),
     "Reavers Pike": Achievement("Reavers Pike", "Get the reavers pike for the first time!\nThe end must be close!"),
     "Axe": Achievement("Axe", "The axe is one of the first weapons you will find.")
-}
\ No newline at end of file
+}
+
+####################################################
+# Achievement engine                               #
+#                                                  #
+# ------------------------------------------------ #
+# The game reports what happens as events. Every   #
+# rule says which events it cares about, and rules #
+# are indexed by event, so an event only ever      #
+# looks at its own (still locked) rules. The same  #
+# events keep the progress towards the final up to #
+# date, so nothing is ever scanned again.          #
+####################################################
+
+class Event(Enum):
+    BATTLE = auto() # A round is about to be played, with the round of the fight
+    ROUND = auto() # A round was played
+    WIN = auto()
+    LOSS = auto()
+    BUY = auto() # With the weapon bought
+    SELL = auto() # With the weapon sold
+    WEAPON_ACQUIRED = auto() # With the weapon
+    WEAPON_LOST = auto() # With the weapon
+    WEAPON_USED = auto() # With the weapon attacked with
+    CURRENCY = auto() # With the currency and lifetime currency, after they changed
+
+@dataclass
+class Progress:
+    """Everything the rules and goals look at, kept up to date by the events."""
+    round: int = 0 # Of the current fight
+    rounds: int = 0
+    wins: int = 0
+    loses: int = 0
+    currency: int = 0
+    lifetime_currency: int = 0
+    weapons: Counter[str] = field(default_factory=_Counter) # By name
+    weapon_count: int = 0
+    achievements: int = 0
+
+    def apply(self, event: Event, value: Any) -> None:
+        match event:
+            case Event.BATTLE:
+                self.round = value
+            case Event.ROUND:
+                self.rounds += 1
+            case Event.WIN:
+                self.wins += 1
+            case Event.LOSS:
+                self.loses += 1
+            case Event.WEAPON_ACQUIRED:
+                self.weapons[value.name] += 1
+                self.weapon_count += 1
+            case Event.WEAPON_LOST:
+                self.weapons[value.name] -= 1
+                if self.weapons[value.name] <= 0:
+                    del self.weapons[value.name]
+                self.weapon_count -= 1
+            case Event.CURRENCY:
+                self.currency, self.lifetime_currency = value
+
+class Rule(NamedTuple):
+    key: str # In ACHIEVEMENTS
+    events: Tuple[Event, ...]
+    check: Callable[[Progress, Any], bool] # Gets the progress (already updated) and the event value
+
+def _always(progress: Progress, value: Any) -> bool:
+    return True
+
+RULES: Tuple[Rule, ...] = (
+    Rule("First Game", (Event.BATTLE,), _always),
+    Rule("Round Ten", (Event.BATTLE,), lambda progress, value: progress.round >= 10),
+    Rule("The Power Of The Trident", (Event.WEAPON_USED,), lambda progress, weapon: weapon.name == "Trident"),
+    Rule("First Win", (Event.WIN,), _always),
+    Rule("Win Five", (Event.WIN,), lambda progress, value: progress.wins >= 5),
+    Rule("Lose Five", (Event.LOSS,), lambda progress, value: progress.loses >= 5),
+    Rule("Inventory At Large", (Event.WEAPON_ACQUIRED,), lambda progress, weapon: progress.weapon_count >= 5),
+    Rule("Reavers Pike", (Event.WEAPON_ACQUIRED,), lambda progress, weapon: weapon.name == "Reavers Pike"),
+    Rule("Axe", (Event.WEAPON_ACQUIRED,), lambda progress, weapon: weapon.name == "Axe"),
+    Rule("Sell", (Event.SELL,), _always),
+    Rule("Buy", (Event.BUY,), _always),
+)
+
+# ---- The final ----
+
+class Goal(NamedTuple):
+    name: str
+    events: Tuple[Event, ...] # The events that can change it
+    value: Callable[[Progress], int]
+    target: int
+    strict: bool = False # Has to go past the target, not just reach it
+
+    def met(self, progress: Progress) -> bool:
+        value = self.value(progress)
+        return value > self.target if self.strict else value >= self.target
+
+def final_goals(difficulty: int) -> Tuple[Goal, ...]:
+    """What it takes to reach the final."""
+    return (
+        Goal("rounds", (Event.ROUND,), lambda progress: progress.rounds, 200 if difficulty == 2 else 50 if difficulty == 0 else 100),
+        Goal("wins", (Event.WIN,), lambda progress: progress.wins, 10),
+        Goal("loses", (Event.LOSS,), lambda progress: progress.loses, 5),
+        Goal("achievements", (), lambda progress: progress.achievements, 7), # Checked whenever one unlocks
+        Goal("reavers pike", (Event.WEAPON_ACQUIRED, Event.WEAPON_LOST), lambda progress: progress.weapons["Reavers Pike"], 1),
+        Goal("weapons", (Event.WEAPON_ACQUIRED, Event.WEAPON_LOST), lambda progress: progress.weapon_count, 3),
+        Goal("lifetime currency", (Event.CURRENCY,), lambda progress: progress.lifetime_currency, 500, strict=True),
+        Goal("currency", (Event.CURRENCY,), lambda progress: progress.currency, 2000, strict=True),
+    )
+
+class Goals:
+    """The final goals, and which of them are met, updated by the same events as the achievements."""
+
+    progress: Progress
+
+    __goals: Dict[str, Goal]
+    __index: Dict[Optional[Event], List[Goal]]
+    __met: Set[str]
+
+    def __init__(self, progress: Progress, difficulty: int = 1) -> None:
+        self.progress = progress
+        self.set_difficulty(difficulty)
+
+    def set_difficulty(self, difficulty: int) -> None:
+        self.__goals = {goal.name: goal for goal in final_goals(difficulty)}
+        self.__index = {}
+        for goal in self.__goals.values():
+            for event in goal.events or (None,):
+                self.__index.setdefault(event, []).append(goal)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Check every goal again (after the progress was changed by hand)."""
+        self.__met = {name for name, goal in self.__goals.items() if goal.met(self.progress)}
+
+    def update(self, event: Optional[Event]) -> None:
+        for goal in self.__index.get(event, ()):
+            if goal.met(self.progress):
+                self.__met.add(goal.name)
+            else:
+                self.__met.discard(goal.name)
+
+    def __getitem__(self, name: str) -> Tuple[int, int]:
+        """The value and the target of a goal."""
+        goal = self.__goals[name]
+        return goal.value(self.progress), goal.target
+
+    def met(self, name: str) -> bool:
+        return name in self.__met
+
+    def near(self, name: str, share: float = 0.75) -> bool:
+        value, target = self[name]
+        return value >= int(share * target)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.__met) == len(self.__goals)
+
+class Tracker(Sequence[Achievement]):
+    """
+    The unlocked achievements of one player, in the order they were unlocked, and the
+    engine that unlocks them. Report what happens with `emit`.
+    """
+
+    progress: Progress
+    goals: Goals
+
+    __unlocked: List[Achievement]
+    __keys: Set[str]
+    __rules: Dict[Event, List[Rule]]
+
+    def __init__(self, difficulty: int = 1) -> None:
+        self.progress = Progress()
+        self.goals = Goals(self.progress, difficulty)
+        self.__unlocked = []
+        self.__keys = set()
+        self.__rules = {}
+        for rule in RULES:
+            for event in rule.events:
+                self.__rules.setdefault(event, []).append(rule)
+
+    def emit(self, event: Event, value: Any = None) -> List[Achievement]:
+        """Report an event. Returns the achievements it unlocked."""
+        self.progress.apply(event, value)
+        self.goals.update(event)
+        rules = self.__rules.get(event)
+        if not rules:
+            return []
+        unlocked = [rule.key for rule in rules if rule.check(self.progress, value)]
+        return [self.unlock(key) for key in unlocked]
+
+    def unlock(self, key: str) -> Achievement:
+        achievement = ACHIEVEMENTS[key]
+        if key in self.__keys:
+            return achievement
+        self.__keys.add(key)
+        self.__unlocked.append(achievement)
+        for event, rules in self.__rules.items(): # Its rules never have to run again
+            rules[:] = [rule for rule in rules if rule.key != key]
+        self.progress.achievements = len(self.__unlocked)
+        self.goals.update(None)
+        return achievement
+
+    def unlock_all(self) -> None:
+        for key in ACHIEVEMENTS:
+            self.unlock(key)
+
+    def has(self, key: str) -> bool:
+        return key in self.__keys
+
+    @property
+    def keys(self) -> List[str]:
+        """Keys (in ACHIEVEMENTS) of the unlocked achievements, in order."""
+        by_id = {id(achievement): key for key, achievement in ACHIEVEMENTS.items()}
+        return [by_id[id(achievement)] for achievement in self.__unlocked]
+
+    def sync(self, rounds: int, wins: int, loses: int, currency: int, lifetime_currency: int, weapons: Iterable[Any], unlocked: Iterable[str] = ()) -> None:
+        """Start from an existing state (a new game, or a resumed one) instead of from nothing."""
+        for key in unlocked:
+            if key in ACHIEVEMENTS:
+                self.unlock(key)
+        progress = self.progress
+        progress.rounds, progress.wins, progress.loses = rounds, wins, loses
+        progress.currency, progress.lifetime_currency = currency, lifetime_currency
+        progress.weapons.clear()
+        progress.weapon_count = 0
+        for weapon in weapons: # Holding a weapon unlocks what getting it would have
+            self.emit(Event.WEAPON_ACQUIRED, weapon)
+        self.goals.refresh()
+
+    def __len__(self) -> int:
+        return len(self.__unlocked)
+
+    def __iter__(self) -> Iterator[Achievement]:
+        return iter(self.__unlocked)
+
+    @overload
+    def __getitem__(self, index: int) -> Achievement: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Achievement]: ...
+    def __getitem__(self, index):
+        return self.__unlocked[index]
+
+    def __contains__(self, achievement: object) -> bool:
+        return any(achievement is unlocked for unlocked in self.__unlocked)
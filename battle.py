@@ -0,0 +1,155 @@
+from typing import NamedTuple, Optional, Protocol, Tuple
+from dataclasses import dataclass, field
+from enum import Enum
+from items import Item
+from enemies import Enemy, EnemyPool
+from constants import MAX_HEALTH
+import random
+
+####################################################
+# Headless battle engine                           #
+#                                                  #
+# ------------------------------------------------ #
+# Every piece of combat math lives here: drift,    #
+# difficulty modifiers, the damage cache balancer, #
+# bleeding and enemy state changes. Nothing in     #
+# here prints, reads input or sleeps, so it can    #
+# run as many fights as the CPU allows.            #
+####################################################
+
+# small epsilon to avoid division by zero if both caches are zero
+EPS = 1e-6
+
+class Combatant(Protocol):
+    """Anything that carries the player side of a battle (a `state.GameState` does)."""
+    difficulty: int
+    health: int
+    blood: int
+    blood_ticks: int
+    scenery: float
+    player_damage_cache: float
+    enemy_damage_cache: float
+
+@dataclass
+class Player:
+    """A plain player record, for when there is no `GameState` to fight with."""
+    difficulty: int = 1
+    health: int = MAX_HEALTH
+    blood: int = 0
+    blood_ticks: int = 0
+    scenery: float = 200.0
+    player_damage_cache: float = field(default=0.0) # Smart auto balancing!
+    enemy_damage_cache: float = field(default=0.0)
+
+class Outcome(Enum):
+    ONGOING = 0
+    WIN = 1
+    LOSS = 2
+
+class RoundResult(NamedTuple):
+    player_damage: int
+    enemy_damage: int
+    outcome: Outcome
+
+def clamp(x: float, lo: float, hi: float) -> float:
+    return max(lo, min(hi, x))
+
+_pool = EnemyPool() # For the fights started here
+
+def new_enemy(weapon: Optional[Item] = None, pool: Optional[EnemyPool] = None) -> Enemy:
+    """A fresh enemy, recycled from `pool` when it has one to spare. Give it back with `pool.release` when the fight is over."""
+    return (pool or _pool).acquire(weapon)
+
+def resolve_round(player: Combatant, enemy: Enemy, action: Item, rng: random.Random) -> RoundResult:
+    """Play one round where the player attacks with `action`, and update both sides in place."""
+    difficulty = player.difficulty
+
+    # Normalized "who is ahead" metric in [0,1]
+    #  - 0.0 => player has done 0 damage and enemy dominated (player factor minimal)
+    #  - 0.5 => balanced
+    #  - 1.0 => player has done all the damage (enemy factor minimal)
+    total = player.player_damage_cache + player.enemy_damage_cache + EPS
+    player_share = player.player_damage_cache / total   # in (0,1)
+    # We want player_factor such that when player_share is 0.5, factor is 0.5
+    # and when player_share is high, player_factor reduces enemy's chance (or vice versa).
+    player_factor = clamp(1.0 - player_share, 0.0, 1.0)
+    enemy_factor = clamp(1.0 - player_factor, 0.0, 1.0)  # equals player_share, but kept explicit
+
+    # drift: base between 1.05 and 1.35 (same distribution as 1.35 - rng.random()*0.30)
+    base_drift = 1.35 - rng.random() * 0.30
+
+    # difficulty modifiers (explicit)
+    if difficulty == 0 or player_factor >= 0.75:      # easy
+        player_diff_mod = +0.05
+        enemy_diff_mod  = -0.05
+    elif difficulty == 2 or enemy_factor >= 0.75:    # hard
+        player_diff_mod = -0.05
+        enemy_diff_mod  = +0.05
+    else:                        # normal (1)
+        player_diff_mod = 0.0
+        enemy_diff_mod  = 0.0
+
+    player_drift = base_drift + player_diff_mod
+    # recompute base for enemy separately so RNG affects both independently
+    enemy_drift = 1.35 - rng.random() * 0.30 + enemy_diff_mod
+
+    # Compose variable chances and clamp to [0.0, 1.0]
+    player_variable_chance = clamp(enemy.state.value.other_attack_chance * player_drift, 0.0, 1.0)
+    enemy_variable_chance  = clamp(enemy_drift, 0.0, 1.0)
+
+    # difficulty multipliers for final damage output (explicit)
+    player_damage_mult = 1.15 if difficulty == 0 else 0.85 if difficulty == 2 else 1.0
+    enemy_damage_mult  = 0.85 if difficulty == 0 else 1.15 if difficulty == 2 else 1.0
+
+    player_damage = int(action.damage_now(player_variable_chance, rng) * player_damage_mult)
+    enemy_damage  = int(enemy.damage_now(enemy_variable_chance, rng) * enemy_damage_mult)
+
+    player.player_damage_cache = player.player_damage_cache * 0.8 + player_damage * 0.2
+    player.enemy_damage_cache  = player.enemy_damage_cache * 0.8 + enemy_damage * 0.2
+    player.scenery *= action.scenery
+
+    player.health = player.health - enemy_damage
+    enemy.health = enemy.health - player_damage
+
+    enemy.apply_blood(action, player_damage) # Does the exact same thing, but for the enemy
+
+    if player.blood > 0:
+        player.health = player.health - player.blood
+        player.blood_ticks = player.blood_ticks - 1
+        if player.blood_ticks <= 0:
+            player.blood = 0
+            player.blood_ticks = 0
+
+    if enemy_damage > 0:
+        player.blood = min(player.blood + enemy.weapon.blood, 5)
+        player.blood_ticks = min(player.blood_ticks + enemy.weapon.blood_ticks, 3)
+
+    player_dead = player.health <= 0
+    enemy_dead = enemy.health <= 0
+
+    if player_dead and enemy_dead: # Both fell, so the crowd decides
+        outcome = Outcome.WIN if rng.random() < (0.45 if difficulty == 0 else 0.25) else Outcome.LOSS
+    elif player_dead:
+        outcome = Outcome.LOSS
+    elif enemy_dead:
+        outcome = Outcome.WIN
+    else:
+        outcome = Outcome.ONGOING
+
+    return RoundResult(player_damage, enemy_damage, outcome)
+
+def fight(player: Combatant, enemy: Enemy, action: Item, rng: random.Random, max_rounds: int = 10_000) -> Tuple[Outcome, int]:
+    """Fight until someone falls, always attacking with `action`. Returns the outcome and rounds played."""
+    for rounds in range(1, max_rounds + 1):
+        outcome = resolve_round(player, enemy, action, rng).outcome
+        if outcome is not Outcome.ONGOING:
+            return outcome, rounds
+    return Outcome.ONGOING, max_rounds
+
+def simulate(weapon: Item, enemy_weapon: Item, difficulty: int = 1, rng: Optional[random.Random] = None) -> Tuple[Outcome, int]:
+    """Run one fresh fight between two weapons, as a brand new player would."""
+    enemy = new_enemy(enemy_weapon)
+    try:
+        return fight(Player(difficulty), enemy, weapon, rng or random.Random())
+    finally:
+        _pool.release(enemy)
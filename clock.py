@@ -0,0 +1,66 @@
+from typing import Callable
+import asyncio
+import time
+
+####################################################
+# Virtual clock                                    #
+#                                                  #
+# ------------------------------------------------ #
+# Every pause in the game goes through a clock, so #
+# the pacing can be sped up, slowed down or turned #
+# off entirely (for tests and replays) without     #
+# touching the game itself. Players get the real   #
+# thing, with a scale of 1.                        #
+####################################################
+
+class Clock:
+    """
+    Scales every pause by `scale`: 1 is real time, 0.5 twice as fast, and 0 instant.
+
+    `now` is the game time: real time plus every second an instant (or sped up) pause
+    skipped, so it reads the same however fast the game actually ran.
+    """
+
+    scale: float
+
+    __skipped: float
+    __timer: Callable[[], float]
+
+    def __init__(self, scale: float = 1.0, timer: Callable[[], float] = time.monotonic) -> None:
+        if scale < 0:
+            raise ValueError("The time scale can't be negative.")
+        self.scale = scale
+        self.__skipped = 0.0
+        self.__timer = timer
+
+    @classmethod
+    def instant(cls) -> "Clock":
+        return cls(0.0)
+
+    @property
+    def is_instant(self) -> bool:
+        return self.scale == 0
+
+    @property
+    def skipped(self) -> float:
+        """Seconds of pauses that didn't have to be waited for."""
+        return self.__skipped
+
+    def now(self) -> float:
+        return self.__timer() + self.__skipped
+
+    def __real(self, seconds: float) -> float:
+        seconds = max(0.0, seconds)
+        real = seconds * self.scale
+        self.__skipped += seconds - real
+        return real
+
+    async def sleep(self, seconds: float) -> None:
+        """Pause for `seconds` of game time."""
+        await asyncio.sleep(self.__real(seconds)) # Even an instant pause lets other tasks run
+
+    def sleep_blocking(self, seconds: float) -> None:
+        """Like `sleep`, for code that isn't on the event loop."""
+        real = self.__real(seconds)
+        if real:
+            time.sleep(real)
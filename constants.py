@@ -80,4 +80,21 @@ INFO_TEXT = [
 ]
 
 RANDOM_SEED = None
-STATE_CHANGE = (1.0, 0.15, 0.05, 0.02)
\ No newline at end of file
+STATE_CHANGE = (1.0, 0.15, 0.05, 0.02)
+MAX_HEALTH = 25 # Of the player and of every enemy, when a fight starts
+ENEMY_POOL_SIZE = 8 # Finished enemies kept around for the next fights
+
+TIME_SCALE = 1.0 # How long every pause in the game lasts, 1 is real time and 0 skips them
+
+MUSIC_CHECK_INTERVAL = 0.5 # Seconds between checks that the background music still plays
+AUTOSAVE_INTERVAL = 30.0 # Seconds between autosaves
+
+SAVE_PATH = "./save.gsv" # Where the progress is kept between sessions
+SAVE_COMPACT_EVERY = 64 # Deltas appended to the save before it is rewritten as one snapshot
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 2323
+SERVER_MAX_SESSIONS = 10000 # Connections past this are turned away
+SERVER_IDLE_TIMEOUT = 600.0 # Seconds without input before a connection is closed
+SERVER_WRITE_BUFFER = 64 * 1024 # Bytes of unsent output a connection may pile up before its session waits
+SERVER_MAX_LINE = 1024 # Characters of a single line of input
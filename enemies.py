@@ -1,7 +1,11 @@
-from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+from dataclasses import dataclass
+from collections import deque
 from items import Item
 from enum import Enum
-from constants import NAMES, RANDOM_SEED, STATE_CHANGE
+from itertools import accumulate
+from bisect import bisect
+from constants import ENEMY_POOL_SIZE, MAX_HEALTH, NAMES, RANDOM_SEED, STATE_CHANGE
 from items import get_weapon
 import random
 
@@ -28,18 +32,36 @@ class EnemyState(Enum):
     PROTECTIVE = StateMachine.State(1.0, 0.75)
     CASUAL = StateMachine.State(1.0, 1.0)
 
-@dataclass
+# The transition weights never change, so we accumulate them once instead of on every attack.
+# Drawing with `bisect` consumes the random stream exactly like `rng.choices(..., STATE_CHANGE)`.
+STATE_CUM_WEIGHTS = list(accumulate(STATE_CHANGE))
+STATE_TOTAL_WEIGHT = STATE_CUM_WEIGHTS[-1]
+
+def next_state(state: EnemyState, source: Optional[random.Random] = None) -> EnemyState:
+    i = bisect(STATE_CUM_WEIGHTS, (source or rng).random() * STATE_TOTAL_WEIGHT, 0, len(STATE_CUM_WEIGHTS) - 1)
+    return (state, EnemyState.CASUAL, EnemyState.PROTECTIVE, EnemyState.AGGRESIVE)[i]
+
+@dataclass(slots=True, eq=False, init=False)
 class Enemy:
-    name: str = field(init=False)
-    health: int = field(init=False)
-    weapon: Item = field(init=False)
-    state: EnemyState = field(init=False)
-    blood: int = field(init=False)
-    blood_ticks: int = field(init=False)
-
-    def __post_init__(self) -> None:
-        self.name = rng.choice(NAMES)
-        self.weapon = get_weapon()
+    name: str
+    health: int
+    weapon: Item
+    state: EnemyState
+    blood: int
+    blood_ticks: int
+
+    def __init__(self, weapon: Optional[Item] = None, source: Optional[random.Random] = None, items_source: Optional[random.Random] = None) -> None:
+        self.reset(weapon, source, items_source)
+
+    def reset(self, weapon: Optional[Item] = None, source: Optional[random.Random] = None, items_source: Optional[random.Random] = None) -> None:
+        """
+        Turn this into a brand new enemy, ready to fight. With a `weapon` no weapon is drawn.
+        `source` draws the name and `items_source` the weapon, for sessions with their own random streams.
+        """
+        self.name = (source or rng).choice(NAMES)
+        self.weapon = weapon if weapon is not None else get_weapon(items_source)
+        self.health = MAX_HEALTH
+        self.state = EnemyState.CASUAL
         self.blood = 0
         self.blood_ticks = 0
     
@@ -55,6 +77,58 @@ class Enemy:
             self.blood = min(self.blood + action.blood, 5)
             self.blood_ticks = min(self.blood_ticks + action.blood_ticks, 3)
     
-    def damage_now(self, variable_chance: float = 1.0) -> int:
-        self.state = rng.choices((self.state, EnemyState.CASUAL, EnemyState.PROTECTIVE, EnemyState.AGGRESIVE), STATE_CHANGE)[0]
-        return int(self.weapon.damage_now(self.state.value.this_attack_chance * variable_chance))
\ No newline at end of file
+    def damage_now(self, variable_chance: float = 1.0, source: Optional[random.Random] = None) -> int:
+        self.state = next_state(self.state, source)
+        return int(self.weapon.damage_now(self.state.value.this_attack_chance * variable_chance, source))
+
+class EnemyPool:
+    """
+    Recycles finished enemies, so a fight doesn't have to allocate a new one, and can
+    prepare a batch of enemies ahead of time (drawing their names and weapons up front).
+    """
+
+    size: int
+    source: Optional[random.Random] # Draws the names, the module stream if None
+    items_source: Optional[random.Random] # Draws the weapons, the items stream if None
+
+    __free: List[Enemy] # Finished, waiting to be reset
+    __ready: Deque[Enemy] # Prepared, handed out first
+    __slots__ = ("size", "source", "items_source", "_EnemyPool__free", "_EnemyPool__ready",)
+
+    def __init__(self, size: int = ENEMY_POOL_SIZE, source: Optional[random.Random] = None, items_source: Optional[random.Random] = None) -> None:
+        self.size = size
+        self.source = source
+        self.items_source = items_source
+        self.__free = []
+        self.__ready = deque()
+
+    def __take(self, weapon: Optional[Item] = None) -> Enemy:
+        if not self.__free:
+            return Enemy(weapon, self.source, self.items_source)
+        enemy = self.__free.pop()
+        enemy.reset(weapon, self.source, self.items_source)
+        return enemy
+
+    def acquire(self, weapon: Optional[Item] = None) -> Enemy:
+        """The next prepared enemy, or a fresh one (carrying `weapon`, if given)."""
+        if self.__ready and weapon is None:
+            return self.__ready.popleft()
+        return self.__take(weapon)
+
+    def release(self, enemy: Optional[Enemy]) -> None:
+        """Give a finished enemy back, to be reset for a later fight."""
+        if enemy is not None and len(self.__free) < self.size:
+            self.__free.append(enemy)
+
+    def prepare(self, count: int) -> None:
+        """Have `count` enemies ready ahead of time."""
+        while len(self.__ready) < count:
+            self.__ready.append(self.__take())
+
+    @property
+    def ready(self) -> int:
+        return len(self.__ready)
+
+    @property
+    def free(self) -> int:
+        return len(self.__free)
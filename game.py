@@ -1,232 +1,91 @@
-from typing import List, Dict, TypeVar, Callable, Generic, ValuesView, Optional, Any
-from colorama import init as colorama_init, Fore, Back, Style
-from dataclasses import dataclass, field
-from translator import Transcriber, Language
-from playsound3.playsound3 import Sound
-from playsound3 import playsound
-from enum import Enum
-from items import Item, WEAPONS, WEAPON_RARITY, get_weapon
-from enemies import Enemy, EnemyState
-from achievements import Achievement, ACHIEVEMENTS
+from typing import Dict, List, Optional
+from colorama import init as colorama_init, Fore, Style
+from translator import Language
+from items import Item, WEAPONS, PRICES, get_weapon
+from achievements import ACHIEVEMENTS, Event
+from inventory import Inventory
+from settings import Settings
+from session import Session, Quit
+from clock import Clock
 import constants
-import random
-import msvcrt
+import runtime
+import screen
+import keys
+import battle
+import asyncio
+import argparse
+import replay
+import save
 import time
 import sys
 import os
 
-# ---- Initialization ----
-
-if __name__ != "__main__": 
-    sys.exit() # We are importing the script
-
-print("Loading...")
-
-colorama_init() # We'll initialize the colorama module
-
-def clear_screen(): # Create a method to clear the screen
-    if os.name == "nt":
-        os.system("cls") # Windows
-    else: os.system("clear") # Linux / Macbook
-
-def draw_title(*text: str) -> None: # We'll create a title method to render all title firstly for every page
-    clear_screen()
-    print(*text, end="\n\n")
-
-# We'll manifacture the drop down menu
-def prompt_menu(title: str, prompt: str, options: Dict[str, str]):
-    print(title)
-    for k, v in options.items():
-        print(Fore.BLUE + k + ": " + Fore.RESET + v)
-    return input(prompt)
-
-# We'll create a method to run a new background sound
-background_sound = "./sounds/menu.mp3"
-def create_background_music() -> Sound:
-    return playsound(background_sound, False)
-
-rng = random.Random(constants.RANDOM_SEED) # We literally use this everywhere, and it is a constant.
-
-# ---- Settings ----
-
-# We'll create a type var for typing, when it is dynamic and not directly static
-SettingType = TypeVar("SettingType", bound=Any)
-
-# We'll create a dataclass for a setting
-@dataclass
-class Setting(Generic[SettingType]):
-    value: SettingType
-    toggle: bool = field(default=False)
-    custom_logic: Callable[..., Any] = field(default=lambda: None)
-    enum: "Settings" = field(init=False)
-
-# We'll create a enum for different settings
-class Settings(Enum):
-    GORE: Setting[bool] = Setting(False) # Wheter we express bloddy and visious imaginary text
-    MUSIC: Setting[bool] = Setting(True, toggle=True, custom_logic=lambda: Game.toggle_music())
-
-    @classmethod
-    def load(cls) -> None: # Load all settings so they appeal to their real object
-        for v in cls.__members__.values():
-            if isinstance(v.value, Setting):
-                v.value.enum = v
-
-    @classmethod
-    def all(cls) -> ValuesView[Setting]: # Get all settings
-        return cls.__members__.values()
-    
-    @property
-    def setting(self) -> Setting: # Get the setting object, with the given value
-        return object.__getattribute__(self, "_value_")
-    
-    @property
-    def name(self) -> str: # The name will be the capitalization of that of the real enum name
-        return object.__getattribute__(self, "_name_").capitalize()
-
-    @property
-    def value(self) -> SettingType: # Get the real value in the setting
-        return self.setting.value
-    
-    @property
-    def toggle(self) -> bool:
-        return self.setting.toggle
-    
-    @property
-    def text_value(self) -> str: # Get the text correspondance of the value
-        if isinstance(self.value, bool):
-            return transcriber.get_index(13) if self.value else transcriber.get_index(14)
-
-    def handle_input(self, text: str) -> None: # Handle text input.
-        if isinstance(self.value, bool):
-            if self.toggle:
-                self.setting.value = not self.value
-                self.setting.custom_logic()
-                return
-            on_text, off_text = transcriber.get_index(13).lower().strip(), transcriber.get_index(14).lower().strip()
-            self.setting.value = text.lower().strip() in (on_text[0], on_text) and not text in (off_text[0], off_text)
-
 # ---- Game ----
 
-class Game: # Create a namespace for our game
-    player_name: str = "" # The player name
-    difficulty: int = 1
-    active: bool = False # Wheter the game is actively running or not
-
-    health: int = 25
-    weapons: List[Item] = [
-        get_weapon()
-    ]
-
-    background_music: Sound
-    enemy: Enemy = None
-    round: int = 1
-
-    currency: int = 0
-    lifetime_currency: int = 0
-
-    player_damage_cache: float = 0.0 # Smart auto balancing!
-    enemy_damage_cache: float = 0.0
-
-    total_rounds: int = 0
-    loses: int = 0
-    wins: int = 0
-
-    blood: int = 0
-    blood_ticks: int = 0
-
-    has_first_game_achievement: bool = False
-    has_trident_achievement: bool = False
-    has_win_achievement: bool = False
-    has_inventory_achievement: bool = False
-    has_round_ten_achievement: bool = False
-    has_lose_five_achievement: bool = False
-    has_win_five_achievement: bool = False
-    has_sell_achievement: bool = False
-    has_buy_achievement: bool = False
-    has_reavers_pike_achievement: bool = False
-    has_axe_achievement: bool = False
-
-    scenery: float = 200.0 # You begin with hundred scenery points.
-
-    achievements: List[Achievement] = []
-
-    log: str = None
-
-    _final_shown: bool = False
-
-    def toggle_music() -> None:
-        if Game.background_music:
-            Game.background_music.stop()
-            Game.background_music = None
-        else: 
-            Game.background_music = create_background_music()
-
-    def menu() -> None: # Start rendering the menu
-        global background_sound
+class Game: # Create a namespace for our screens, everything they change lives in the session they are given
+    async def menu(session: Session) -> None: # Start rendering the menu
+        state = session.state
         while True:
-            if Settings.MUSIC.value and not Game.background_music.is_alive():
-                Game.background_music = create_background_music()
-            
-            draw_title(Fore.CYAN + Style.BRIGHT + transcriber.get_index(1).upper() + Style.RESET_ALL)
-            print((f"{Fore.RED}HARD{Fore.RESET}" if Game.difficulty == 2 else f"{Fore.BLUE}NORMAL{Fore.RESET}" if Game.difficulty == 1 else f"{Fore.GREEN}EASY{Fore.RESET}" if Game.difficulty == 0 else f"{Fore.MAGENTA}EXPERIMENTAL{Fore.RESET}"))
-            print()
-            print(rng.choice(constants.INFO_TEXT))
-            print()
-            print(f"Final progress: \n{len(Game.achievements)}/7 Achievements\n{Game.wins}/10 Wins\n{Game.loses}/5 Loses\n{Game.total_rounds}/{(200 if Game.difficulty == 2 else 50 if Game.difficulty == 0 else 100)} Rounds")
-            print()
-            print(f"{Style.DIM}Makaronies are your unit of comparison.{Style.RESET_ALL}")
-            print(f"{Game.lifetime_currency} Makaronies earned in total")
-            print(f"{Game.total_rounds} Total rounds")
-            print(f"{Game.wins} Wins")
-            print(f"{Game.loses} Loses")
-            print()
-            directory = prompt_menu(
-                title = transcriber.get_index(5), 
-                prompt = transcriber.get_index(6), 
+            session.draw_title(Fore.CYAN + Style.BRIGHT + session.text(1).upper() + Style.RESET_ALL)
+            session.print((f"{Fore.RED}HARD{Fore.RESET}" if state.difficulty == 2 else f"{Fore.BLUE}NORMAL{Fore.RESET}" if state.difficulty == 1 else f"{Fore.GREEN}EASY{Fore.RESET}" if state.difficulty == 0 else f"{Fore.MAGENTA}EXPERIMENTAL{Fore.RESET}"))
+            session.print()
+            session.print(session.rng.choice(constants.INFO_TEXT))
+            session.print()
+            goals = state.achievements.goals
+            session.print("Final progress: ")
+            for goal, label in (("achievements", "Achievements"), ("wins", "Wins"), ("loses", "Loses"), ("rounds", "Rounds")):
+                session.print("{}/{} {}".format(*goals[goal], label))
+            session.print()
+            session.print(f"{Style.DIM}Makaronies are your unit of comparison.{Style.RESET_ALL}")
+            session.print(f"{state.lifetime_currency} Makaronies earned in total")
+            session.print(f"{state.total_rounds} Total rounds")
+            session.print(f"{state.wins} Wins")
+            session.print(f"{state.loses} Loses")
+            session.print()
+            directory = (await session.prompt_menu(
+                title = session.text(5), 
+                prompt = session.text(6), 
                 options = {
-                    "1": transcriber.get_index(7),
-                    "2": transcriber.get_index(8),
-                    "3": transcriber.get_index(33),
-                    "4": transcriber.get_index(37),
-                    "5": transcriber.get_index(38),
-                    "6": transcriber.get_index(9)
+                    "1": session.text(7),
+                    "2": session.text(8),
+                    "3": session.text(33),
+                    "4": session.text(37),
+                    "5": session.text(38),
+                    "6": session.text(9)
                 }
-            ).lower().strip()
+            )).lower().strip()
             match directory: # do something depending on the input
                 case "1":
-                    Game.game()
+                    await Game.game(session)
                 case "2":
-                    Game.options()
+                    await Game.options(session)
                 case "3":
-                    Game.stats()
+                    await Game.stats(session)
                 case "4":
-                    Game.shop()
+                    await Game.shop(session)
                 case "5":
-                    Game.trader()
+                    await Game.trader(session)
                 case "6":
-                    sys.exit()
+                    raise Quit
 
-            if Settings.MUSIC.value and (not background_sound == "./sounds/menu.mp3" or not Game.background_music.is_alive()):
-                background_sound = "./sounds/menu.mp3"
-                Game.background_music.stop()
-                Game.background_music = create_background_music()
+            session.switch_music("./sounds/menu.mp3")
     
-    def options() -> None: # Start rendering the options
+    async def options(session: Session) -> None: # Start rendering the options
         while True:
-            draw_title(Fore.CYAN + Style.BRIGHT + transcriber.get_index(2).upper() + Style.RESET_ALL)
+            session.draw_title(Fore.CYAN + Style.BRIGHT + session.text(2).upper() + Style.RESET_ALL)
 
             options: Dict[str, str] = {}
             settings: Dict[str, Settings] = {}
             for i, v in enumerate(Settings.all()): # We'll generate all the options before we can use them in the menu
                 i = str(i + 1)
                 settings[i] = v
-                options[i] = v.name + f" [{Fore.MAGENTA}{v.text_value}{Style.RESET_ALL}]"
+                options[i] = v.name + f" [{Fore.MAGENTA}{v.text_value(session)}{Style.RESET_ALL}]"
 
-            setting_name = prompt_menu(
-                title = transcriber.get_index(10),
-                prompt = transcriber.get_index(11),
+            setting_name = (await session.prompt_menu(
+                title = session.text(10),
+                prompt = session.text(11),
                 options = options
-            ).lower().strip()
+            )).lower().strip()
 
             setting = settings.get(
                 setting_name.lower().strip()
@@ -234,66 +93,53 @@ class Game: # Create a namespace for our game
             if not setting: # We'll exit the settings if the setting was incorrect
                 return
             if not setting.toggle:
-                setting.handle_input(input(transcriber.get_index(12)))
-            else: setting.handle_input("")
+                setting.handle_input(session, await session.read_line(session.text(12)))
+            else: setting.handle_input(session, "")
     
-    def stats() -> None:
-        draw_main_title()
-        print(transcriber.get_index(33))
-        print()
-        if len(Game.achievements) > 0:
-            for achievement in Game.achievements:
-                print(achievement.text)
-        else: print(transcriber.get_index(34))
-        print()
-        print(transcriber.get_index(35))
-        msvcrt.getch()
+    async def stats(session: Session) -> None:
+        state = session.state
+        session.draw_main_title()
+        session.print(session.text(33))
+        session.print()
+        if len(state.achievements) > 0:
+            for achievement in state.achievements:
+                session.print(achievement.text)
+        else: session.print(session.text(34))
+        session.print()
+        session.print(session.text(35))
+        await session.wait_key()
     
-    def shop() -> None:
-        global background_sound
-        background_sound = "./sounds/shop.mp3"
-        if Settings.MUSIC.value:
-            Game.background_music.stop()
-            Game.background_music = create_background_music()
+    async def shop(session: Session) -> None:
+        state = session.state
+        session.switch_music("./sounds/shop.mp3")
         while True:
-            if Settings.MUSIC.value and not Game.background_music.is_alive():
-                Game.background_music = create_background_music()
 
-            draw_main_title()
-            print(f"{Game.currency} Makaronies")
-            print()
+            session.draw_main_title()
+            session.print(f"{state.currency} Makaronies")
+            session.print()
             costs = {}
             weapons = {}
             menu_options = {}
 
-            total_weights = sum(WEAPON_RARITY) or 1
+            prices = PRICES.table()
             for i, weapon in enumerate(WEAPONS):
                 ident = str(i + 1)
-                weight = WEAPON_RARITY[WEAPONS.index(weapon)]
-                prob = weight / total_weights
-                rarity_multiplier = 1.0 - prob  # rarer -> larger multiplier
-                # ensure the weapon object has .rarity, .blood, .blood_ticks attributes
-                rarity_reward = constants.RARITY_REWARD.get(getattr(weapon, "rarity", "common"), 0)
-                blood_spill = ((weapon.damage + getattr(weapon, "blood", 0) * getattr(weapon, "blood_ticks", 0)) / 2)
-                # clamp/scaling for stability
-                base = max(0.0, blood_spill * weapon.damage_chance * weapon.scenery)
-                reward = int(rarity_multiplier * base * 100) + rarity_reward
-                cost = max(1, reward * 10)
+                cost = prices[weapon.index].cost
 
                 # only display purchasable weapons (or filter designer chooses)
                 if weapon.rarity == "experimental": continue
                 costs[ident] = cost
                 weapons[ident] = weapon
-                affordable = Game.currency >= cost
+                affordable = state.currency >= cost
                 menu_options[ident] = f"{constants.RARITY_COLOR.get(weapon.rarity)}{weapon.name}{Style.RESET_ALL} " \
                                     f"({weapon.damage} dmg, {weapon.damage_chance:.2f} hit, bleed {getattr(weapon,'blood',0)}x{getattr(weapon,'blood_ticks',0)}) - " \
                                     f"{Style.BRIGHT}{Fore.GREEN if affordable else Fore.RED}{cost} Makaronies{Style.RESET_ALL}"
                     
-            purchase_name = prompt_menu(
-                title = transcriber.get_index(37),
-                prompt = transcriber.get_index(17),
+            purchase_name = (await session.prompt_menu(
+                title = session.text(37),
+                prompt = session.text(17),
                 options = menu_options
-            ).lower().strip()
+            )).lower().strip()
             
             purchase_weapon = weapons.get(purchase_name)
             purchase_cost = costs.get(purchase_name)
@@ -301,51 +147,34 @@ class Game: # Create a namespace for our game
             if not purchase_weapon:
                 return
             
-            if Game.currency >= purchase_cost:
-                Game.weapons.append(purchase_weapon)
-                Game.currency -= purchase_cost
-
-                if not Game.has_buy_achievement:
-                    Game.achievements.append(ACHIEVEMENTS["Buy"])
-                    Game.has_buy_achievement = True
+            if state.currency >= purchase_cost:
+                state.give_weapon(purchase_weapon)
+                state.add_currency(-purchase_cost)
+                state.track(Event.BUY, purchase_weapon)
+                session.save_game()
     
-    def trader() -> None:
-        global background_sound
-        background_sound = "./sounds/shop.mp3"
-        if Settings.MUSIC.value:
-            Game.background_music.stop()
-            Game.background_music = create_background_music()
+    async def trader(session: Session) -> None:
+        state = session.state
+        session.switch_music("./sounds/shop.mp3")
         while True:
-            if Settings.MUSIC.value and not Game.background_music.is_alive():
-                Game.background_music = create_background_music()
                 
-            draw_main_title()
-            print(f"{Game.currency} Makaronies")
-            print()
+            session.draw_main_title()
+            session.print(f"{state.currency} Makaronies")
+            session.print()
 
-            if len(Game.weapons) <= 1:
-                print(transcriber.get_index(39))
-                msvcrt.getch()
+            if len(state.weapons) <= 1:
+                session.print(session.text(39))
+                await session.wait_key()
                 return
 
             gives = {}
             weapons = {}
             menu_options = {}
 
-            total_weights = sum(WEAPON_RARITY) or 1
-            for i, weapon in enumerate(Game.weapons):
+            prices = PRICES.table()
+            for i, weapon in enumerate(state.weapons):
                 ident = str(i + 1)
-                weight = WEAPON_RARITY[i]
-                prob = weight / total_weights
-                rarity_multiplier = 1.0 - prob  # rarer -> larger multiplier
-                # ensure the weapon object has .rarity, .blood, .blood_ticks attributes
-                rarity_reward = constants.RARITY_REWARD.get(getattr(weapon, "rarity", "common"), 0)
-                blood_spill = ((weapon.damage + getattr(weapon, "blood", 0) * getattr(weapon, "blood_ticks", 0)) / 2)
-                # clamp/scaling for stability
-                base = max(0.0, blood_spill * weapon.damage_chance * weapon.scenery)
-                reward = int(rarity_multiplier * base * 100) + rarity_reward
-                cost = max(1, reward * 10)
-                give = int(cost / 2)
+                give = prices[weapon.index].trade
 
                 # only display purchasable weapons (or filter designer chooses)
                 gives[ident] = give
@@ -354,11 +183,11 @@ class Game: # Create a namespace for our game
                                     f"({weapon.damage} dmg, {weapon.damage_chance:.2f} hit, bleed {getattr(weapon,'blood',0)}x{getattr(weapon,'blood_ticks',0)}) - " \
                                     f"{give} Makaronies"
                     
-            trade_name = prompt_menu(
-                title = transcriber.get_index(38),
-                prompt = transcriber.get_index(17),
+            trade_name = (await session.prompt_menu(
+                title = session.text(38),
+                prompt = session.text(17),
                 options = menu_options
-            ).lower().strip()
+            )).lower().strip()
             
             trade_weapon = weapons.get(trade_name)
             trade_gives = gives.get(trade_name)
@@ -367,326 +196,197 @@ class Game: # Create a namespace for our game
                 return
             
             # confirm
-            draw_main_title()
-            print(transcriber.get_index(40).replace("trade_gives", str(trade_gives)).replace("trade_name", trade_weapon.name))
-            resp = input("> ").strip().lower()
+            session.draw_main_title()
+            session.print(session.render(40, trade_gives = trade_gives, trade_name = trade_weapon.name))
+            resp = (await session.read_line("> ")).strip().lower()
             if resp not in ("y", "yes"):
                 continue  # return to trader menu
             
-            Game.weapons.remove(trade_weapon)
-            Game.currency += trade_gives
-
-            if not Game.has_sell_achievement:
-                Game.achievements.append(ACHIEVEMENTS["Sell"])
-                Game.has_sell_achievement = True
+            state.take_weapon(trade_weapon)
+            state.add_currency(trade_gives)
+            state.track(Event.SELL, trade_weapon)
+            session.save_game()
     
-    def game() -> None: # We'll handle the actual game logic here
-        global background_sound
-        Game.active = True
-        background_sound = "./sounds/fight.mp3"
-        if Settings.MUSIC.value:
-            Game.background_music.stop()
-            Game.background_music = create_background_music()
-        while Game.active:
-            draw_main_title()
-            if Settings.MUSIC.value and not Game.background_music.is_alive():
-                Game.background_music = create_background_music()
-            Game.battle()
+    async def game(session: Session) -> None: # We'll handle the actual game logic here
+        state = session.state
+        state.active = True
+        session.switch_music("./sounds/fight.mp3")
+        while state.active:
+            session.draw_main_title()
+            await Game.battle(session)
     
-    def render_game() -> None:
-        print(
-            transcriber.get_index(21, 26)\
-                .replace("player_name", Game.player_name)\
-                .replace("enemy_name", Game.enemy.name)\
-                .replace("game_round", str(Game.round))\
-                .replace("player_health", str(Game.health))\
-                .replace("enemy_health", str(Game.enemy.health))\
-                .replace("player_blood", f"{Game.blood}x{Game.blood_ticks}")\
-                .replace("enemy_blood", f"{Game.enemy.blood}x{Game.enemy.blood_ticks}")
+    def render_game(session: Session) -> None:
+        state = session.state
+        session.print(
+            session.render(
+                21, 26,
+                player_name = state.player_name,
+                enemy_name = state.enemy.name,
+                game_round = state.round,
+                player_health = state.health,
+                enemy_health = state.enemy.health,
+                player_blood = f"{state.blood}x{state.blood_ticks}",
+                enemy_blood = f"{state.enemy.blood}x{state.enemy.blood_ticks}"
+            )
         )
-        print()
+        session.print()
 
-        if Game.log:
-            print(Game.log)
-            print()
+        if state.log:
+            session.print(state.log)
+            session.print()
     
-    def battle() -> Optional[bool]:
-        if not Game.has_first_game_achievement:
-            Game.achievements.append(ACHIEVEMENTS["First Game"])
-            Game.has_first_game_achievement = True
-        
-        if not Game.has_round_ten_achievement and Game.round >= 10:
-            Game.achievements.append(ACHIEVEMENTS["Round Ten"])
-            Game.has_round_ten_achievement = True
-        
-        if not Game.has_inventory_achievement and len(Game.weapons) >= 5:
-            Game.achievements.append(ACHIEVEMENTS["Inventory At Large"])
-            Game.has_inventory_achievement = True
-        
-        if not Game.has_reavers_pike_achievement and any(weapon.name == "Reavers Pike" for weapon in Game.weapons):
-            Game.achievements.append(ACHIEVEMENTS["Reavers Pike"])
-            Game.has_reavers_pike_achievement = True
-        
-        if not Game.has_axe_achievement and any(weapon.name == "Axe" for weapon in Game.weapons):
-            Game.achievements.append(ACHIEVEMENTS["Axe"])
-            Game.has_axe_achievement = True
-
-        if not Game.enemy:
-            Game.enemy = Enemy()
-            Game.enemy.health = 25
-            Game.enemy.state = EnemyState.CASUAL
+    async def battle(session: Session) -> Optional[bool]:
+        state = session.state
+        state.track(Event.BATTLE, state.round)
+
+        if not state.enemy:
+            state.enemy = battle.new_enemy(pool=session.enemy_pool)
         
-        Game.render_game()
+        Game.render_game(session)
 
         options: Dict[str, Item] = {}
-        for i, weapon in enumerate(Game.weapons):
+        for i, weapon in enumerate(state.weapons):
             options[str(i+1)] = weapon
 
         retreat = str(len(options) + 1)
 
-        action_name = prompt_menu(
-            title = transcriber.get_index(16),
-            prompt = transcriber.get_index(17),
-            options = {k: f"{constants.RARITY_COLOR[v.rarity]}{v.name}{Style.RESET_ALL}" for k, v in options.items()} | ({retreat: "Retreat"} if Game.enemy.health < 8 or Game.difficulty == 0 else {})
-        ).lower().strip()
+        action_name = (await session.prompt_menu(
+            title = session.text(16),
+            prompt = session.text(17),
+            options = {k: f"{constants.RARITY_COLOR[v.rarity]}{v.name}{Style.RESET_ALL}" for k, v in options.items()} | ({retreat: "Retreat"} if state.enemy.health < 8 or state.difficulty == 0 else {})
+        )).lower().strip()
 
-        draw_main_title()
+        session.draw_main_title()
 
-        print(transcriber.get_index(18))
+        session.print(session.text(18))
 
         if action_name == retreat:
-            Game.log = transcriber.get_index(35)
-            for weapon in Game.weapons[:]:
-                if len(Game.weapons) == 1: break
-                if rng.random() < (0.75 if Game.difficulty == 0 else 0.25):
-                    Game.weapons.remove(weapon)
-            Game.reset()
+            state.log = session.text(35)
+            for weapon in list(state.weapons):
+                if len(state.weapons) == 1: break
+                if session.rng.random() < (0.75 if state.difficulty == 0 else 0.25):
+                    state.take_weapon(weapon)
+            await Game.reset(session)
             return
 
         action = options.get(action_name)
 
         if not action:
-            Game.active = False
+            state.active = False
             return
         
-        if action.name == "Trident" and not Game.has_trident_achievement:
-            Game.achievements.append(ACHIEVEMENTS["The Power Of The Trident"])
-            Game.has_trident_achievement = True
-
-        # helper
-        def clamp(x, lo, hi):
-            return max(lo, min(hi, x))
-
-        # small epsilon to avoid division by zero if both caches are zero
-        EPS = 1e-6
-
-        # Normalized "who is ahead" metric in [0,1]
-        #  - 0.0 => player has done 0 damage and enemy dominated (player factor minimal)
-        #  - 0.5 => balanced
-        #  - 1.0 => player has done all the damage (enemy factor minimal)
-        total = Game.player_damage_cache + Game.enemy_damage_cache + EPS
-        player_share = Game.player_damage_cache / total   # in (0,1)
-        # We want player_factor such that when player_share is 0.5, factor is 0.5
-        # and when player_share is high, player_factor reduces enemy's chance (or vice versa).
-        player_factor = clamp(1.0 - player_share, 0.0, 1.0)
-        enemy_factor = clamp(1.0 - player_factor, 0.0, 1.0)  # equals player_share, but kept explicit
-
-        # drift: base between 1.05 and 1.35 (same distribution as 1.35 - rng.random()*0.30)
-        base_drift = 1.35 - rng.random() * 0.30
-
-        # difficulty modifiers (explicit)
-        if Game.difficulty == 0 or player_factor >= 0.75:      # easy
-            player_diff_mod = +0.05
-            enemy_diff_mod  = -0.05
-        elif Game.difficulty == 2 or enemy_factor >= 0.75:    # hard
-            player_diff_mod = -0.05
-            enemy_diff_mod  = +0.05
-        else:                        # normal (1)
-            player_diff_mod = 0.0
-            enemy_diff_mod  = 0.0
-
-        player_drift = base_drift + player_diff_mod
-        # recompute base for enemy separately so RNG affects both independently (like your original)
-        enemy_drift = 1.35 - rng.random() * 0.30 + enemy_diff_mod
-
-        # Compose variable chances and clamp to [0.0, 1.0]
-        player_variable_chance = clamp(Game.enemy.state.value.other_attack_chance * player_drift, 0.0, 1.0)
-        enemy_variable_chance  = clamp(enemy_drift, 0.0, 1.0)
-
-        # difficulty multipliers for final damage output (explicit)
-        player_damage_mult = 1.15 if Game.difficulty == 0 else 0.85 if Game.difficulty == 2 else 1.0
-        enemy_damage_mult  = 0.85 if Game.difficulty == 0 else 1.15 if Game.difficulty == 2 else 1.0
-
-        player_damage = int(action.damage_now(player_variable_chance) * player_damage_mult)
-        enemy_damage  = int(Game.enemy.damage_now(enemy_variable_chance) * enemy_damage_mult)
-
-        Game.player_damage_cache = Game.player_damage_cache * 0.8 + player_damage * 0.2
-        Game.enemy_damage_cache  = Game.enemy_damage_cache * 0.8 + enemy_damage * 0.2
-        Game.scenery *= action.scenery
-
-        Game.health = Game.health - enemy_damage
-        Game.enemy.health = Game.enemy.health - player_damage
-
-        Game.enemy.apply_blood(action, player_damage) # Does the exact same thing, but for the enemy
-
-        if Game.blood > 0:
-            Game.health = Game.health - Game.blood
-            Game.blood_ticks = Game.blood_ticks - 1
-            if Game.blood_ticks <= 0:
-                Game.blood = 0
-                Game.blood_ticks = 0
-
-        if enemy_damage > 0:
-            Game.blood = min(Game.blood + Game.enemy.weapon.blood, 5)
-            Game.blood_ticks = min(Game.blood_ticks + Game.enemy.weapon.blood_ticks, 3)
-
-        Game.log = f"| Log\n{transcriber.get_index(19, 21)\
-                            .replace("player_damage", str(player_damage))\
-                            .replace("action_name", action.name)\
-                            .replace("enemy_damage", str(enemy_damage))\
-                            .replace("enemy_weapon", Game.enemy.weapon.name)}"
-
-        player_dead = Game.health <= 0
-        enemy_dead = Game.enemy.health <= 0
-
-        if all((player_dead, enemy_dead)):
-            if rng.random() < (0.45 if Game.difficulty == 0 else 0.25):
-                Game.win()
-            else:
-                Game.loss()
-        elif player_dead:
-            Game.loss()
-        elif enemy_dead:
-            Game.win()
-
-        time.sleep(max(rng.random() * 1, 0.5))
-
-        Game.round += 1
-        Game.total_rounds += 1
+        state.track(Event.WEAPON_USED, action)
+
+        result = battle.resolve_round(state, state.enemy, action, session.rng) # The state is the player side
+
+        state.log = "| Log\n" + session.render(
+            19, 21,
+            player_damage = result.player_damage,
+            action_name = action.name,
+            enemy_damage = result.enemy_damage,
+            enemy_weapon = state.enemy.weapon.name
+        )
+
+        if result.outcome is battle.Outcome.WIN:
+            await Game.win(session)
+        elif result.outcome is battle.Outcome.LOSS:
+            await Game.loss(session)
+
+        await session.pause(max(session.rng.random() * 1, 0.5))
+
+        state.round += 1
+        state.total_rounds += 1
+        state.track(Event.ROUND)
+        session.save_game() # Only what changed this round is appended
     
-    def loss() -> None:
-        Game.loses += 1
-        if not Game.has_lose_five_achievement and Game.loses >= 5:
-            Game.achievements.append(ACHIEVEMENTS["Lose Five"])
-            Game.has_lose_five_achievement = True
+    async def loss(session: Session) -> None:
+        state = session.state
+        state.loses += 1
+        state.track(Event.LOSS)
 
-        time.sleep(0.25)
-        draw_main_title()
+        await session.pause(0.25)
+        session.draw_main_title()
 
-        print(transcriber.get_index(26))
+        session.print(session.text(26))
 
-        print(transcriber.get_index(27) + "\r", end="")
+        session.print(session.text(27) + "\r", end="")
 
-        second_chance = rng.random() < Game.scenery * (0.75 if Game.difficulty == 2 else 1.25 if Game.difficulty == 0 else 1.0)
+        second_chance = session.rng.random() < state.scenery * (0.75 if state.difficulty == 2 else 1.25 if state.difficulty == 0 else 1.0)
 
-        time.sleep(max(rng.random() * 10, 2))
+        await session.pause(max(session.rng.random() * 10, 2))
 
         if second_chance:
-            print(transcriber.get_index(27) + transcriber.get_index(28))
+            session.print(session.text(27) + session.text(28))
         else:
-            print(transcriber.get_index(27) + transcriber.get_index(29))
-            if not Game.difficulty == 3:
-                for weapon in Game.weapons[:]:
+            session.print(session.text(27) + session.text(29))
+            if not state.difficulty == 3:
+                for weapon in list(state.weapons):
                     if not weapon.name == "Reavers Pike":
-                        Game.weapons.remove(weapon)
-                Game.weapons.append(get_weapon())
+                        state.take_weapon(weapon)
+                state.give_weapon(get_weapon(session.items_rng))
 
-        Game.log = f"| Log\n{transcriber.get_index(30)}{transcriber.get_index(31) if second_chance else ""}"
+        state.log = f"| Log\n{session.text(30)}{session.text(31) if second_chance else ""}"
 
-        time.sleep(5.0)
-        Game.reset()
+        await session.pause(5.0)
+        await Game.reset(session)
     
-    def win() -> None:
-        Game.wins += 1
+    async def win(session: Session) -> None:
+        state = session.state
+        state.wins += 1
+        state.track(Event.WIN)
 
-        if not Game.has_win_achievement:
-            Game.achievements.append(ACHIEVEMENTS["First Win"])
-            Game.has_win_achievement = True
-        
-        if not Game.has_win_five_achievement and Game.wins >= 5:
-            Game.achievements.append(ACHIEVEMENTS["Win Five"])
-            Game.has_win_five_achievement = True
-        
-        weight = WEAPON_RARITY[WEAPONS.index(Game.enemy.weapon)]
-        total = sum(WEAPON_RARITY) or 1
-        prob = weight / total
-        rarity_multiplier = 1.0 - prob  # in [0,1]
-        rarity_reward = constants.RARITY_REWARD[Game.enemy.weapon.rarity]
-        blood_spill = ((Game.enemy.weapon.damage + Game.enemy.weapon.blood * Game.enemy.weapon.blood_ticks) / 2)
-        reward = int(rarity_multiplier * blood_spill * Game.enemy.weapon.damage_chance * Game.enemy.weapon.scenery * 100) + rarity_reward
-        reward = max(0, reward)
-        Game.currency += reward
-        Game.lifetime_currency += reward
-
-        Game.log = "| Log\n" + transcriber.get_index(32)
-        if not Game.enemy.weapon in Game.weapons:
-            Game.weapons.append(Game.enemy.weapon)
-        Game.reset()
+        state.add_currency(PRICES.get(state.enemy.weapon).reward, earned=True)
+
+        state.log = "| Log\n" + session.text(32)
+        if not state.enemy.weapon in state.weapons:
+            state.give_weapon(state.enemy.weapon)
+        await Game.reset(session)
     
-    def reset() -> None:
-        Game.blood = 0
-        Game.blood_ticks = 0
-        Game.enemy = None
-        Game.health = 25
-        Game.round = 1
-
-        Game.final()
+    async def reset(session: Session) -> None:
+        state = session.state
+        session.enemy_pool.release(state.reset_fight())
+
+        await Game.final(session)
     
-    def final() -> None:
+    async def final(session: Session) -> None:
+        state = session.state
         # only show once per session
-        if getattr(Game, "_final_shown", False):
+        if state.final_shown:
             return
 
-        # conditions
-        needed_rounds = 200 if Game.difficulty == 2 else 50 if Game.difficulty == 0 else 100
-        wins_req = 10
-        loses_req = 5
-        ach_req = 7
-        min_weapons = 3
-        lifetime_req = 500
-        currency_req = 2000
-
-        # if near-miss, optionally show progress (but don't exit)
-        near_rounds = Game.total_rounds >= int(0.75 * needed_rounds)
-        near_wins = Game.wins >= int(0.75 * wins_req)
-        near_ach = len(Game.achievements) >= int(0.75 * ach_req)
+        # conditions, kept up to date by the achievement events
+        goals = state.achievements.goals
+        needed_rounds = goals["rounds"][1]
 
         # pre-checks
-        if not (Game.total_rounds >= needed_rounds and
-                Game.wins >= wins_req and
-                Game.loses >= loses_req and
-                len(Game.achievements) >= ach_req and
-                any(weapon.name == "Reavers Pike" for weapon in Game.weapons) and
-                len(Game.weapons) >= min_weapons and
-                Game.lifetime_currency > lifetime_req and
-                Game.currency > currency_req):
-            # optional: show progress if player is close
-            if near_rounds and near_wins and near_ach:
-                draw_main_title()
-                print("You're close to the final! Progress:")
-                print(f"Rounds: {Game.total_rounds}/{needed_rounds}")
-                print(f"Wins: {Game.wins}/{wins_req}  |  Losses: {Game.loses}/{loses_req}")
-                print(f"Achievements: {len(Game.achievements)}/{ach_req}")
-                print(f"Currency (current / lifetime): {Game.currency} / {Game.lifetime_currency}")
-                print()
-                print("Keep going — the final is close!")
-                time.sleep(1.5)
+        if not goals.complete:
+            # optional: show progress if player is close (but don't exit)
+            if goals.near("rounds") and goals.near("wins") and goals.near("achievements"):
+                session.draw_main_title()
+                session.print("You're close to the final! Progress:")
+                session.print("Rounds: {}/{}".format(*goals["rounds"]))
+                session.print("Wins: {}/{}  |  Losses: {}/{}".format(*goals["wins"], *goals["loses"]))
+                session.print("Achievements: {}/{}".format(*goals["achievements"]))
+                session.print(f"Currency (current / lifetime): {state.currency} / {state.lifetime_currency}")
+                session.print()
+                session.print("Keep going — the final is close!")
+                await session.pause(1.5)
             return
 
         # mark as shown to avoid repeats
-        Game._final_shown = True
+        state.final_shown = True
 
         # compute safe scoring factors (guard divisions)
-        wins = float(Game.wins)
-        loses = float(max(1, Game.loses))  # avoid div by zero
+        wins = float(state.wins)
+        loses = float(max(1, state.loses))  # avoid div by zero
         win_factor = wins / loses
 
-        difficulty_factor = Game.difficulty if Game.difficulty > 0 else 0.5
+        difficulty_factor = state.difficulty if state.difficulty > 0 else 0.5
 
-        achievements_factor = len(Game.achievements) / max(1, len(ACHIEVEMENTS))
+        achievements_factor = len(state.achievements) / max(1, len(ACHIEVEMENTS))
 
-        lifetime = float(max(1, Game.lifetime_currency))
-        currency_factor = (Game.currency + lifetime) / 500
+        lifetime = float(max(1, state.lifetime_currency))
+        currency_factor = (state.currency + lifetime) / 500
         # Lifetime is general performance, and current is just your savings, making how you end with what very important.
 
         # combine and normalize into 0..10 scale
@@ -696,115 +396,164 @@ class Game: # Create a namespace for our game
         score_int = int(round(score))
 
         # final screens
-        draw_main_title()
-        print("=== Final Statistics ===")
-        print(f"Player: {Game.player_name}")
-        print(f"Mode: {('Experimental' if Game.difficulty >= 9 else ('Easy' if Game.difficulty==0 else 'Normal' if Game.difficulty==1 else 'Hard' if Game.difficulty==2 else f'Difficulty {Game.difficulty}'))})")
-        print(f"Total rounds: {Game.total_rounds}")
-        print(f"Wins: {Game.wins}  |  Losses: {Game.loses}")
-        print(f"Makaronies (current / lifetime): {Game.currency} / {Game.lifetime_currency}")
-        print(f"Weapons kept: {', '.join(w.name for w in Game.weapons)}")
-        print("Achievements unlocked:")
-        for a in Game.achievements:
-            print(" -", getattr(a, "name", getattr(a, "text", str(a))))
-        print()
-        print(transcriber.get_index(41, 50).replace("rounds_needed", str(needed_rounds)))
-        print()
-        print("Press any key to continue.")
-        try:
-            msvcrt.getch()
-        except Exception:
-            input()
-
-        draw_main_title()
-        print("Thank you for playing! This started as a small school project and became something bigger.")
-        print()
-        print("Developer: Neo Zetterberg — late 2025")
-        print()
-        print("Press any key for your final score.")
-        try:
-            msvcrt.getch()
-        except Exception:
-            input()
-
-        draw_main_title()
-        print(f"Your score for this run: {score_int}/10")
+        session.draw_main_title()
+        session.print("=== Final Statistics ===")
+        session.print(f"Player: {state.player_name}")
+        session.print(f"Mode: {('Experimental' if state.difficulty >= 9 else ('Easy' if state.difficulty==0 else 'Normal' if state.difficulty==1 else 'Hard' if state.difficulty==2 else f'Difficulty {state.difficulty}'))})")
+        session.print(f"Total rounds: {state.total_rounds}")
+        session.print(f"Wins: {state.wins}  |  Losses: {state.loses}")
+        session.print(f"Makaronies (current / lifetime): {state.currency} / {state.lifetime_currency}")
+        session.print(f"Weapons kept: {', '.join(w.name for w in state.weapons)}")
+        session.print("Achievements unlocked:")
+        for a in state.achievements:
+            session.print(" -", getattr(a, "name", getattr(a, "text", str(a))))
+        session.print()
+        session.print(session.render(41, 50, rounds_needed = needed_rounds))
+        session.print()
+        session.print("Press any key to continue.")
+        await session.wait_key()
+
+        session.draw_main_title()
+        session.print("Thank you for playing! This started as a small school project and became something bigger.")
+        session.print()
+        session.print("Developer: Neo Zetterberg — late 2025")
+        session.print()
+        session.print("Press any key for your final score.")
+        await session.wait_key()
+
+        session.draw_main_title()
+        session.print(f"Your score for this run: {score_int}/10")
         if score_int <= 3:
-            print("Don't worry — it'll be better next time!")
+            session.print("Don't worry — it'll be better next time!")
         elif score_int <= 5:
-            print("Good effort — a few small changes and you'll improve!")
+            session.print("Good effort — a few small changes and you'll improve!")
         elif score_int <= 7:
-            print("Solid run! Consider bumping difficulty to test yourself.")
+            session.print("Solid run! Consider bumping difficulty to test yourself.")
         elif score_int <= 9:
-            print("Excellent play — very impressive.")
+            session.print("Excellent play — very impressive.")
         else:
-            print("Perfect. Legendary run.")
-
-        print()
-        print("Press any key to exit.")
+            session.print("Perfect. Legendary run.")
+
+        session.print()
+        session.print("Press any key to exit.")
+        await session.wait_key()
+        session.delete_save() # The campaign is over, so the next one starts fresh
+        raise Quit
+
+# ---- Flow ----
+
+async def play(session: Session) -> None: # Everything a player goes through, from the language to the menu
+    state = session.state
+    try:
+
+        # ---- Language ----
+
+        lang = ""
+        while not Language.get(lang):
+            session.draw_title(Fore.CYAN + Style.BRIGHT + "GLADIATORS" + Style.RESET_ALL)
+            session.print("Languages:")
+            for lang in Language.iterate():
+                session.print(lang.value.name)
+            session.print()
+            lang = await session.read_line("Select one language (f.e 'sv'): ")
+        session.lang = Language.get(lang)
+
+        # ---- Introduction ----
+
+        resumed = session.load_game()
+
+        while not state.player_name:
+            session.draw_main_title()
+            state.player_name = await session.read_line(session.text(3)) # Select a name
+
+        difficulty = str(state.difficulty) if resumed else ""
+        while not difficulty in ("0", "1", "2", "3"):
+            session.draw_main_title()
+            difficulty = await session.read_line(session.text(15))
+        state.difficulty = int(difficulty)
+
+        if difficulty == "3" and not resumed:
+            state.weapons = Inventory(WEAPONS)
+            state.achievements.unlock_all()
+        state.sync_achievements()
+
+        session.draw_main_title()
+
+        session.print(session.text(4))
+        session.print()
+        session.print(session.rng.choice(constants.INFO_TEXT))
+        for i in range(10): # We'll make a small loading scene
+            session.print(f"\r[{Fore.GREEN + Style.BRIGHT}{"-"*i}{Style.RESET_ALL + Fore.YELLOW}{"-"*(10-i)}{Style.RESET_ALL}]", end="")
+            await session.pause(0.25)
+
+        # ---- Start the game ----
+
+        session.start()
+        await Game.menu(session)
+    finally:
+        await session.close()
+
+# ---- Main ----
+
+parser = argparse.ArgumentParser(description="Gladiators")
+parser.add_argument("--seed", type=int, help="seed every random stream from this, for a repeatable session")
+parser.add_argument("--record", metavar="PATH", help="record the seed and every input to PATH")
+parser.add_argument("--replay", metavar="PATH", help="play a recorded session back, headless and as fast as possible")
+parser.add_argument("--time-scale", type=float, default=constants.TIME_SCALE, help="how long the pauses last, 0 skips them")
+
+async def replay_session(path: str) -> None: # We'll feed the recorded inputs back with every pause skipped
+    replayer = replay.Replayer(path)
+    with open(os.devnull, "w") as devnull:
+        session = Session(screen.FrameRenderer(devnull, enabled=False), clock=Clock.instant(), seed=replayer.seed, replayer=replayer, headless=True)
+        started = time.perf_counter()
         try:
-            msvcrt.getch()
-        except Exception:
-            input()
-        sys.exit(0)
-
-# ------ Settings ------
-
-# Loadin...
-Settings.load()
-
-# ---- Language ----
-
-lang = ""
-while not Language.get(lang):
-    draw_title(Fore.CYAN + Style.BRIGHT + "GLADIATORS" + Style.RESET_ALL)
-    print("Languages:")
-    for lang in Language.iterate():
-        print(lang.value.name)
-    print()
-    lang = input("Select one language (f.e 'sv'): ")
-transcriber = Transcriber(Language.get(lang))
-draw_main_title = lambda: draw_title(Fore.CYAN + Style.BRIGHT + transcriber.get_index(0) + Style.RESET_ALL)
-
-# ---- Introduction ----
-
-while not Game.player_name:
-    draw_main_title()
-    Game.player_name = input(transcriber.get_index(3)) # Select a name
-
-difficulty = ""
-while not difficulty in ("0", "1", "2", "3"):
-    draw_main_title()
-    difficulty = input(transcriber.get_index(15))
-Game.difficulty = int(difficulty)
-
-if difficulty == "3":
-    Game.weapons.clear()
-    Game.weapons = WEAPONS.copy()
-
-    Game.has_first_game_achievement = True
-    Game.has_trident_achievement = True
-    Game.has_win_achievement = True
-    Game.has_inventory_achievement = True
-    Game.has_round_ten_achievement = True
-    Game.has_lose_five_achievement = True
-    Game.has_win_five_achievement = True
-    Game.has_sell_achievement = True
-    Game.has_buy_achievement = True
-    Game.has_reavers_pike_achievement = True
-    Game.has_axe_achievement = True
-    Game.achievements = list(ACHIEVEMENTS.values())
-
-draw_main_title()
-
-print(transcriber.get_index(4))
-print()
-print(rng.choice(constants.INFO_TEXT))
-for i in range(10): # We'll make a small loading scene
-    print(f"\r[{Fore.GREEN + Style.BRIGHT}{"-"*i}{Style.RESET_ALL + Fore.YELLOW}{"-"*(10-i)}{Style.RESET_ALL}]", end="")
-    time.sleep(0.25)
-
-# ---- Start the game ----
-
-Game.background_music = create_background_music()
-Game.menu()
\ No newline at end of file
+            await play(session)
+        except (EOFError, Quit): # Out of inputs, or the player left
+            pass
+        except replay.ReplayError as e:
+            print(f"Replay diverged: {e}", file=sys.stderr)
+            sys.exit(1)
+    print(f"Replayed {replayer.position}/{len(replayer.events)} inputs and {session.state.total_rounds} rounds in {time.perf_counter() - started:.3f}s")
+
+async def main(argv: Optional[List[str]] = None) -> None: # Every screen is a coroutine, and this is the first one
+    arguments = parser.parse_args(argv)
+    if arguments.time_scale < 0:
+        parser.error("the time scale can't be negative")
+    if arguments.replay:
+        await replay_session(arguments.replay)
+        return
+
+    print("Loading...")
+
+    colorama_init() # We'll initialize the colorama module
+    renderer = screen.FrameRenderer.install() # Every print now builds a frame, and only the changes are drawn
+    keyboard = keys.KeyReader() # Every key the moment it is pressed, when we have a terminal
+    reader = runtime.InputReader() # Otherwise whole lines, awaited instead of blocking the loop
+
+    seed = arguments.seed
+    recorder = None
+    if seed is not None or arguments.record:
+        seed = seed if seed is not None else replay.new_seed()
+        if arguments.record:
+            recorder = replay.Recorder(arguments.record, seed)
+    session = Session(
+        renderer, keyboard, reader,
+        clock = Clock(arguments.time_scale), # Every pause goes through this, so tests can make them instant
+        seed = seed,
+        save_file = save.SaveFile(constants.SAVE_PATH, constants.SAVE_COMPACT_EVERY), # Every save only appends what changed
+        recorder = recorder
+    )
+    try:
+        with keyboard: # The terminal gets its old mode back however we leave
+            if keyboard.active:
+                keyboard.attach()
+            else: reader.start()
+            await play(session)
+    except Quit:
+        pass
+    finally:
+        keyboard.detach()
+        reader.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+from typing import Counter, Dict, Iterable, Iterator, List, Optional
+from collections import Counter as _Counter
+from items import Item
+
+####################################################
+# Inventory                                        #
+#                                                  #
+# ------------------------------------------------ #
+# The weapons a player holds, as a multiset that   #
+# keeps the order they were picked up in (so menus #
+# stay put). Every entry has a slot, and the slots #
+# of every name are indexed, so adding, removing   #
+# and looking up a weapon never scans the rest.    #
+####################################################
+
+class Inventory:
+    """
+    Weapons in the order they were added, with the same weapon allowed more than once.
+    Weapons are told apart by name, like the catalog does.
+    """
+
+    __items: Dict[int, Item] # By slot, in order
+    __by_name: Dict[str, Dict[int, None]] # The slots of every name, in order
+    __rarities: Counter[str]
+    __next: int
+    __slots__ = ("_Inventory__items", "_Inventory__by_name", "_Inventory__rarities", "_Inventory__next",)
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self.__items = {}
+        self.__by_name = {}
+        self.__rarities = _Counter()
+        self.__next = 0
+        self.extend(items)
+
+    def add(self, item: Item) -> None:
+        slot = self.__next
+        self.__next += 1
+        self.__items[slot] = item
+        self.__by_name.setdefault(item.name, {})[slot] = None
+        self.__rarities[item.rarity] += 1
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.add(item)
+
+    def discard(self, item: Item) -> bool:
+        """Remove the first weapon with the name of `item`. Returns whether there was one."""
+        slots = self.__by_name.get(item.name)
+        if not slots:
+            return False
+        slot = next(iter(slots))
+        del slots[slot]
+        if not slots:
+            del self.__by_name[item.name]
+        removed = self.__items.pop(slot)
+        self.__rarities[removed.rarity] -= 1
+        if self.__rarities[removed.rarity] <= 0:
+            del self.__rarities[removed.rarity]
+        return True
+
+    def remove(self, item: Item) -> None:
+        """Like `discard`, but raises ValueError when there is no such weapon (as a list would)."""
+        if not self.discard(item):
+            raise ValueError(f"{item.name} is not in the inventory")
+
+    def clear(self) -> None:
+        self.__items.clear()
+        self.__by_name.clear()
+        self.__rarities.clear()
+
+    def count(self, name: str) -> int:
+        return len(self.__by_name.get(name, ()))
+
+    def rarity_count(self, rarity: str) -> int:
+        return self.__rarities.get(rarity, 0)
+
+    def first(self, name: str) -> Optional[Item]:
+        slots = self.__by_name.get(name)
+        return self.__items[next(iter(slots))] if slots else None
+
+    @property
+    def names(self) -> List[str]:
+        """Every name held, in the order it was first picked up."""
+        return list(self.__by_name)
+
+    def __contains__(self, item: object) -> bool:
+        return getattr(item, "name", None) in self.__by_name
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self.__items.values())
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __bool__(self) -> bool:
+        return bool(self.__items)
+
+    def __repr__(self) -> str:
+        return f"Inventory({[item.name for item in self.__items.values()]!r})"
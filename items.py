@@ -1,11 +1,58 @@
-from dataclasses import dataclass
-from constants import RANDOM_SEED
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from constants import RANDOM_SEED, RARITY_REWARD
+from array import array
 import random
 
 rng = random.Random(RANDOM_SEED)
 
-@dataclass
+class Catalog(list):
+    """A list that counts its own changes, so caches built from it know when to rebuild in O(1)."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, iterable: Iterable = ()) -> None:
+        super().__init__(iterable)
+        self.version = 0
+
+    def __changed(method):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self.version += 1
+            return result
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    __setitem__ = __changed(list.__setitem__)
+    __delitem__ = __changed(list.__delitem__)
+    __iadd__ = __changed(list.__iadd__)
+    __imul__ = __changed(list.__imul__)
+    append = __changed(list.append)
+    extend = __changed(list.extend)
+    insert = __changed(list.insert)
+    pop = __changed(list.pop)
+    remove = __changed(list.remove)
+    clear = __changed(list.clear)
+    sort = __changed(list.sort)
+    reverse = __changed(list.reverse)
+    del __changed
+
+def catalog_signature() -> Tuple[int, int, int, int]:
+    """Changes whenever `WEAPONS` or `WEAPON_RARITY` are changed or replaced."""
+    return (id(WEAPONS), getattr(WEAPONS, "version", -1), id(WEAPON_RARITY), getattr(WEAPON_RARITY, "version", -1))
+
+RARITIES = ("common", "uncommon", "rare", "legendary", "experimental") # A rarity's position is its code
+
+_interned: Dict[Tuple[Any, ...], "Item"] = {}
+_by_index: List["Item"] = []
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Item:
+    """
+    A weapon. Items are interned: creating one with the same fields as an existing one
+    gives back that very object, so identity is equality and `index` numbers every distinct item.
+    """
+
     name: str
     damage: int
     damage_chance: float
@@ -13,11 +60,34 @@ class Item:
     blood: int
     blood_ticks: int
     rarity: str
+    index: int = field(init=False, compare=False)
+
+    def __new__(cls, name: str, damage: int, damage_chance: float, scenery: float, blood: int, blood_ticks: int, rarity: str) -> "Item":
+        key = (name, damage, damage_chance, scenery, blood, blood_ticks, rarity)
+        item = _interned.get(key)
+        if item is None:
+            item = object.__new__(cls)
+            object.__setattr__(item, "index", len(_by_index))
+            _interned[key] = item
+            _by_index.append(item)
+        return item
 
-    def damage_now(self, variable_chance: float = 1.0) -> int:
-        return self.damage if rng.random() <= (self.damage_chance * variable_chance) else 0
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (Item, (self.name, self.damage, self.damage_chance, self.scenery, self.blood, self.blood_ticks, self.rarity)) # Unpickled and copied items are interned again
 
-WEAPONS = [
+    @staticmethod
+    def by_index(index: int) -> "Item":
+        return _by_index[index]
+
+    @property
+    def rarity_code(self) -> int:
+        return RARITIES.index(self.rarity)
+
+    def damage_now(self, variable_chance: float = 1.0, source: Optional[random.Random] = None) -> int:
+        # `source` lets headless simulations bring their own random stream
+        return self.damage if (source or rng).random() <= (self.damage_chance * variable_chance) else 0
+
+WEAPONS = Catalog([
     Item("Axe", 5, 0.95, 0.5, 0, 0, "common"),                  # common
     Item("Trident", 8, 0.7, 0.75, 0, 0, "uncommon"),            # uncommon
     Item("Long Sword", 7, 0.85, 0.65, 0, 0, "uncommon"),        # uncommon
@@ -37,11 +107,11 @@ WEAPONS = [
     Item("Reavers Pike", 15, 0.6, 0.95, 5, 3, "legendary"),     # legendary/overpowered
     Item("Gods Finger", 100, 1.0, 1.0, 0, 0, "experimental"),   # experimental/unobtainable/overpowered
     Item("Air", 0.0, 0.0, 0.0, 0, 0, "experimental")            # experimental/unobtainable/overpowered
-]
+])
 
 # Rarity weights matching the order above
 # Higher number = more common drop
-WEAPON_RARITY = [
+WEAPON_RARITY = Catalog([
     1.0,  # Axe
     0.6,   # Trident
     0.6,   # Long Sword
@@ -61,7 +131,171 @@ WEAPON_RARITY = [
     0.05,    # Reavers Pike (legendary/strongest)
     0.0,    # Gods Finger is also unobtainable
     0.0    # Air is unobtainable, unless with the debug gamemode
-]
+])
+
+# ---- Drops ----
+
+class AliasSampler:
+    """
+    Weighted draws in O(1) with Walker's alias method. 
+    Building the table is O(n) and only happens when the weights change.
+    """
+
+    __columns: List[int]
+    __prob: List[float]
+    __alias: List[int]
+    __slots__ = ("_AliasSampler__columns", "_AliasSampler__prob", "_AliasSampler__alias",)
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        # Zero weights never get a column of their own, so they can't be drawn through rounding errors
+        columns = [i for i, weight in enumerate(weights) if weight > 0]
+        if not columns:
+            raise ValueError("Total of weights must be greater than zero")
+        n = len(columns)
+        total = sum(weights[i] for i in columns)
+        scaled = [weights[i] * n / total for i in columns]
+        prob = [1.0] * n
+        alias = list(columns)
+
+        small = [k for k, p in enumerate(scaled) if p < 1.0]
+        large = [k for k, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = columns[more]
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        self.__columns = columns
+        self.__prob = prob
+        self.__alias = alias
+
+    def draw(self, source: Optional[random.Random] = None) -> int:
+        """Draw one index, using a single random number."""
+        x = (source or rng).random() * len(self.__columns)
+        k = int(x)
+        return self.__columns[k] if x - k < self.__prob[k] else self.__alias[k]
+
+    def draw_many(self, n: int, source: Optional[random.Random] = None) -> array:
+        """Draw `n` indices at once into an array."""
+        random_ = (source or rng).random
+        columns, prob, alias = self.__columns, self.__prob, self.__alias
+        size = len(columns)
+        out = array("l", bytes(n * array("l").itemsize))
+        for i in range(n):
+            x = random_() * size
+            k = int(x)
+            out[i] = columns[k] if x - k < prob[k] else alias[k]
+        return out
+
+_sampler: Optional[AliasSampler] = None
+_sampler_signature: Optional[Tuple[int, int, int, int]] = None
+
+def weapon_sampler() -> AliasSampler:
+    """The sampler over `WEAPON_RARITY`, rebuilt only when the catalog changes."""
+    global _sampler, _sampler_signature
+    signature = catalog_signature()
+    if signature != _sampler_signature:
+        _sampler = AliasSampler(WEAPON_RARITY)
+        _sampler_signature = signature
+    return _sampler
+
+def get_weapon(source: Optional[random.Random] = None) -> Item:
+    return WEAPONS[weapon_sampler().draw(source)]
+
+class WeaponTable:
+    """
+    The numbers of a weapon list as parallel arrays (struct of arrays), one entry per weapon.
+    The arrays are contiguous machine values, so batch code (or NumPy, through the buffer
+    protocol) can use them without touching a single `Item`.
+    """
+
+    indices: array # `Item.index` of every weapon, 64 bit
+    damage: array # Doubles
+    damage_chance: array # Doubles
+    scenery: array # Doubles
+    blood: array # 64 bit
+    blood_ticks: array # 64 bit
+    rarity: array # Codes into RARITIES, bytes
+    __slots__ = ("indices", "damage", "damage_chance", "scenery", "blood", "blood_ticks", "rarity",)
+
+    def __init__(self, weapons: Sequence[Item]) -> None:
+        self.indices = array("q", (weapon.index for weapon in weapons))
+        self.damage = array("d", (weapon.damage for weapon in weapons))
+        self.damage_chance = array("d", (weapon.damage_chance for weapon in weapons))
+        self.scenery = array("d", (weapon.scenery for weapon in weapons))
+        self.blood = array("q", (weapon.blood for weapon in weapons))
+        self.blood_ticks = array("q", (weapon.blood_ticks for weapon in weapons))
+        self.rarity = array("b", (weapon.rarity_code for weapon in weapons))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+_table: Optional[WeaponTable] = None
+_table_signature: Optional[Tuple[int, int, int, int]] = None
+
+def weapon_table() -> WeaponTable:
+    """The table of `WEAPONS`, rebuilt only when the catalog changes."""
+    global _table, _table_signature
+    signature = catalog_signature()
+    if signature != _table_signature:
+        _table = WeaponTable(WEAPONS)
+        _table_signature = signature
+    return _table
+
+def get_weapon_indices(n: int, source: Optional[random.Random] = None) -> array:
+    """Draw `n` weapons at once, as indices into `WEAPONS`."""
+    return weapon_sampler().draw_many(n, source)
+
+# ---- Pricing ----
+
+@dataclass(frozen=True)
+class Price:
+    cost: int # What the shop asks
+    trade: int # What the trader gives, half the cost
+    reward: int # What you earn for beating someone who carries it
+
+def price_of(weapon: Item, weight: float, total_weights: float) -> Price:
+    prob = weight / total_weights
+    rarity_multiplier = 1.0 - prob  # rarer -> larger multiplier
+    rarity_reward = RARITY_REWARD.get(weapon.rarity, 0)
+    blood_spill = ((weapon.damage + weapon.blood * weapon.blood_ticks) / 2)
+    # clamp/scaling for stability
+    base = max(0.0, blood_spill * weapon.damage_chance * weapon.scenery)
+    reward = int(rarity_multiplier * base * 100) + rarity_reward
+    cost = max(1, reward * 10)
+    return Price(cost, int(cost / 2), max(0, reward))
+
+class PricingIndex:
+    """
+    The price of every weapon in `WEAPONS`, keyed by `Item.index`. 
+    It is built once, and only rebuilt when `WEAPONS` or `WEAPON_RARITY` change.
+    """
+
+    __prices: Dict[int, Price]
+    __signature: Optional[Tuple[int, int, int, int]]
+    __slots__ = ("_PricingIndex__prices", "_PricingIndex__signature",)
+
+    def __init__(self) -> None:
+        self.__prices = {}
+        self.__signature = None
+
+    def invalidate(self) -> None:
+        self.__signature = None
+
+    def table(self) -> Dict[int, Price]:
+        """All prices by `weapon.index`. Fetch this once per render and look weapons up in it."""
+        signature = catalog_signature()
+        if signature != self.__signature:
+            total_weights = sum(WEAPON_RARITY) or 1
+            self.__prices = {weapon.index: price_of(weapon, weight, total_weights) for weapon, weight in zip(WEAPONS, WEAPON_RARITY)}
+            self.__signature = signature
+        return self.__prices
+
+    def get(self, weapon: Item) -> Price:
+        price = self.table().get(weapon.index)
+        if price is None: # Items are interned, so this is a weapon that isn't in the catalog
+            raise ValueError(f"{weapon.name} is not in the catalog")
+        return price
 
-def get_weapon() -> Item:
-    return rng.choices(WEAPONS, WEAPON_RARITY)[0]
+PRICES = PricingIndex()
@@ -0,0 +1,247 @@
+from typing import Any, Collection, Deque, List, Optional, TextIO, Tuple
+from collections import deque
+import asyncio
+import codecs
+import select
+import sys
+import os
+
+try:
+    import termios
+except ImportError: # Windows, where we'll use msvcrt instead
+    termios = None
+
+####################################################
+# Key events                                       #
+#                                                  #
+# ------------------------------------------------ #
+# The terminal is put in raw mode (no line         #
+# buffering, no echo), so every key arrives the    #
+# moment it is pressed. Bytes are parsed into key  #
+# events and kept in a queue, which can be polled  #
+# without blocking or awaited on the event loop.   #
+####################################################
+
+# Keys that aren't characters get a name instead
+ENTER = "enter"
+BACKSPACE = "backspace"
+TAB = "tab"
+ESCAPE = "escape"
+EOF = "eof"
+UP = "up"
+DOWN = "down"
+RIGHT = "right"
+LEFT = "left"
+HOME = "home"
+END = "end"
+DELETE = "delete"
+
+CONTROL = {
+    "\r": ENTER,
+    "\n": ENTER,
+    "\t": TAB,
+    "\x7f": BACKSPACE,
+    "\x08": BACKSPACE,
+    "\x04": EOF,
+}
+
+SEQUENCES = { # What follows the escape byte
+    "[A": UP, "[B": DOWN, "[C": RIGHT, "[D": LEFT,
+    "OA": UP, "OB": DOWN, "OC": RIGHT, "OD": LEFT,
+    "[H": HOME, "[F": END, "OH": HOME, "OF": END,
+    "[1~": HOME, "[4~": END, "[3~": DELETE,
+}
+
+WINDOWS_KEYS = { # What follows "\x00" or "\xe0" from msvcrt.getwch
+    "H": UP, "P": DOWN, "M": RIGHT, "K": LEFT,
+    "G": HOME, "O": END, "S": DELETE,
+}
+
+def parse(text: str) -> Tuple[List[str], str]:
+    """
+    Split typed text into key events. Returns the events, and whatever is left of an
+    escape sequence that isn't complete yet.
+    """
+    events: List[str] = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char != "\x1b":
+            events.append(CONTROL.get(char, char))
+            i += 1
+            continue
+        if i + 1 == len(text): # Nothing follows, so it was the escape key itself
+            events.append(ESCAPE)
+            break
+        if text[i + 1] not in "[O":
+            events.append(ESCAPE)
+            i += 1
+            continue
+        end = i + 2
+        while end < len(text) and not (text[end].isalpha() or text[end] == "~"):
+            end += 1
+        if end == len(text): # The rest of the sequence hasn't arrived yet
+            return events, text[i:]
+        events.append(SEQUENCES.get(text[i + 1:end + 1], ESCAPE))
+        i = end + 1
+    return events, ""
+
+def _msvcrt() -> Any:
+    import msvcrt # Only on Windows, and only when we really read keys there
+    return msvcrt
+
+class KeyReader:
+    """
+    Key events from a terminal in raw mode.
+
+    Works on any terminal file descriptor (a pseudo terminal too, which is how it can be
+    tested), or on the Windows console through msvcrt. Use it as a context manager, or
+    `start` and `stop` it, so the terminal always gets its old mode back.
+    """
+
+    fd: Optional[int]
+
+    __events: Deque[str]
+    __decoder: codecs.IncrementalDecoder
+    __pending: str
+    __saved: Optional[list]
+    __loop: Optional[asyncio.AbstractEventLoop]
+    __waiter: Optional["asyncio.Future[None]"]
+
+    def __init__(self, stream: Optional[TextIO] = None, fd: Optional[int] = None) -> None:
+        if fd is None:
+            try:
+                fd = (stream or sys.stdin).fileno()
+            except (AttributeError, ValueError, OSError):
+                fd = None
+        self.fd = fd
+        self.__events = deque()
+        self.__decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.__pending = ""
+        self.__saved = None
+        self.__loop = None
+        self.__waiter = None
+
+    @property
+    def available(self) -> bool:
+        """Wheter there is a terminal to read keys from at all."""
+        if self.fd is None or not os.isatty(self.fd):
+            return False
+        return termios is not None or os.name == "nt"
+
+    @property
+    def active(self) -> bool:
+        return self.__saved is not None or (os.name == "nt" and self.available)
+
+    #### Raw mode ####
+
+    def start(self) -> "KeyReader":
+        """Switch the terminal to raw mode: every key arrives at once, and nothing is echoed."""
+        if termios is None or self.__saved is not None or not self.available:
+            return self
+        self.__saved = termios.tcgetattr(self.fd)
+        mode = termios.tcgetattr(self.fd)
+        mode[0] &= ~(termios.ICRNL | termios.IXON) # Enter arrives as "\r", and ctrl+s and ctrl+q are keys
+        mode[3] &= ~(termios.ICANON | termios.ECHO | termios.IEXTEN) # Ctrl+c still interrupts
+        mode[6][termios.VMIN] = 1
+        mode[6][termios.VTIME] = 0
+        termios.tcsetattr(self.fd, termios.TCSAFLUSH, mode)
+        return self
+
+    def stop(self) -> None:
+        """Give the terminal its old mode back."""
+        self.detach()
+        if self.__saved is not None:
+            termios.tcsetattr(self.fd, termios.TCSAFLUSH, self.__saved)
+            self.__saved = None
+
+    def __enter__(self) -> "KeyReader":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    #### Events ####
+
+    def feed(self, data: bytes) -> None:
+        """Parse raw bytes into key events and queue them."""
+        events, self.__pending = parse(self.__pending + self.__decoder.decode(data))
+        self.__events.extend(events)
+        if events and self.__waiter is not None and not self.__waiter.done():
+            self.__waiter.set_result(None)
+
+    def __read_available(self, timeout: Optional[float]) -> None:
+        if os.name == "nt" and termios is None:
+            msvcrt = _msvcrt()
+            if timeout is None or msvcrt.kbhit():
+                char = msvcrt.getwch()
+                if char in ("\x00", "\xe0"):
+                    self.__events.append(WINDOWS_KEYS.get(msvcrt.getwch(), ESCAPE))
+                else:
+                    self.__events.extend(parse(char)[0])
+            return
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            data = os.read(self.fd, 1024)
+            self.feed(data if data else b"\x04") # A closed terminal reads as end of input
+
+    def poll(self) -> Optional[str]:
+        """The next key event, or None straight away if no key was pressed."""
+        if not self.__events and self.__loop is None:
+            self.__read_available(0)
+        return self.__events.popleft() if self.__events else None
+
+    def read(self, timeout: Optional[float] = None) -> Optional[str]:
+        """The next key event, waiting at most `timeout` seconds (forever if None)."""
+        if not self.__events:
+            self.__read_available(timeout)
+        return self.__events.popleft() if self.__events else None
+
+    def pending(self) -> int:
+        return len(self.__events)
+
+    #### Event loop ####
+
+    def attach(self) -> None:
+        """Read keys on the running event loop as they arrive, for `get`."""
+        if self.__loop is not None or not self.active or termios is None:
+            return
+        self.__loop = asyncio.get_running_loop()
+        self.__loop.add_reader(self.fd, self.__on_readable)
+
+    def detach(self) -> None:
+        if self.__loop is not None:
+            self.__loop.remove_reader(self.fd)
+            self.__loop = None
+
+    def __on_readable(self) -> None:
+        try:
+            data = os.read(self.fd, 1024)
+        except (BlockingIOError, InterruptedError):
+            return
+        self.feed(data if data else b"\x04")
+
+    async def get(self) -> str:
+        """Await the next key event."""
+        while not self.__events:
+            if self.__loop is None: # Windows, or not attached, so a thread waits for us
+                await asyncio.to_thread(self.__read_available, None)
+                continue
+            self.__waiter = self.__loop.create_future()
+            try:
+                await self.__waiter
+            finally:
+                self.__waiter = None
+        return self.__events.popleft()
+
+def choose(typed: str, options: Collection[str]) -> Optional[str]:
+    """
+    The option picked by what was typed so far, or None while it is still ambiguous.
+    Typing "1" picks "1" at once, unless there is a "10" too; then we wait for the next key.
+    """
+    matches = [option for option in options if option.startswith(typed)]
+    if not matches: # Nothing can match anymore, so this is the answer
+        return typed
+    if len(matches) == 1 and matches[0] == typed:
+        return typed
+    return None
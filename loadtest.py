@@ -0,0 +1,263 @@
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from translator import shared
+import constants
+import asyncio
+import argparse
+import random
+import time
+import sys
+import os
+import re
+
+####################################################
+# Load test                                        #
+#                                                  #
+# ------------------------------------------------ #
+# Starts a game server, and throws bots at it:     #
+# every bot logs in like a player would, then      #
+# wanders between battles, the shop, the trader,   #
+# achievements and settings until time is up.      #
+# Reports how long every screen took to answer,    #
+# the rounds fought per second, and how much       #
+# memory the server needed per session.            #
+####################################################
+
+GO_AHEAD = bytes((255, 249)) # The server sends it whenever a session waits for a line (see `server.py --go-ahead`)
+
+CURSOR = re.compile(r"\x1b\[[0-9;?]*[HJK]") # Frames only redraw the lines that changed, each after a cursor move
+ANSI = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+OPTION = re.compile(r"^(\d+): ", re.MULTILINE)
+FINAL = "=== Final Statistics ===" # The first of the final screens, which end the session
+
+def screen_text(data: bytes) -> str: # Every redrawn line on a line of its own, without colors
+    return ANSI.sub("", CURSOR.sub("\n", data.decode("utf-8", "replace")))
+
+@dataclass
+class Results:
+    latencies: Dict[str, List[float]] = field(default_factory=dict) # Seconds, by screen
+    rounds: int = 0
+    logged_in: int = 0
+    active: int = 0
+    peak_active: int = 0
+    finished: int = 0 # Bots that reached the final, which ends their session
+    dropped: int = 0 # Bots whose session ended any other way
+    failed: int = 0 # Bots that couldn't connect, or waited too long for an answer
+
+    def record(self, screen: str, seconds: float) -> None:
+        self.latencies.setdefault(screen, []).append(seconds)
+
+def percentile(values: List[float], q: float) -> float: # Nearest rank, of sorted values
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+class Bot:
+    """One scripted player, talking to the server over its own connection."""
+
+    def __init__(self, number: int, address: Tuple[str, int], results: Results, think: float, deadline: float, timeout: float) -> None:
+        self.number = number
+        self.address = address
+        self.results = results
+        self.think = think
+        self.deadline = deadline
+        self.timeout = timeout
+        self.rng = random.Random(number)
+        self.buffer = b""
+        self.final = False
+        self.shop_options: List[str] = []
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def prompt(self) -> str: # We'll read everything up to the next Go Ahead, the session waits for us after it
+        while GO_AHEAD not in self.buffer:
+            data = await asyncio.wait_for(self.reader.read(65536), self.timeout)
+            if not data:
+                raise EOFError
+            self.buffer += data
+        response, _, self.buffer = self.buffer.partition(GO_AHEAD)
+        text = screen_text(response)
+        self.final = self.final or FINAL in text
+        return text
+
+    async def send(self, screen: str, line: str) -> str:
+        """Answer with `line`, and time how long `screen` takes to ask for the next one."""
+        if self.think > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think))
+        start = time.perf_counter()
+        self.writer.write(line.encode("utf-8") + b"\r\n")
+        response = await self.prompt()
+        self.results.record(screen, time.perf_counter() - start)
+        return response
+
+    # ---- Paths ----
+
+    async def battle(self) -> None:
+        await self.send("battle", "1")
+        for _ in range(self.rng.randint(3, 12)):
+            await self.send("battle", "1") # There always is a first weapon
+            self.results.rounds += 1
+        await self.send("menu", "") # Anything that isn't a weapon leaves
+
+    async def shop(self) -> None:
+        # Only what the shop lists, anything else leaves it. Unchanged lines aren't sent again, so we'll remember them
+        self.shop_options = OPTION.findall(await self.send("shop", "4")) or self.shop_options
+        for _ in range(self.rng.randint(1, 2) if self.shop_options else 0):
+            await self.send("shop", self.rng.choice(self.shop_options)) # Nothing happens without the Makaronies
+        await self.send("menu", "")
+
+    async def trader(self) -> None:
+        response = await self.send("trader", "5")
+        if shared().get_index(39) not in response: # Nothing to trade, and it waits for any key
+            await self.send("trader", "1")
+            await self.send("trader", self.rng.choice(("y", "n")))
+        await self.send("menu", "")
+
+    async def stats(self) -> None:
+        await self.send("stats", "3")
+        await self.send("menu", "")
+
+    async def settings(self) -> None:
+        await self.send("settings", "2")
+        await self.send("settings", "1") # Gore
+        await self.send("settings", self.rng.choice(("on", "off")))
+        await self.send("menu", "")
+
+    PATHS = (battle, shop, trader, stats, settings)
+    WEIGHTS = (6, 2, 1, 1, 1)
+
+    async def run(self) -> None:
+        results = self.results
+        try:
+            start = time.perf_counter()
+            self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(*self.address), self.timeout)
+            await self.prompt()
+            results.record("connect", time.perf_counter() - start)
+            await self.send("login", "en")
+            await self.send("login", f"Bot {self.number}")
+            await self.send("login", "1")
+            results.logged_in += 1
+            results.active += 1
+            results.peak_active = max(results.peak_active, results.active)
+            try:
+                while time.monotonic() < self.deadline:
+                    await self.rng.choices(self.PATHS, self.WEIGHTS)[0](self)
+                self.writer.write(b"6\r\n") # Exit
+            finally:
+                results.active -= 1
+        except EOFError: # The final ends the session, but so does being dropped
+            if self.final:
+                results.finished += 1
+            else: results.dropped += 1
+        except (OSError, asyncio.TimeoutError):
+            results.failed += 1
+        finally:
+            if self.writer:
+                self.writer.close()
+
+# ---- Server ----
+
+def memory(pid: int) -> Optional[int]: # Resident memory of a process in bytes, where there is a /proc to ask
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def raise_file_limit() -> None: # Every bot needs a socket on both ends
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+async def start_server(bots: int, time_scale: float) -> Tuple[asyncio.subprocess.Process, Tuple[str, int]]:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "server.py",
+        "--port", "0",
+        "--max-sessions", str(max(bots, constants.SERVER_MAX_SESSIONS)),
+        "--time-scale", str(time_scale),
+        "--go-ahead",
+        cwd = os.path.dirname(os.path.abspath(__file__)),
+        stdout = asyncio.subprocess.PIPE
+    )
+    while True:
+        line = (await process.stdout.readline()).decode()
+        if not line:
+            raise RuntimeError("The server exited before it started")
+        match = re.search(r"Serving Gladiators on (.+):(\d+)", line)
+        if match:
+            return process, (match.group(1), int(match.group(2)))
+
+# ---- Main ----
+
+parser = argparse.ArgumentParser(description="Gladiators load test")
+parser.add_argument("--bots", type=int, default=1000)
+parser.add_argument("--duration", type=float, default=30.0, help="seconds every bot keeps playing")
+parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which the bots connect")
+parser.add_argument("--think", type=float, default=0.2, help="mean seconds a bot thinks before every answer")
+parser.add_argument("--time-scale", type=float, default=0.0, help="how long the pauses of the server last, 0 skips them")
+parser.add_argument("--timeout", type=float, default=30.0, help="seconds a bot waits for an answer before it gives up")
+parser.add_argument("--host", help="test a server that is already running (started with --go-ahead), instead of starting one")
+parser.add_argument("--port", type=int, default=constants.SERVER_PORT)
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    arguments = parser.parse_args(argv)
+    raise_file_limit()
+
+    process = None
+    if arguments.host:
+        address = (arguments.host, arguments.port)
+    else: process, address = await start_server(arguments.bots, arguments.time_scale)
+    results = Results()
+
+    try:
+        base = memory(process.pid) if process else None
+        peak = base
+
+        async def sample() -> None: # We'll keep the most memory the server used
+            nonlocal peak
+            while True:
+                await asyncio.sleep(0.25)
+                used = memory(process.pid)
+                if used and (peak is None or used > peak):
+                    peak = used
+
+        async def start(bot: Bot, delay: float) -> None:
+            await asyncio.sleep(delay)
+            await bot.run()
+
+        print(f"Running {arguments.bots} bots against {address[0]}:{address[1]} for {arguments.duration:g}s...", flush=True)
+        sampler = asyncio.ensure_future(sample()) if base is not None else None
+        began = time.perf_counter()
+        deadline = time.monotonic() + arguments.ramp + arguments.duration
+        bots = [Bot(i, address, results, arguments.think, deadline, arguments.timeout) for i in range(arguments.bots)]
+        await asyncio.gather(*(start(bot, i * arguments.ramp / arguments.bots) for i, bot in enumerate(bots)))
+        elapsed = time.perf_counter() - began
+        if sampler:
+            sampler.cancel()
+    finally:
+        if process:
+            process.terminate()
+            await process.wait()
+
+    # ---- Report ----
+
+    print()
+    print(f"Bots: {arguments.bots} ({results.logged_in} logged in, {results.peak_active} at once, {results.finished} reached the final, {results.dropped} dropped, {results.failed} failed)")
+    print()
+    print(f"{'Screen':<10}{'Answers':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for screen, latencies in sorted(results.latencies.items()):
+        latencies.sort()
+        print(f"{screen:<10}{len(latencies):>10}" + "".join(f"{percentile(latencies, q) * 1000:>10.2f}" for q in (0.5, 0.95, 0.99)))
+    print()
+    print(f"Rounds: {results.rounds} in {elapsed:.1f}s, {results.rounds / elapsed:.1f} rounds/s")
+    if base is not None and peak is not None and results.peak_active:
+        print(f"Server memory: {base / 2**20:.1f} MiB idle, {peak / 2**20:.1f} MiB at peak, {(peak - base) / results.peak_active / 1024:.1f} KiB per session")
+    else: print("Server memory: unknown (only for a server started here, on a system with /proc)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
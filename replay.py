@@ -0,0 +1,97 @@
+from typing import Any, Dict, List, Mapping, Optional, TextIO, Tuple
+import random
+import json
+
+####################################################
+# Record and replay                                #
+#                                                  #
+# ------------------------------------------------ #
+# A recording is the master seed every random      #
+# stream was seeded from, and every input the      #
+# player gave, with the frame it was given on.     #
+# Seeding the same way and feeding the inputs back #
+# plays the exact same session again.              #
+#                                                  #
+#   {"version": 1, "seed": 1234}                   #
+#   {"frame": 3, "kind": "line", "value": "en"}    #
+#   {"frame": 9, "kind": "key", "value": "x"}      #
+####################################################
+
+VERSION = 1
+
+class ReplayError(ValueError):
+    """The session went another way than the recorded one."""
+
+def seed_all(seed: int, streams: Mapping[str, random.Random]) -> None:
+    """Seed every stream from the one master seed, each differently (by its name), in place."""
+    for name, stream in streams.items():
+        stream.seed(f"{seed}:{name}")
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(63)
+
+class Recorder:
+    """Writes a recording as the session goes, so a crash still leaves every input before it."""
+
+    seed: int
+
+    __file: Optional[TextIO]
+    __events: int
+
+    def __init__(self, path: str, seed: int) -> None:
+        self.seed = seed
+        self.__file = open(path, "w", encoding="utf-8")
+        self.__events = 0
+        self.__write({"version": VERSION, "seed": seed})
+
+    def __write(self, entry: Dict[str, Any]) -> None:
+        self.__file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.__file.flush()
+
+    @property
+    def events(self) -> int:
+        return self.__events
+
+    def record(self, frame: int, kind: str, value: str) -> None:
+        self.__write({"frame": frame, "kind": kind, "value": value})
+        self.__events += 1
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+class Replayer:
+    """Hands the recorded inputs back in order, and checks they are asked for at the same frames."""
+
+    seed: int
+    events: List[Tuple[int, str, str]]
+
+    __at: int
+
+    def __init__(self, path: str) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("version") != VERSION:
+            raise ValueError(f"{path} is not a recording of this version.")
+        self.seed = lines[0]["seed"]
+        self.events = [(entry["frame"], entry["kind"], entry["value"]) for entry in lines[1:]]
+        self.__at = 0
+
+    @property
+    def position(self) -> int:
+        return self.__at
+
+    @property
+    def finished(self) -> bool:
+        return self.__at >= len(self.events)
+
+    def next(self, frame: int, kind: str) -> str:
+        """The next recorded input. Raises EOFError once they are used up."""
+        if self.finished:
+            raise EOFError
+        recorded_frame, recorded_kind, value = self.events[self.__at]
+        if (recorded_frame, recorded_kind) != (frame, kind):
+            raise ReplayError(f"Input {self.__at} was a {recorded_kind!r} on frame {recorded_frame}, but the replay asked for a {kind!r} on frame {frame}.")
+        self.__at += 1
+        return value
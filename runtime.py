@@ -0,0 +1,129 @@
+from typing import Any, Awaitable, Callable, Optional, Set, TextIO, Union
+import asyncio
+import codecs
+import logging
+import sys
+import os
+
+####################################################
+# Async runtime                                    #
+#                                                  #
+# ------------------------------------------------ #
+# The game runs on one asyncio event loop. Input   #
+# arrives through `InputReader` without blocking   #
+# it, pauses are awaited on the game `Clock`, and  #
+# work that has to keep going while a screen waits #
+# (music, autosave) runs as `Background` tasks.    #
+####################################################
+
+class InputReader:
+    """
+    Lines typed on stdin, for awaiting instead of blocking.
+
+    Where the event loop can watch the file descriptor (anything but Windows) nothing
+    blocks at all; otherwise every line is read on a worker thread.
+    """
+
+    stream: TextIO
+
+    __queue: "asyncio.Queue[Optional[str]]"
+    __decoder: codecs.IncrementalDecoder
+    __pending: str
+    __loop: Optional[asyncio.AbstractEventLoop]
+    __fd: Optional[int]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream or sys.stdin
+        self.__queue = asyncio.Queue()
+        self.__decoder = codecs.getincrementaldecoder(getattr(self.stream, "encoding", None) or "utf-8")(errors="replace")
+        self.__pending = ""
+        self.__loop = None
+        self.__fd = None
+
+    def start(self) -> None:
+        """Start watching the stream, if the running loop is able to."""
+        loop = asyncio.get_running_loop()
+        try:
+            fd = self.stream.fileno()
+            loop.add_reader(fd, self.__on_readable)
+        except (AttributeError, ValueError, OSError, NotImplementedError):
+            return # We'll use a thread per line instead
+        self.__loop = loop
+        self.__fd = fd
+
+    def close(self) -> None:
+        if self.__loop is not None and self.__fd is not None:
+            self.__loop.remove_reader(self.__fd)
+        self.__loop = None
+        self.__fd = None
+
+    @property
+    def watching(self) -> bool:
+        return self.__fd is not None
+
+    def __on_readable(self) -> None:
+        try:
+            data = os.read(self.__fd, 4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not data: # End of input, let every reader know
+            self.close()
+            if self.__pending:
+                self.__queue.put_nowait(self.__pending)
+                self.__pending = ""
+            self.__queue.put_nowait(None)
+            return
+        *lines, self.__pending = (self.__pending + self.__decoder.decode(data)).split("\n")
+        for line in lines:
+            self.__queue.put_nowait(line.rstrip("\r"))
+
+    async def readline(self) -> str:
+        """The next line without its line break. Raises EOFError at the end of the input."""
+        if self.__queue.empty() and not self.watching:
+            line = await asyncio.to_thread(self.stream.readline)
+            if not line:
+                raise EOFError
+            return line.rstrip("\r\n")
+        line = await self.__queue.get()
+        if line is None:
+            self.__queue.put_nowait(None) # Every later read hits the end too
+            raise EOFError
+        return line
+
+Callback = Callable[[], Union[Any, Awaitable[Any]]]
+
+class Background:
+    """Tasks that run next to the screens for as long as the game does."""
+
+    __tasks: Set["asyncio.Task[Any]"]
+
+    def __init__(self) -> None:
+        self.__tasks = set()
+
+    def spawn(self, coroutine: Awaitable[Any], name: Optional[str] = None) -> "asyncio.Task[Any]":
+        task = asyncio.ensure_future(coroutine)
+        if name:
+            task.set_name(name)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+        return task
+
+    def every(self, interval: float, callback: Callback, name: Optional[str] = None) -> "asyncio.Task[Any]":
+        """Call `callback` (a function or a coroutine function) every `interval` seconds."""
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    result = callback()
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception: # One failed run shouldn't stop the next ones
+                    logging.exception(f"Background task {name or callback!r} failed")
+        return self.spawn(run(), name)
+
+    async def close(self) -> None:
+        """Cancel every task and wait until they are gone."""
+        tasks = list(self.__tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,266 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from items import WEAPONS
+from achievements import Tracker
+from inventory import Inventory
+import logging
+import struct
+import zlib
+import os
+
+####################################################
+# Save files                                       #
+#                                                  #
+# ------------------------------------------------ #
+# One file holds a full snapshot of the progress,  #
+# followed by a journal of deltas: every save only #
+# appends the fields that changed. Now and then    #
+# the journal is folded into a new snapshot.       #
+# Resuming is one sequential read of the file.     #
+#                                                  #
+#   header   magic, version                        #
+#   records  kind, payload length, crc32, payload  #
+#   payload  (field tag, value) for every field    #
+####################################################
+
+MAGIC = b"GLSV"
+VERSION = 1
+_HEADER = struct.Struct("<4sH")
+_RECORD = struct.Struct("<BII")
+
+SNAPSHOT = 1
+DELTA = 2
+
+# ---- Values ----
+
+def _write_uint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_uint(data: bytes, at: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[at]
+        at += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, at
+        shift += 7
+
+def _write_int(out: bytearray, value: int) -> None:
+    _write_uint(out, value << 1 if value >= 0 else (-value << 1) - 1) # Zigzag, so small negatives stay small
+
+def _read_int(data: bytes, at: int) -> Tuple[int, int]:
+    value, at = _read_uint(data, at)
+    return (value >> 1) ^ -(value & 1), at
+
+def _write_float(out: bytearray, value: float) -> None:
+    out += struct.pack("<d", value)
+
+def _read_float(data: bytes, at: int) -> Tuple[float, int]:
+    return struct.unpack_from("<d", data, at)[0], at + 8
+
+def _write_str(out: bytearray, value: str) -> None:
+    encoded = value.encode("utf-8")
+    _write_uint(out, len(encoded))
+    out += encoded
+
+def _read_str(data: bytes, at: int) -> Tuple[str, int]:
+    size, at = _read_uint(data, at)
+    return data[at:at + size].decode("utf-8"), at + size
+
+def _write_strs(out: bytearray, values: List[str]) -> None:
+    _write_uint(out, len(values))
+    for value in values:
+        _write_str(out, value)
+
+def _read_strs(data: bytes, at: int) -> Tuple[List[str], int]:
+    count, at = _read_uint(data, at)
+    values = []
+    for _ in range(count):
+        value, at = _read_str(data, at)
+        values.append(value)
+    return values, at
+
+class Field(NamedTuple):
+    tag: int
+    name: str
+    write: Callable[[bytearray, Any], None]
+    read: Callable[[bytes, int], Tuple[Any, int]]
+
+# Tags are written to disk, so they never change; new fields get new tags
+FIELDS: Tuple[Field, ...] = (
+    Field(1, "player_name", _write_str, _read_str),
+    Field(2, "difficulty", _write_int, _read_int),
+    Field(3, "currency", _write_int, _read_int),
+    Field(4, "lifetime_currency", _write_int, _read_int),
+    Field(5, "wins", _write_int, _read_int),
+    Field(6, "loses", _write_int, _read_int),
+    Field(7, "total_rounds", _write_int, _read_int),
+    Field(8, "scenery", _write_float, _read_float),
+    Field(9, "weapons", _write_strs, _read_strs), # By name, so reordering WEAPONS doesn't break saves
+    Field(10, "achievements", _write_strs, _read_strs), # By key in ACHIEVEMENTS
+    Field(12, "final_shown", _write_uint, _read_uint),
+)
+FIELDS_BY_TAG = {field.tag: field for field in FIELDS}
+
+State = Dict[str, Any]
+
+def encode(state: State, names: Optional[List[str]] = None) -> bytes:
+    """The payload of a record with the given fields of the state (all of them by default)."""
+    out = bytearray()
+    for field in FIELDS:
+        if field.name in state and (names is None or field.name in names):
+            out.append(field.tag)
+            field.write(out, state[field.name])
+    return bytes(out)
+
+def decode(payload: bytes, into: Optional[State] = None) -> State:
+    state = into if into is not None else {}
+    at = 0
+    while at < len(payload):
+        field = FIELDS_BY_TAG.get(payload[at])
+        if field is None:
+            raise ValueError(f"Unknown save field {payload[at]}")
+        state[field.name], at = field.read(payload, at + 1)
+    return state
+
+# ---- Game state ----
+
+def capture(game: Any) -> State:
+    """Everything worth keeping about the player (a `state.GameState`), as plain values."""
+    return {
+        "player_name": game.player_name,
+        "difficulty": game.difficulty,
+        "currency": game.currency,
+        "lifetime_currency": game.lifetime_currency,
+        "wins": game.wins,
+        "loses": game.loses,
+        "total_rounds": game.total_rounds,
+        "scenery": float(game.scenery),
+        "weapons": [weapon.name for weapon in game.weapons],
+        "achievements": game.achievements.keys,
+        "final_shown": int(game.final_shown),
+    }
+
+def restore(game: Any, state: State) -> None:
+    """Put a captured state back. Weapons and achievements that no longer exist are left out."""
+    weapons = {weapon.name: weapon for weapon in WEAPONS}
+    for name in ("player_name", "difficulty", "currency", "lifetime_currency", "wins", "loses", "total_rounds", "scenery"):
+        if name in state:
+            setattr(game, name, state[name])
+    if "weapons" in state:
+        game.weapons = Inventory(weapons[name] for name in state["weapons"] if name in weapons)
+    if "final_shown" in state:
+        game.final_shown = bool(state["final_shown"])
+
+    # The achievements start over from the restored progress, so they stay in step with it
+    unlocked = state.get("achievements", ())
+    tracker = Tracker(game.difficulty)
+    tracker.sync(game.total_rounds, game.wins, game.loses, game.currency, game.lifetime_currency, game.weapons, unlocked)
+    game.achievements = tracker
+
+# ---- The file ----
+
+class SaveFile:
+    """
+    A snapshot and a journal of deltas in one file. `save` appends only what changed since
+    the last save, and after `compact_every` deltas the whole file is rewritten as one snapshot.
+    """
+
+    path: str
+    compact_every: int
+
+    __state: Optional[State] # What the file holds, once read or written
+    __deltas: int
+
+    def __init__(self, path: str, compact_every: int = 64) -> None:
+        self.path = path
+        self.compact_every = compact_every
+        self.__state = None
+        self.__deltas = 0
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @property
+    def deltas(self) -> int:
+        """Deltas in the journal since the last snapshot."""
+        return self.__deltas
+
+    def load(self) -> Optional[State]:
+        """
+        Read the snapshot and replay the journal on top of it. A record cut off halfway
+        (by a crash while saving) ends the journal, and is cut from the file.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.size or _HEADER.unpack_from(data) != (MAGIC, VERSION):
+            raise ValueError(f"{self.path} is not a save file of this version.")
+
+        state: Optional[State] = None
+        deltas = 0
+        at = _HEADER.size
+        while at + _RECORD.size <= len(data):
+            kind, size, checksum = _RECORD.unpack_from(data, at)
+            payload = data[at + _RECORD.size:at + _RECORD.size + size]
+            if len(payload) != size or zlib.crc32(payload) != checksum:
+                break
+            if kind == SNAPSHOT:
+                state = decode(payload)
+                deltas = 0
+            elif kind == DELTA and state is not None:
+                decode(payload, state)
+                deltas += 1
+            else:
+                break
+            at += _RECORD.size + size
+
+        if at < len(data):
+            logging.warning(f"Dropped {len(data) - at} bytes of an unfinished save in {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(at)
+        self.__state = dict(state) if state is not None else None
+        self.__deltas = deltas
+        return state
+
+    def save(self, state: State) -> None:
+        """Append what changed since the last save, or write a snapshot if there's nothing to append to."""
+        if self.__state is None or not self.exists:
+            self.compact(state)
+            return
+        changed = [name for name, value in state.items() if self.__state.get(name) != value]
+        if not changed:
+            return
+        if self.__deltas + 1 >= self.compact_every:
+            self.compact(state)
+            return
+        payload = encode(state, changed)
+        with open(self.path, "ab") as f:
+            f.write(_RECORD.pack(DELTA, len(payload), zlib.crc32(payload)) + payload) # One write per save
+        self.__state.update((name, state[name]) for name in changed)
+        self.__deltas += 1
+
+    def compact(self, state: Optional[State] = None) -> None:
+        """Rewrite the file as a single snapshot (of `state`, or of what the file holds)."""
+        state = state if state is not None else self.__state
+        if state is None:
+            return
+        payload = encode(state)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f: # Written to the side and moved in place, so there always is a whole save
+            f.write(_HEADER.pack(MAGIC, VERSION) + _RECORD.pack(SNAPSHOT, len(payload), zlib.crc32(payload)) + payload)
+        os.replace(temporary, self.path)
+        self.__state = dict(state)
+        self.__deltas = 0
+
+    def delete(self) -> None:
+        if self.exists:
+            os.remove(self.path)
+        self.__state = None
+        self.__deltas = 0
@@ -0,0 +1,252 @@
+from typing import List, Optional, TextIO
+import builtins
+import atexit
+import re
+import io
+import os
+import sys
+
+####################################################
+# Differential frame renderer                      #
+#                                                  #
+# ------------------------------------------------ #
+# Everything that is printed lands in an off-screen #
+# frame first. When the frame is shown (on flush,  #
+# before input and before pauses) it is compared   #
+# with what the terminal already shows, and only   #
+# the lines that changed are rewritten, with ANSI  #
+# cursor moves, in one single write.               #
+####################################################
+
+ANSI = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+HOME = "\x1b[H"
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K" # From the cursor to the end of the line
+CLEAR_BELOW = "\x1b[J" # From the cursor to the end of the screen
+
+def visible_length(text: str) -> int:
+    """How many columns the text takes, not counting colors and other escape codes."""
+    return len(ANSI.sub("", text)) if "\x1b" in text else len(text)
+
+def move_to(row: int, column: int = 0) -> str:
+    return f"\x1b[{row + 1};{column + 1}H"
+
+class FrameRenderer(io.TextIOBase):
+    """
+    A stand in for `sys.stdout` that only redraws what changed between frames.
+
+    `clear` starts a new (empty) frame without touching the terminal. Whatever is written
+    after it builds the frame, and `flush` shows it. When the output isn't a terminal,
+    everything is passed straight through instead.
+    """
+
+    stream: TextIO
+    enabled: bool
+    frames: int # How many frames were started so far
+
+    __frame: List[str] # The lines of the frame being built, the last one is where the cursor is
+    __column: Optional[int] # Where a carriage return left the cursor, None when at the end of the line
+    __shown: Optional[List[Optional[str]]] # What the terminal shows, None where we don't know
+    __width: int
+    __scrolled: bool # The terminal scrolled, so rows no longer are where we think they are
+
+    def __init__(self, stream: Optional[TextIO] = None, enabled: Optional[bool] = None) -> None:
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.enabled = enabled if enabled is not None else self.stream.isatty()
+        self.frames = 0
+        self.__frame = [""]
+        self.__column = None
+        self.__shown = None
+        self.__width = 0
+        self.__scrolled = True
+
+    @classmethod
+    def install(cls, enabled: Optional[bool] = None) -> "FrameRenderer":
+        """Put a renderer in front of `sys.stdout`, so every print goes through it."""
+        renderer = cls(sys.stdout, enabled)
+        sys.stdout = renderer
+        atexit.register(renderer.uninstall)
+        return renderer
+
+    def uninstall(self) -> None:
+        if sys.stdout is self:
+            self.flush()
+            sys.stdout = self.stream
+
+    #### The stream side ####
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.stream, "encoding", "utf-8")
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not self.enabled:
+            return self.stream.write(text)
+        frame = self.__frame
+        for i, part in enumerate(text.split("\n")):
+            if i:
+                frame.append("")
+                self.__column = None
+            if part:
+                frame[-1] = self.__put(frame[-1], part)
+        return len(text)
+
+    def __put(self, line: str, text: str) -> str:
+        """Write text into a line like a terminal would, where a carriage return goes back to the start."""
+        for i, part in enumerate(text.split("\r")):
+            if i:
+                self.__column = 0
+            if not part:
+                continue
+            column = self.__column
+            if column is None:
+                line += part
+            elif "\x1b" in line or "\x1b" in part: # Can't tell columns apart, so the new text takes over the line
+                line = part
+                self.__column = None
+            else:
+                line = line[:column] + part + line[column + len(part):]
+                self.__column = column + len(part) if column + len(part) < len(line) else None
+        return line
+
+    #### Frames ####
+
+    def clear(self) -> None:
+        """Start a new, empty frame. The terminal keeps the old one until the next flush."""
+        self.frames += 1
+        if not self.enabled:
+            return
+        self.__frame = [""]
+        self.__column = None
+
+    @property
+    def line(self) -> str:
+        """The line the cursor is on, as far as it has been written."""
+        return self.__frame[-1]
+
+    @line.setter
+    def line(self, text: str) -> None:
+        """Replace the line the cursor is on, for editing it in place."""
+        if not self.enabled:
+            self.stream.write("\r" + text)
+            return
+        self.__frame[-1] = text
+        self.__column = None
+
+    def invalidate(self) -> None:
+        """Forget what the terminal shows, so the next flush redraws everything."""
+        self.__shown = None
+
+    def flush(self) -> None:
+        if self.enabled:
+            output = self.__diff()
+            if output:
+                self.stream.write(output)
+        self.stream.flush()
+
+    def __size(self) -> os.terminal_size:
+        try:
+            size = os.get_terminal_size(self.stream.fileno())
+        except (AttributeError, ValueError, OSError, io.UnsupportedOperation):
+            size = None
+        if not size or not size.columns or not size.lines: # Some (pseudo) terminals don't know their size
+            return os.terminal_size((80, 24))
+        return size
+
+    def __rows(self, line: str, width: int) -> int:
+        return max(1, -(-visible_length(line) // width))
+
+    def __diff(self) -> str:
+        frame = self.__frame
+        shown = self.__shown
+        width, height = self.__size()
+        total = sum(self.__rows(line, width) for line in frame)
+
+        if shown is not None and width == self.__width and self.__appends(shown, frame):
+            # Only new text at the end, and the cursor is already there (even if we scrolled)
+            last = len(shown) - 1
+            output = frame[last][len(shown[last]):] + "".join("\n" + line for line in frame[last + 1:])
+        elif shown is not None and width == self.__width and not self.__scrolled and total < height:
+            output = self.__changes(shown, frame, width)
+        else:
+            output = HOME + CLEAR_SCREEN + "\n".join(frame)
+            self.__scrolled = False
+        if self.__column is not None: # A carriage return is waiting, so the cursor goes back like it would have
+            output += "\r" + (f"\x1b[{self.__column}C" if self.__column else "")
+
+        self.__width = width
+        self.__scrolled = self.__scrolled or total >= height
+        self.__shown = list(frame)
+        return output
+
+    @staticmethod
+    def __appends(shown: List[Optional[str]], frame: List[str]) -> bool:
+        last = len(shown) - 1
+        if len(frame) <= last:
+            return False
+        for i in range(last):
+            if shown[i] != frame[i]:
+                return False
+        return shown[last] is not None and frame[last].startswith(shown[last])
+
+    def __changes(self, shown: List[Optional[str]], frame: List[str], width: int) -> str:
+        """Cursor moves and text for every line that changed, and a clear below the frame."""
+        output: List[str] = []
+        row = 0
+        shifted = False # Once a line takes a different number of rows, everything after it moved
+        for i, line in enumerate(frame):
+            rows = self.__rows(line, width)
+            old = shown[i] if i < len(shown) else None
+            if shifted or old is None or old != line:
+                output.append(move_to(row) + line + CLEAR_LINE)
+                if old is None or self.__rows(old, width) != rows:
+                    shifted = True
+            row += rows
+        last = frame[-1]
+        end_row = row - self.__rows(last, width)
+        length = visible_length(last)
+        if length and length % width == 0: # The cursor waits at the end of a full row
+            end_row, column = end_row + length // width - 1, width
+        else:
+            end_row, column = end_row + length // width, length % width
+        shown_rows = sum(self.__rows(line, width) if line is not None else 1 for line in shown)
+        if shown_rows > row or len(shown) > len(frame):
+            output.append(move_to(row) + CLEAR_BELOW)
+        if output:
+            output.append(move_to(end_row, column))
+        return "".join(output)
+
+    #### Input ####
+
+    def prompt(self, prompt: str = "") -> None:
+        """Show the frame with the prompt at the end, ready for the answer to be typed."""
+        self.write(prompt)
+        self.flush()
+
+    def echoed(self, text: str) -> None:
+        """Keep track of an answer the terminal echoed after `prompt`, with its line break."""
+        if not self.enabled:
+            return
+        # Line editing may have left anything on that row, so we'll redraw it the next time it matters
+        self.write(text + "\n")
+        if self.__shown is not None:
+            self.__shown = list(self.__frame)
+            self.__shown[-2] = None
+
+    def input(self, prompt: str = "") -> str:
+        """Like `input`, but shows the frame first and keeps track of what the echo did to it."""
+        self.prompt(prompt)
+        text = builtins.input()
+        self.echoed(text)
+        return text
@@ -0,0 +1,303 @@
+from typing import Deque, List, Optional, Set, Tuple
+from collections import deque
+from session import Session, Quit
+from clock import Clock
+import constants
+import runtime
+import screen
+import game
+import asyncio
+import argparse
+import logging
+import codecs
+import time
+import re
+
+####################################################
+# Game server                                      #
+#                                                  #
+# ------------------------------------------------ #
+# Every TCP connection (telnet, or plain netcat)   #
+# gets a session of its own, playing the same      #
+# screens as the terminal on one shared event      #
+# loop. Input arrives a line at a time, frames go  #
+# out as ANSI, a connection that doesn't keep up   #
+# with its output holds only its own session back, #
+# and connections that go quiet are closed.        #
+####################################################
+
+# Telnet commands, to be filtered out of the input
+IAC, SB, SE, GA = 255, 250, 240, 249
+WILL, WONT, DO, DONT = 251, 252, 253, 254
+
+_NEWLINE = re.compile(r"(?<!\r)\n")
+
+class TelnetFilter:
+    """Strips telnet commands (and their negotiation) out of a byte stream, across reads."""
+
+    __state: int # 0 data, 1 after IAC, 2 option of WILL/WONT/DO/DONT, 3 subnegotiation, 4 IAC in subnegotiation
+    __slots__ = ("_TelnetFilter__state",)
+
+    def __init__(self) -> None:
+        self.__state = 0
+
+    def feed(self, data: bytes) -> bytes:
+        if IAC not in data and self.__state == 0: # Nearly every read
+            return data
+        out = bytearray()
+        state = self.__state
+        for byte in data:
+            if state == 0:
+                if byte == IAC:
+                    state = 1
+                else: out.append(byte)
+            elif state == 1:
+                if byte == IAC: # An escaped 255 is data
+                    out.append(byte)
+                    state = 0
+                elif byte in (WILL, WONT, DO, DONT):
+                    state = 2
+                elif byte == SB:
+                    state = 3
+                else: state = 0
+            elif state == 2:
+                state = 0
+            elif state == 3:
+                if byte == IAC:
+                    state = 4
+            else: state = 0 if byte == SE else 3
+        self.__state = state
+        return bytes(out)
+
+class Connection:
+    """
+    One client: the lines it sends (a `session.LineSource`), and the stream its frames are
+    written to (what a `screen.FrameRenderer` writes on).
+    """
+
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    last_input: float # When the client last sent anything, on the monotonic clock
+    max_line: int
+    go_ahead: bool # Send a telnet Go Ahead whenever the session waits for a line, so scripts know when to answer
+
+    __filter: TelnetFilter
+    __decoder: codecs.IncrementalDecoder
+    __lines: Deque[str]
+    __pending: str
+    __output: List[str]
+    __slots__ = ("reader", "writer", "last_input", "max_line", "go_ahead", "_Connection__filter", "_Connection__decoder", "_Connection__lines", "_Connection__pending", "_Connection__output",)
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, write_buffer: int = constants.SERVER_WRITE_BUFFER, max_line: int = constants.SERVER_MAX_LINE, go_ahead: bool = False) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.last_input = time.monotonic()
+        self.max_line = max_line
+        self.go_ahead = go_ahead
+        self.__filter = TelnetFilter()
+        self.__decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.__lines = deque()
+        self.__pending = ""
+        self.__output = []
+        writer.transport.set_write_buffer_limits(high=write_buffer)
+
+    #### Input ####
+
+    async def readline(self) -> str:
+        """The next line the client sent. Raises EOFError once it is gone."""
+        if self.go_ahead and not self.__lines and not self.writer.is_closing():
+            self.flush()
+            self.writer.write(bytes((IAC, GA)))
+        while not self.__lines:
+            try:
+                data = await self.reader.read(4096)
+            except ConnectionError:
+                data = b""
+            if not data:
+                raise EOFError
+            self.last_input = time.monotonic()
+            text = self.__pending + self.__decoder.decode(self.__filter.feed(data))
+            *lines, pending = text.replace("\r\n", "\n").replace("\r\0", "\n").replace("\0", "").split("\n")
+            self.__lines.extend(line.rstrip("\r")[:self.max_line] for line in lines)
+            self.__pending = pending[-self.max_line:] # Whoever never ends a line doesn't get to fill our memory
+        return self.__lines.popleft()
+
+    #### Output ####
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, text: str) -> int:
+        self.__output.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if not self.__output:
+            return
+        text = "".join(self.__output)
+        self.__output.clear()
+        if not self.writer.is_closing():
+            self.writer.write(_NEWLINE.sub("\r\n", text).encode("utf-8")) # Telnet wants both
+
+    async def drain(self) -> None:
+        """Wait while the client is behind on its output."""
+        self.flush()
+        if self.writer.is_closing():
+            raise EOFError
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            raise EOFError
+
+    #### Lifetime ####
+
+    def abort(self) -> None:
+        """Drop the client at once, unsent output and all."""
+        self.writer.transport.abort()
+
+    async def close(self) -> None:
+        self.flush()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+class GameServer:
+    """Serves a game session to every connection, up to `max_sessions` of them at once."""
+
+    host: str
+    port: int
+    max_sessions: int
+    idle_timeout: float
+    write_buffer: int
+    time_scale: float
+    go_ahead: bool
+
+    served: int # Sessions that were started
+    rejected: int # Connections turned away because the server was full
+    reaped: int # Connections closed for being idle
+    peak: int
+
+    __server: Optional[asyncio.AbstractServer]
+    __connections: Set[Connection]
+    __background: runtime.Background
+
+    def __init__(self,
+            host: str = constants.SERVER_HOST,
+            port: int = constants.SERVER_PORT,
+            max_sessions: int = constants.SERVER_MAX_SESSIONS,
+            idle_timeout: float = constants.SERVER_IDLE_TIMEOUT,
+            write_buffer: int = constants.SERVER_WRITE_BUFFER,
+            time_scale: float = constants.TIME_SCALE,
+            go_ahead: bool = False) -> None:
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.write_buffer = write_buffer
+        self.time_scale = time_scale
+        self.go_ahead = go_ahead
+        self.served = self.rejected = self.reaped = self.peak = 0
+        self.__server = None
+        self.__connections = set()
+        self.__background = runtime.Background()
+
+    @property
+    def sessions(self) -> int:
+        return len(self.__connections)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Where the server listens (with the real port, when it was started on port 0)."""
+        if self.__server is None or not self.__server.sockets:
+            return self.host, self.port
+        return self.__server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        self.__server = await asyncio.start_server(self.__handle, self.host, self.port)
+        if self.idle_timeout > 0:
+            self.__background.every(min(self.idle_timeout / 4, 30.0), self.__reap, "reaper")
+
+    async def serve_forever(self) -> None:
+        if self.__server is None:
+            await self.start()
+        await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        await self.__background.close()
+        if self.__server is not None:
+            self.__server.close()
+        for connection in list(self.__connections):
+            connection.abort()
+        if self.__server is not None:
+            await self.__server.wait_closed()
+
+    def __reap(self) -> None:
+        deadline = time.monotonic() - self.idle_timeout
+        for connection in [connection for connection in self.__connections if connection.last_input < deadline]:
+            self.reaped += 1
+            connection.abort() # Its session reads the end of the input, and ends
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self.__connections) >= self.max_sessions:
+            self.rejected += 1
+            writer.write(b"The arena is full, try again later.\r\n")
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            return
+
+        connection = Connection(reader, writer, self.write_buffer, go_ahead=self.go_ahead)
+        self.__connections.add(connection)
+        self.served += 1
+        self.peak = max(self.peak, len(self.__connections))
+        session = Session(
+            screen.FrameRenderer(connection, enabled=True), # 80x24, since there is no terminal to ask
+            reader = connection,
+            drain = connection.drain,
+            clock = Clock(self.time_scale),
+            music = False
+        )
+        try:
+            await game.play(session)
+        except (EOFError, Quit, ConnectionError): # The player left, one way or another
+            pass
+        except Exception:
+            logging.exception("A session failed")
+        finally:
+            self.__connections.discard(connection)
+            await connection.close()
+
+# ---- Main ----
+
+parser = argparse.ArgumentParser(description="Gladiators server")
+parser.add_argument("--host", default=constants.SERVER_HOST)
+parser.add_argument("--port", type=int, default=constants.SERVER_PORT)
+parser.add_argument("--max-sessions", type=int, default=constants.SERVER_MAX_SESSIONS, help="connections past this are turned away")
+parser.add_argument("--idle-timeout", type=float, default=constants.SERVER_IDLE_TIMEOUT, help="seconds without input before a connection is closed, 0 for never")
+parser.add_argument("--time-scale", type=float, default=constants.TIME_SCALE, help="how long the pauses last, 0 skips them")
+parser.add_argument("--go-ahead", action="store_true", help="send a telnet Go Ahead whenever a session waits for input (for scripted clients)")
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    arguments = parser.parse_args(argv)
+    server = GameServer(arguments.host, arguments.port, arguments.max_sessions, arguments.idle_timeout, time_scale=arguments.time_scale, go_ahead=arguments.go_ahead)
+    await server.start()
+    host, port = server.address
+    print(f"Serving Gladiators on {host}:{port}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
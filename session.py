@@ -0,0 +1,313 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Protocol
+from colorama import Fore, Style
+from playsound3.playsound3 import Sound
+from playsound3 import playsound
+from translator import Transcriber, Language, shared
+from settings import Settings
+from enemies import EnemyPool
+from state import GameState
+from clock import Clock
+import constants
+import runtime
+import screen
+import keys
+import logging
+import replay
+import random
+import save
+
+####################################################
+# Sessions                                         #
+#                                                  #
+# ------------------------------------------------ #
+# A session is one player somewhere: the screen    #
+# they see, the input they give, the clock their   #
+# pauses run on, their random streams, saves and   #
+# music, and their `GameState`. The screens only   #
+# ever go through a session, so one process can    #
+# run as many of them side by side as it likes.    #
+####################################################
+
+class Quit(Exception):
+    """The player left, which ends the screens of their session."""
+
+class LineSource(Protocol):
+    async def readline(self) -> str: ... # Without the line break, raises EOFError at the end
+
+Drain = Callable[[], Awaitable[None]]
+
+class Session:
+    """
+    Everything one player's screens draw on and read from. Without a `keyboard` (or with
+    one that isn't active) input arrives a line at a time from `reader`.
+    """
+
+    state: GameState
+    out: screen.FrameRenderer
+    keyboard: Optional[keys.KeyReader]
+    reader: Optional[LineSource]
+    drain: Optional[Drain] # Waits until the output was taken, so a slow reader holds its session back
+    clock: Clock
+
+    rng: random.Random # The game itself
+    items_rng: random.Random # Weapon drops
+    enemies_rng: random.Random # Enemy names
+    enemy_pool: EnemyPool
+
+    catalog: Transcriber # Shared by every session
+    lang: Optional[Language]
+    settings: Dict[Settings, Any]
+
+    save_file: Optional[save.SaveFile]
+    recorder: Optional[replay.Recorder] # Set when the session is recorded
+    replayer: Optional[replay.Replayer] # Set when a recorded session is played back
+    headless: bool # No terminal, no music and no saves, when replaying
+    music: bool # Wheter this session can play sounds at all
+
+    background: runtime.Background # Music and autosave keep going while a screen waits
+    background_sound: str
+    background_music: Optional[Sound]
+    autosave_hooks: List[Callable[[], Any]]
+
+    def __init__(self,
+            out: screen.FrameRenderer,
+            keyboard: Optional[keys.KeyReader] = None,
+            reader: Optional[LineSource] = None,
+            clock: Optional[Clock] = None,
+            seed: Optional[int] = None,
+            save_file: Optional[save.SaveFile] = None,
+            recorder: Optional[replay.Recorder] = None,
+            replayer: Optional[replay.Replayer] = None,
+            headless: bool = False,
+            music: bool = True,
+            lang: Optional[Language] = None,
+            drain: Optional[Drain] = None) -> None:
+        self.out = out
+        self.keyboard = keyboard
+        self.reader = reader
+        self.drain = drain
+        self.clock = clock or Clock(constants.TIME_SCALE)
+
+        self.rng = random.Random(constants.RANDOM_SEED)
+        self.items_rng = random.Random(constants.RANDOM_SEED)
+        self.enemies_rng = random.Random(constants.RANDOM_SEED)
+        if seed is not None: # Every random stream starts from the one seed, so the session can be played again
+            replay.seed_all(seed, self.streams)
+        self.enemy_pool = EnemyPool(source=self.enemies_rng, items_source=self.items_rng) # Beaten enemies come back as the next ones
+        self.state = GameState.new(self.items_rng)
+
+        self.catalog = shared()
+        self.lang = lang
+        self.settings = {setting: setting.value for setting in Settings.all()}
+
+        self.save_file = save_file
+        self.recorder = recorder
+        self.replayer = replayer
+        self.headless = headless
+        self.music = music and not headless
+
+        self.background = runtime.Background()
+        self.background_sound = "./sounds/menu.mp3"
+        self.background_music = None
+        self.autosave_hooks = [self.save_game]
+
+    @property
+    def streams(self) -> Dict[str, random.Random]:
+        return {"items": self.items_rng, "enemies": self.enemies_rng, "game": self.rng}
+
+    #### Text ####
+
+    def text(self, index: int, end: Optional[int] = None) -> str:
+        """A line (or lines) of the catalog, in the language of this session."""
+        return self.catalog.get_index(index, end, lang=self.lang.value if self.lang else None)
+
+    def render(self, index: int, end: Optional[int] = None, **values: Any) -> str:
+        return self.catalog.render(index, end, lang=self.lang.value if self.lang else None, **values)
+
+    def print(self, *values: Any, sep: Optional[str] = " ", end: Optional[str] = "\n") -> None:
+        print(*values, sep=sep, end=end, file=self.out)
+
+    def draw_title(self, *text: str) -> None: # We'll create a title method to render all title firstly for every page
+        self.out.clear()
+        self.print(*text, end="\n\n")
+
+    def draw_main_title(self) -> None:
+        self.draw_title(Fore.CYAN + Style.BRIGHT + self.text(0) + Style.RESET_ALL)
+
+    #### Input ####
+
+    @property
+    def keys(self) -> bool:
+        """Wheter input arrives a key at a time."""
+        return self.keyboard is not None and self.keyboard.active
+
+    def remember(self, kind: str, value: str) -> str: # We'll write every input to the recording, if there is one
+        if self.recorder:
+            self.recorder.record(self.out.frames, kind, value)
+        return value
+
+    async def read_line(self, prompt: str = "") -> str: # We'll show what we have so far, and wait for a line
+        if self.replayer:
+            text = self.replayer.next(self.out.frames, "line")
+            self.print(prompt + text)
+            return text
+        return self.remember("line", await self.type_line(prompt))
+
+    async def type_line(self, prompt: str = "") -> str: # The player types a line
+        if not self.keys:
+            if self.reader is None:
+                raise EOFError
+            self.out.prompt(prompt)
+            if self.drain:
+                await self.drain()
+            text = await self.reader.readline()
+            self.out.echoed(text)
+            return text
+        self.print(prompt, end="")
+        start = self.out.line
+        text = ""
+        while True: # Nothing is echoed in raw mode, so we'll draw the line ourselves
+            self.out.line = start + text
+            self.out.flush()
+            key = await self.keyboard.get()
+            if key == keys.ENTER:
+                break
+            if key == keys.EOF and not text:
+                raise EOFError
+            if key == keys.BACKSPACE:
+                text = text[:-1]
+            elif len(key) == 1 and key.isprintable():
+                text += key
+        self.print()
+        return text
+
+    async def read_choice(self, prompt: str, options: Iterable[str]) -> str: # We'll pick an option on a single key press
+        self.print(prompt, end="")
+        start = self.out.line
+        options = [option.lower() for option in options]
+        typed = ""
+        while True:
+            self.out.line = start + typed
+            self.out.flush()
+            key = await self.keyboard.get()
+            if key == keys.ENTER:
+                break
+            if key == keys.ESCAPE:
+                typed = ""
+                break
+            if key == keys.EOF:
+                raise EOFError
+            if key == keys.BACKSPACE:
+                typed = typed[:-1]
+            elif len(key) == 1 and key.isprintable():
+                typed += key.lower()
+                if keys.choose(typed, options) is not None: # Only ambiguous prefixes like "1" next to "10" need another key
+                    break
+        self.out.line = start + typed
+        self.print()
+        return typed
+
+    async def show(self) -> None: # We'll show what we have so far
+        self.out.flush()
+        if self.drain:
+            await self.drain()
+
+    async def pause(self, seconds: float) -> None: # We'll show what we have so far, and then wait
+        await self.show()
+        await self.clock.sleep(seconds)
+
+    async def wait_key(self) -> None: # We'll show what we have so far, and wait for any key
+        if self.replayer:
+            self.replayer.next(self.out.frames, "key")
+            return
+        if self.keys:
+            await self.show()
+            key = await self.keyboard.get()
+        else: key = await self.type_line()
+        self.remember("key", key)
+
+    # We'll manifacture the drop down menu
+    async def prompt_menu(self, title: str, prompt: str, options: Dict[str, str]) -> str:
+        self.print(title)
+        for k, v in options.items():
+            self.print(Fore.BLUE + k + ": " + Fore.RESET + v)
+        if self.keys and not self.replayer: # Recorded like a typed line, so a replay can feed it back through here
+            return self.remember("line", await self.read_choice(prompt, options))
+        return await self.read_line(prompt)
+
+    #### Music ####
+
+    def create_background_music(self) -> Optional[Sound]: # We'll create a method to run a new background sound
+        if not self.music:
+            return None
+        return playsound(self.background_sound, False)
+
+    def switch_music(self, sound: str) -> None: # We'll change the background sound, unless it is already playing
+        if sound == self.background_sound:
+            return
+        self.background_sound = sound
+        if Settings.MUSIC.value_for(self) and self.background_music:
+            self.background_music.stop()
+            self.background_music = self.create_background_music()
+
+    def supervise_music(self) -> None: # Runs in the background, and restarts the music whenever it ends
+        if Settings.MUSIC.value_for(self) and (not self.background_music or not self.background_music.is_alive()):
+            self.background_music = self.create_background_music()
+
+    def toggle_music(self) -> None:
+        if self.background_music:
+            self.background_music.stop()
+            self.background_music = None
+        else:
+            self.background_music = self.create_background_music()
+
+    #### Saves ####
+
+    def autosave(self) -> None: # We'll let anything that wants to save do it every now and then
+        for hook in self.autosave_hooks:
+            hook()
+
+    def save_game(self) -> None:
+        if self.save_file is None or self.recorder or self.replayer: # A recorded session starts fresh, and shouldn't touch the real save
+            return
+        try:
+            self.save_file.save(save.capture(self.state))
+        except OSError as e: # Not being able to save shouldn't end the game
+            logging.warning(f"Could not save the game: {e}")
+
+    def load_game(self) -> bool: # Resume where the last session ended, if there is one
+        if self.save_file is None or self.recorder or self.replayer:
+            return False
+        try:
+            state = self.save_file.load()
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not load the save: {e}")
+            return False
+        if not state:
+            return False
+        save.restore(self.state, state)
+        return True
+
+    def delete_save(self) -> None: # The campaign is over, so the next one starts fresh
+        if self.save_file is not None and not (self.recorder or self.replayer):
+            self.save_file.delete()
+
+    #### Lifetime ####
+
+    def start(self) -> None:
+        """Start the music, and what keeps running next to the screens."""
+        self.background_music = self.create_background_music()
+        if self.music:
+            self.background.every(constants.MUSIC_CHECK_INTERVAL, self.supervise_music, "music")
+        if self.save_file is not None and not self.headless:
+            self.background.every(constants.AUTOSAVE_INTERVAL, self.autosave, "autosave")
+
+    async def close(self) -> None:
+        await self.background.close()
+        if self.background_music:
+            self.background_music.stop()
+            self.background_music = None
+        if self.recorder:
+            self.recorder.close()
+        self.enemy_pool.release(self.state.enemy)
+        self.out.flush()
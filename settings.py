@@ -0,0 +1,68 @@
+from typing import TypeVar, Callable, Generic, ValuesView, Any
+from dataclasses import dataclass, field
+from enum import Enum
+
+# ---- Settings ----
+
+# We'll create a type var for typing, when it is dynamic and not directly static
+SettingType = TypeVar("SettingType", bound=Any)
+
+# We'll create a dataclass for a setting, every session starts with its value and keeps its own
+@dataclass
+class Setting(Generic[SettingType]):
+    value: SettingType
+    toggle: bool = field(default=False)
+    custom_logic: Callable[[Any], Any] = field(default=lambda session: None) # Gets the session, once its value changed
+    enum: "Settings" = field(init=False, compare=False)
+
+# We'll create a enum for different settings
+class Settings(Enum):
+    GORE: Setting[bool] = Setting(False) # Wheter we express bloddy and visious imaginary text
+    MUSIC: Setting[bool] = Setting(True, toggle=True, custom_logic=lambda session: session.toggle_music())
+
+    @classmethod
+    def load(cls) -> None: # Load all settings so they appeal to their real object
+        for v in cls.__members__.values():
+            if isinstance(v.value, Setting):
+                v.value.enum = v
+
+    @classmethod
+    def all(cls) -> ValuesView["Settings"]: # Get all settings
+        return cls.__members__.values()
+
+    @property
+    def setting(self) -> Setting: # Get the setting object, with the given value
+        return object.__getattribute__(self, "_value_")
+
+    @property
+    def name(self) -> str: # The name will be the capitalization of that of the real enum name
+        return object.__getattribute__(self, "_name_").capitalize()
+
+    @property
+    def value(self) -> SettingType: # Get the value every session starts with
+        return self.setting.value
+
+    @property
+    def toggle(self) -> bool:
+        return self.setting.toggle
+
+    def value_for(self, session: Any) -> SettingType: # Get the value in a session
+        return session.settings.get(self, self.value)
+
+    def text_value(self, session: Any) -> str: # Get the text correspondance of the value, in the language of the session
+        value = self.value_for(session)
+        if isinstance(value, bool):
+            return session.text(13) if value else session.text(14)
+
+    def handle_input(self, session: Any, text: str) -> None: # Handle text input.
+        value = self.value_for(session)
+        if isinstance(value, bool):
+            if self.toggle:
+                session.settings[self] = not value
+                self.setting.custom_logic(session)
+                return
+            on_text, off_text = session.text(13).lower().strip(), session.text(14).lower().strip()
+            session.settings[self] = text.lower().strip() in (on_text[0], on_text) and not text in (off_text[0], off_text)
+
+# Loadin...
+Settings.load()
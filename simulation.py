@@ -0,0 +1,263 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from items import Item, WEAPONS, WeaponTable, weapon_table
+from constants import STATE_CHANGE
+from battle import EPS, MAX_HEALTH, Outcome, simulate
+import numpy as np
+import random
+import os
+
+####################################################
+# Vectorized Monte Carlo simulator                 #
+#                                                  #
+# ------------------------------------------------ #
+# Thousands of fights advance in lockstep as NumPy #
+# arrays, one lane per fight. Every lane follows   #
+# the exact rules of `battle.resolve_round`, the   #
+# only difference is where the randomness is       #
+# drawn from.                                      #
+####################################################
+
+MAX_ROUNDS = 1000 # Fights that last longer than this are cut off and count as no win
+DIFFICULTIES = (0, 1, 2, 3)
+
+Seed = Optional[Union[int, np.random.SeedSequence]]
+
+# Enemy states as lane codes, in the order `enemies.next_state` picks from
+AGGRESIVE, PROTECTIVE, CASUAL = 0, 1, 2
+THIS_ATTACK_CHANCE = np.array((1.25, 1.0, 1.0))
+OTHER_ATTACK_CHANCE = np.array((1.0, 0.75, 1.0))
+STATE_CUM_WEIGHTS = np.cumsum(STATE_CHANGE) / sum(STATE_CHANGE)
+# TRANSITIONS[pick * 3 + state]: stay, calm down, protect or attack
+TRANSITIONS = np.array((
+    AGGRESIVE, PROTECTIVE, CASUAL,
+    CASUAL, CASUAL, CASUAL,
+    PROTECTIVE, PROTECTIVE, PROTECTIVE,
+    AGGRESIVE, AGGRESIVE, AGGRESIVE,
+), dtype=np.int64)
+
+class WeaponArrays:
+    """The numbers of a weapon list as NumPy arrays, viewing the buffers of its `WeaponTable` (nothing is copied)."""
+
+    __slots__ = ("damage", "damage_chance", "blood", "blood_ticks",)
+
+    def __init__(self, weapons: Sequence[Item]) -> None:
+        table = weapon_table() if weapons is WEAPONS else WeaponTable(weapons)
+        self.damage = np.frombuffer(table.damage, dtype=np.float64)
+        self.damage_chance = np.frombuffer(table.damage_chance, dtype=np.float64)
+        self.blood = np.frombuffer(table.blood, dtype=np.int64)
+        self.blood_ticks = np.frombuffer(table.blood_ticks, dtype=np.int64)
+
+def damage_multipliers(difficulty: int) -> Tuple[float, float]:
+    player_damage_mult = 1.15 if difficulty == 0 else 0.85 if difficulty == 2 else 1.0
+    enemy_damage_mult  = 0.85 if difficulty == 0 else 1.15 if difficulty == 2 else 1.0
+    return player_damage_mult, enemy_damage_mult
+
+def simulate_batch(player_weapons: np.ndarray, enemy_weapons: np.ndarray, difficulty: int, rng: np.random.Generator, table: Optional[WeaponArrays] = None, max_rounds: int = MAX_ROUNDS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fight `len(player_weapons)` fresh battles at once. Both arguments are indices into `WEAPONS` (or the weapons of `table`).
+    Returns a boolean array of player wins and the number of rounds every fight took.
+    """
+    table = table or WeaponArrays(WEAPONS)
+    player_damage_mult, enemy_damage_mult = damage_multipliers(difficulty)
+    double_knockout_win = 0.45 if difficulty == 0 else 0.25
+
+    n = len(player_weapons)
+    wins = np.zeros(n, dtype=bool)
+    rounds = np.full(n, max_rounds, dtype=np.int64)
+
+    # Per lane weapon numbers, looked up once
+    lanes = np.arange(n)
+    p_damage = table.damage[player_weapons]
+    p_chance = table.damage_chance[player_weapons]
+    p_blood = table.blood[player_weapons]
+    p_blood_ticks = table.blood_ticks[player_weapons]
+    e_damage = table.damage[enemy_weapons]
+    e_chance = table.damage_chance[enemy_weapons]
+    e_blood = table.blood[enemy_weapons]
+    e_blood_ticks = table.blood_ticks[enemy_weapons]
+
+    # Per lane fight state
+    player_health = np.full(n, MAX_HEALTH, dtype=np.int64)
+    enemy_health = np.full(n, MAX_HEALTH, dtype=np.int64)
+    player_bleed = np.zeros(n, dtype=np.int64)
+    player_bleed_ticks = np.zeros(n, dtype=np.int64)
+    enemy_bleed = np.zeros(n, dtype=np.int64)
+    enemy_bleed_ticks = np.zeros(n, dtype=np.int64)
+    player_cache = np.zeros(n)
+    enemy_cache = np.zeros(n)
+    state = np.full(n, CASUAL, dtype=np.int64)
+    # Two weapons that can never draw blood would only stand there until `max_rounds`
+    running = (p_damage * p_chance > 0) | (e_damage * e_chance > 0)
+
+    for round_no in range(1, max_rounds + 1):
+        if lanes.size == 0:
+            break
+        u = rng.random((5, lanes.size))
+
+        # Auto balancing and difficulty modifiers
+        player_factor = np.clip(1.0 - player_cache / (player_cache + enemy_cache + EPS), 0.0, 1.0)
+        enemy_factor = np.clip(1.0 - player_factor, 0.0, 1.0)
+        easy = (player_factor >= 0.75) if difficulty != 0 else np.ones(lanes.size, dtype=bool)
+        hard = ~easy & ((enemy_factor >= 0.75) if difficulty != 2 else True)
+        player_mod = (easy.view(np.int8) - hard.view(np.int8)) * 0.05
+
+        player_drift = 1.35 - u[0] * 0.30 + player_mod
+        enemy_drift = 1.35 - u[1] * 0.30 - player_mod
+        player_variable_chance = np.clip(OTHER_ATTACK_CHANCE.take(state) * player_drift, 0.0, 1.0)
+        enemy_variable_chance = np.clip(enemy_drift, 0.0, 1.0)
+
+        # The player strikes with the state from last round, then the enemy changes its mind and strikes back
+        player_hit = u[2] <= p_chance * player_variable_chance
+        pick = (u[3] >= STATE_CUM_WEIGHTS[0]).view(np.int8) + (u[3] >= STATE_CUM_WEIGHTS[1]).view(np.int8) + (u[3] >= STATE_CUM_WEIGHTS[2]).view(np.int8)
+        state = TRANSITIONS.take(pick * 3 + state)
+        enemy_hit = u[4] <= e_chance * (THIS_ATTACK_CHANCE.take(state) * enemy_variable_chance)
+
+        player_damage = (p_damage * player_hit * player_damage_mult).astype(np.int64)
+        enemy_damage = ((e_damage * enemy_hit).astype(np.int64) * enemy_damage_mult).astype(np.int64)
+
+        player_cache = player_cache * 0.8 + player_damage * 0.2
+        enemy_cache = enemy_cache * 0.8 + enemy_damage * 0.2
+        player_health -= enemy_damage
+        enemy_health -= player_damage
+
+        # Bleeding, first for the enemy and then for the player (see `Enemy.apply_blood`)
+        for health, bleed, bleed_ticks, damage, blood, blood_ticks in (
+            (enemy_health, enemy_bleed, enemy_bleed_ticks, player_damage, p_blood, p_blood_ticks),
+            (player_health, player_bleed, player_bleed_ticks, enemy_damage, e_blood, e_blood_ticks),
+        ):
+            bleeding = bleed > 0
+            health -= bleed # bleed is zero whenever nothing is bleeding
+            bleed_ticks -= bleeding
+            flowing = ~bleeding | (bleed_ticks > 0)
+            bleed *= flowing
+            bleed_ticks *= flowing
+            cut = damage > 0
+            np.minimum(bleed + blood * cut, 5, out=bleed)
+            np.minimum(bleed_ticks + blood_ticks * cut, 3, out=bleed_ticks)
+
+        player_dead = player_health <= 0
+        enemy_dead = enemy_health <= 0
+        done = (player_dead | enemy_dead) & running
+        if not done.any():
+            continue
+
+        finished = lanes[done]
+        knockout = rng.random(finished.size) < double_knockout_win # Both fell, so the crowd decides
+        wins[finished] = enemy_dead[done] & (~player_dead[done] | knockout)
+        rounds[finished] = round_no
+        running &= ~done
+
+        # Finished lanes keep being stepped (and ignored) until enough of them pile up to be worth dropping
+        live = np.count_nonzero(running)
+        if live * 2 > lanes.size:
+            continue
+        keep = running
+        lanes, running = lanes[keep], running[keep]
+        p_damage, p_chance, p_blood, p_blood_ticks = p_damage[keep], p_chance[keep], p_blood[keep], p_blood_ticks[keep]
+        e_damage, e_chance, e_blood, e_blood_ticks = e_damage[keep], e_chance[keep], e_blood[keep], e_blood_ticks[keep]
+        player_health, enemy_health = player_health[keep], enemy_health[keep]
+        player_bleed, player_bleed_ticks = player_bleed[keep], player_bleed_ticks[keep]
+        enemy_bleed, enemy_bleed_ticks = enemy_bleed[keep], enemy_bleed_ticks[keep]
+        player_cache, enemy_cache, state = player_cache[keep], enemy_cache[keep], state[keep]
+
+    return wins, rounds
+
+def win_matrix(difficulty: int, fights: int = 10_000, seed: Seed = None, batch_size: int = 1 << 18, weapons: Sequence[Item] = WEAPONS) -> np.ndarray:
+    """
+    Win probability of every player weapon (rows) against every enemy weapon (columns),
+    estimated from `fights` simulated fights per cell.
+    """
+    rng = np.random.default_rng(seed)
+    table = WeaponArrays(weapons)
+    count = len(weapons)
+    cells = count * count
+    total = cells * fights
+    wins = np.zeros(cells)
+
+    # Lanes are handed out round robin over the cells, so every batch covers the whole matrix evenly
+    for start in range(0, total, batch_size):
+        cell = np.arange(start, min(start + batch_size, total)) % cells
+        won, _ = simulate_batch(cell // count, cell % count, difficulty, rng, table)
+        wins += np.bincount(cell, weights=won, minlength=cells)
+
+    return (wins / fights).reshape(count, count)
+
+def win_matrices(fights: int = 10_000, seed: Seed = None, difficulties: Sequence[int] = DIFFICULTIES) -> Dict[int, np.ndarray]:
+    """The win probability matrix for every difficulty, with independent random streams."""
+    seeds = np.random.SeedSequence(seed).spawn(len(difficulties))
+    return {
+        difficulty: win_matrix(difficulty, fights, s)
+        for difficulty, s in zip(difficulties, seeds)
+    }
+
+
+# ---- Parallel runner ----
+
+# Work is cut into shards of a fixed size, never into one piece per worker. That way the shards,
+# their random streams and the order they are merged in only depend on the master seed, and a
+# laptop and a 32 core box produce bit-identical results.
+SHARD_SIZE = 1 << 18
+
+def shard_seeds(seed: Seed, shards: int) -> List[np.random.SeedSequence]:
+    """Independent, reproducible child streams of one master seed (one per shard)."""
+    master = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return master.spawn(shards)
+
+def python_rng(seed: np.random.SeedSequence) -> random.Random:
+    """A `random.Random` for the pure Python engine, fed from a shard stream."""
+    return random.Random(int.from_bytes(seed.generate_state(4).tobytes(), "little"))
+
+def _matrix_shard(difficulty: int, start: int, stop: int, weapons: Sequence[Item], seed: np.random.SeedSequence) -> np.ndarray:
+    count = len(weapons)
+    cells = count * count
+    cell = np.arange(start, stop) % cells
+    won, _ = simulate_batch(cell // count, cell % count, difficulty, np.random.default_rng(seed), WeaponArrays(weapons))
+    return np.bincount(cell, weights=won, minlength=cells)
+
+def _fight_shard(weapon: int, enemy_weapon: int, difficulty: int, fights: int, seed: np.random.SeedSequence) -> Tuple[int, int]:
+    rng = python_rng(seed)
+    wins = rounds = 0
+    for _ in range(fights):
+        outcome, taken = simulate(WEAPONS[weapon], WEAPONS[enemy_weapon], difficulty, rng)
+        wins += outcome is Outcome.WIN
+        rounds += taken
+    return wins, rounds
+
+def parallel_win_matrix(difficulty: int, fights: int = 10_000, seed: Seed = None, workers: Optional[int] = None, shard_size: int = SHARD_SIZE, weapons: Sequence[Item] = WEAPONS) -> np.ndarray:
+    """`win_matrix`, with the lanes sharded over every core."""
+    weapons = tuple(weapons)
+    count = len(weapons)
+    total = count * count * fights
+    starts = range(0, total, shard_size)
+    seeds = shard_seeds(seed, len(starts))
+    wins = np.zeros(count * count)
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_matrix_shard, difficulty, start, min(start + shard_size, total), weapons, s) for start, s in zip(starts, seeds)]
+        for future in futures: # Merged in shard order, never in completion order
+            wins += future.result()
+    return (wins / fights).reshape(count, count)
+
+def parallel_fights(weapon: int, enemy_weapon: int, difficulty: int = 1, fights: int = 1_000_000, seed: Seed = None, workers: Optional[int] = None, shard_size: int = 10_000) -> Tuple[int, int]:
+    """
+    Run `fights` fights of the pure Python `battle` engine between two weapons (indices into `WEAPONS`),
+    spread over every core. Returns the number of player wins and the total number of rounds.
+    """
+    sizes = [min(shard_size, fights - start) for start in range(0, fights, shard_size)]
+    seeds = shard_seeds(seed, len(sizes))
+    wins = rounds = 0
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_fight_shard, weapon, enemy_weapon, difficulty, size, s) for size, s in zip(sizes, seeds)]
+        for future in futures:
+            shard_wins, shard_rounds = future.result()
+            wins += shard_wins
+            rounds += shard_rounds
+    return wins, rounds
+
+
+if __name__ == "__main__": # Print every matrix, one row per player weapon
+    for difficulty, matrix in win_matrices().items():
+        print(f"Difficulty {difficulty}")
+        for weapon, row in zip(WEAPONS, matrix):
+            print(f"{weapon.name:>14} " + " ".join(f"{p:4.2f}" for p in row))
+        print()
@@ -0,0 +1,93 @@
+from typing import Any, Optional
+from dataclasses import dataclass, field
+from items import Item, get_weapon
+from enemies import Enemy
+from achievements import Event, Tracker
+from inventory import Inventory
+from constants import MAX_HEALTH
+import random
+
+####################################################
+# Game state                                       #
+#                                                  #
+# ------------------------------------------------ #
+# Everything about one player, and nothing else:   #
+# no terminal, no sounds and no files. Every       #
+# session has one, while the catalogs (weapons,    #
+# achievements, languages) are shared by all.      #
+####################################################
+
+@dataclass(eq=False)
+class GameState:
+    """The progress of one player. It is also the player side of a battle (a `battle.Combatant`)."""
+
+    player_name: str = "" # The player name
+    difficulty: int = 1
+    active: bool = False # Wheter a fight is running or not
+
+    health: int = MAX_HEALTH
+    weapons: Inventory = field(default_factory=Inventory)
+
+    enemy: Optional[Enemy] = None
+    round: int = 1
+
+    currency: int = 0
+    lifetime_currency: int = 0
+
+    player_damage_cache: float = 0.0 # Smart auto balancing!
+    enemy_damage_cache: float = 0.0
+
+    total_rounds: int = 0
+    loses: int = 0
+    wins: int = 0
+
+    blood: int = 0
+    blood_ticks: int = 0
+
+    scenery: float = 200.0 # You begin with hundred scenery points.
+
+    achievements: Tracker = field(default_factory=Tracker) # Also keeps the progress towards the final
+
+    log: Optional[str] = None
+
+    final_shown: bool = False
+
+    @classmethod
+    def new(cls, items_source: Optional[random.Random] = None) -> "GameState":
+        """A new player, with a starting weapon drawn from `items_source`."""
+        return cls(weapons=Inventory([get_weapon(items_source)]))
+
+    # We'll report everything that happens to the achievements, instead of checking them every round
+
+    def track(self, event: Event, value: Any = None) -> None:
+        self.achievements.emit(event, value)
+
+    def give_weapon(self, weapon: Item) -> None:
+        self.weapons.add(weapon)
+        self.track(Event.WEAPON_ACQUIRED, weapon)
+
+    def take_weapon(self, weapon: Item) -> None:
+        self.weapons.remove(weapon)
+        self.track(Event.WEAPON_LOST, weapon)
+
+    def add_currency(self, amount: int, earned: bool = False) -> None:
+        """Earned currency counts towards the lifetime too."""
+        self.currency += amount
+        if earned:
+            self.lifetime_currency += amount
+        self.track(Event.CURRENCY, (self.currency, self.lifetime_currency))
+
+    def sync_achievements(self) -> None:
+        """Once the player is set up (or resumed) all at once."""
+        self.achievements.goals.set_difficulty(self.difficulty)
+        self.achievements.sync(self.total_rounds, self.wins, self.loses, self.currency, self.lifetime_currency, self.weapons)
+
+    def reset_fight(self) -> Optional[Enemy]:
+        """Get ready for the next fight. Returns the enemy of the last one, to be recycled."""
+        enemy = self.enemy
+        self.blood = 0
+        self.blood_ticks = 0
+        self.enemy = None
+        self.health = MAX_HEALTH
+        self.round = 1
+        return enemy
@@ -0,0 +1,11 @@
+import sys
+import os
+import pytest
+
+# The game is a set of top level modules, and finds its languages and sounds from where it runs
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(autouse=True)
+def in_root(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,49 @@
+from typing import Iterable, List
+from session import Session, Quit
+from clock import Clock
+import asyncio
+import screen
+import game
+import time
+import os
+import pytest
+
+class Script:
+    """A `session.LineSource` that types `lines`, and then `then` over and over."""
+
+    def __init__(self, lines: Iterable[str], then: str = "1", limit: int = 20_000) -> None:
+        self.lines: List[str] = list(lines)
+        self.then = then
+        self.limit = limit
+        self.count = 0
+
+    async def readline(self) -> str:
+        self.count += 1
+        if self.count > self.limit: # A campaign that never ends fails instead of hanging
+            raise EOFError
+        return self.lines.pop(0) if self.lines else self.then
+
+def campaign(seed: int, difficulty: str, clock: Clock) -> Session:
+    # "1" plays from the menu, attacks with the first weapon in a battle and is any key on the final screens
+    script = Script(["en", "Tester", difficulty])
+    with open(os.devnull, "w") as devnull:
+        session = Session(screen.FrameRenderer(devnull, enabled=True), reader=script, clock=clock, seed=seed, music=False)
+        with pytest.raises(Quit): # The final screens end the game
+            asyncio.run(game.play(session))
+    return session
+
+def test_hard_campaign_finishes_instantly() -> None:
+    clock = Clock(0)
+    started = time.perf_counter()
+    session = campaign(1, "2", clock)
+    state = session.state
+
+    assert state.final_shown
+    assert state.achievements.goals.complete
+    assert state.total_rounds >= 200
+    assert clock.skipped > 60 * 10 # Every pause was skipped, not waited for
+    assert time.perf_counter() - started < 30
+
+def test_campaign_is_repeatable() -> None:
+    first, second = campaign(3, "2", Clock(0)).state, campaign(3, "2", Clock(0)).state
+    assert (first.total_rounds, first.wins, first.loses, first.currency) == (second.total_rounds, second.wins, second.loses, second.currency)
@@ -0,0 +1,86 @@
+from typing import Iterator, List, Tuple
+from session import Session
+import asyncio
+import screen
+import keys
+import os
+import pytest
+
+pty = pytest.importorskip("pty") # Pseudo terminals need a POSIX system
+pytest.importorskip("termios")
+
+MENU = [str(i) for i in range(1, 7)]
+LONG_MENU = [str(i) for i in range(1, 11)] # "1" could still become "10"
+
+@pytest.fixture
+def terminal() -> Iterator[Tuple[int, keys.KeyReader]]:
+    master, slave = pty.openpty()
+    keyboard = keys.KeyReader(fd=slave)
+    try:
+        with keyboard:
+            yield master, keyboard
+    finally:
+        os.close(master)
+        os.close(slave)
+
+def choose(terminal: Tuple[int, keys.KeyReader], options: List[str], *typed: bytes) -> str:
+    """Type every chunk of `typed` on the terminal, one read at a time, and return what `read_choice` picked."""
+    master, keyboard = terminal
+
+    async def run() -> str:
+        keyboard.attach()
+        try:
+            with open(os.devnull, "w") as devnull:
+                session = Session(screen.FrameRenderer(devnull, enabled=True), keyboard, music=False)
+                assert session.keys
+                choice = asyncio.ensure_future(session.read_choice("> ", options))
+                for chunk in typed:
+                    await asyncio.sleep(0.01) # So every chunk arrives as its own read
+                    assert not choice.done(), "picked before every key was typed"
+                    os.write(master, chunk)
+                return await asyncio.wait_for(choice, 5)
+        finally:
+            keyboard.detach()
+
+    return asyncio.run(run())
+
+def test_raw_mode(terminal: Tuple[int, keys.KeyReader]) -> None:
+    _, keyboard = terminal
+    assert keyboard.active
+    assert keyboard.poll() is None # Nothing typed, and polling doesn't wait for it
+
+def test_digit_picks_at_once(terminal: Tuple[int, keys.KeyReader]) -> None:
+    assert choose(terminal, MENU, b"3") == "3"
+
+def test_ambiguous_prefix_waits(terminal: Tuple[int, keys.KeyReader]) -> None:
+    assert choose(terminal, LONG_MENU, b"1", b"\r") == "1"
+    assert choose(terminal, LONG_MENU, b"1", b"0") == "10"
+
+def test_escape_cancels(terminal: Tuple[int, keys.KeyReader]) -> None:
+    assert choose(terminal, LONG_MENU, b"1", b"\x1b") == ""
+
+def test_backspace(terminal: Tuple[int, keys.KeyReader]) -> None:
+    assert choose(terminal, LONG_MENU, b"1", b"\x7f", b"2") == "2"
+    assert choose(terminal, LONG_MENU, b"1", b"\x08", b"1", b"\r") == "1"
+
+def test_prompt_menu(terminal: Tuple[int, keys.KeyReader]) -> None:
+    master, keyboard = terminal
+
+    async def run() -> str:
+        keyboard.attach()
+        try:
+            with open(os.devnull, "w") as devnull:
+                session = Session(screen.FrameRenderer(devnull, enabled=True), keyboard, music=False)
+                os.write(master, b"4")
+                return await asyncio.wait_for(session.prompt_menu("Menu", "> ", {key: key for key in MENU}), 5)
+        finally:
+            keyboard.detach()
+
+    assert asyncio.run(run()) == "4"
+
+def test_arrow_split_across_reads(terminal: Tuple[int, keys.KeyReader]) -> None:
+    master, keyboard = terminal
+    os.write(master, b"\x1b[")
+    assert keyboard.read(1) is None # Half an escape sequence is no key yet
+    os.write(master, b"A")
+    assert keyboard.read(1) == keys.UP
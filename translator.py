@@ -36,5 +36,13 @@ class Language(Enum, metaclass=LanguageEnumMeta): # We define languages
         yield from cls.__members__.values()
 
 class Transcriber(_Transcriber.Transcriber):
-    def __init__(self, lang: Language) -> None: # We'll only change the initialization behaviour.
-        super().__init__(LANGUAGE.BASE_PATH, LANGUAGE.EXTENTION, lang.value) # We only take one language that we apply with constants.
\ No newline at end of file
+    def __init__(self, lang: Language, mapped: bool = False, max_languages: int = len(Language.__members__), compiled: bool = False) -> None: # We'll only change the initialization behaviour.
+        super().__init__(LANGUAGE.BASE_PATH, LANGUAGE.EXTENTION, lang.value, mapped, max_languages, compiled) # We only take one language that we apply with constants.
+
+_shared: Optional[Transcriber] = None
+
+def shared() -> Transcriber: # Every session reads from this one transcriber, each passing its own language.
+    global _shared
+    if _shared is None:
+        _shared = Transcriber(Language.EN)
+    return _shared